@@ -0,0 +1,15 @@
+# Run uvicorn workers under gunicorn, so that the app is loaded (and warmed up)
+# once in the parent process and shared with the workers copy-on-write.
+# uvicorn's own --workers option starts each worker from scratch.
+bind = "0.0.0.0:8765"
+workers = 2
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def when_ready(server):
+    # This runs in the parent, after the app has been loaded and before any
+    # workers have been forked
+    from cds_hubble.warmup import warmup
+
+    warmup(freeze=True)
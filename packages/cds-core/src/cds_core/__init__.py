@@ -1,23 +1,66 @@
 from pathlib import Path
-import ipyvue
+from threading import Lock
+from typing import Dict, Optional
 import re
 
-from glue.config import settings
-
 # Register any custom Vue components
 comp_dir = Path(__file__).parent / "vue_components"
 
+# The sources of the custom Vue components, keyed by component name.
+# These are read from disk once per process (see `custom_vue_components`)
+_custom_vue_components: Optional[Dict[str, str]] = None
+_custom_vue_components_lock = Lock()
+
+
+def _component_name(comp_path: Path) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "-", comp_path.stem).lower()
+
+
+def custom_vue_components() -> Dict[str, str]:
+    """
+    Get the sources of the custom Vue components, keyed by name.
+    The component directory is only scanned the first time that this is called.
+    """
+    global _custom_vue_components
+    if _custom_vue_components is None:
+        with _custom_vue_components_lock:
+            if _custom_vue_components is None:
+                _custom_vue_components = {
+                    _component_name(comp_path): comp_path.read_text()
+                    for comp_path in sorted(comp_dir.rglob("*.vue"))
+                    if comp_path.is_file()
+                }
+    return dict(_custom_vue_components)
+
 
 def load_custom_vue_components():
-    for comp_path in comp_dir.rglob("*.vue"):
-        if comp_path.is_file:
-            comp_name = re.sub(r"(?<!^)(?=[A-Z])", "-", comp_path.stem).lower()
-            ipyvue.register_component_from_file(
-                name=comp_name,
-                file_name=comp_path,
-            )
-
-
-# Override glue settings
-settings.BACKGROUND_COLOR = "white"
-settings.FOREGROUND_COLOR = "black"
+    """
+    Register the custom Vue components with ipyvue. The component widgets live
+    in the current session, so this needs to be called for each session, but the
+    component sources are only loaded from disk once.
+    """
+    import ipyvue
+
+    for name, source in custom_vue_components().items():
+        ipyvue.register_component_from_string(name=name, value=source)
+
+
+custom_vue_components()
+
+_glue_settings_applied = False
+
+
+def apply_glue_settings():
+    """
+    Override the glue settings. This is called when glue is first needed (when a
+    glue application or a viewer is created), rather than when this package is
+    imported, as importing glue is slow.
+    """
+    global _glue_settings_applied
+    if _glue_settings_applied:
+        return
+    from glue.config import settings
+
+    settings.BACKGROUND_COLOR = "white"
+    settings.FOREGROUND_COLOR = "black"
+    _glue_settings_applied = True
@@ -1,13 +1,16 @@
 import os
 from functools import cached_property
-from typing import Annotated, Dict, Union
+from typing import TYPE_CHECKING, Annotated, Dict, Union
 
-from glue.core import Data, DataCollection, Session
-from glue_jupyter import JupyterApplication
 from pydantic import BaseModel, Field
 
 from .base_states import BaseAppState, BaseState
 
+# glue is slow to import, so it's only imported once a session needs its glue application
+if TYPE_CHECKING:
+    from glue.core import Data, DataCollection, Session
+    from glue_jupyter import JupyterApplication
+
 update_db_init = not (os.getenv("CDS_DISABLE_DB", "false").strip().lower() == "true")
 show_team_interface_init = (
     os.getenv("CDS_SHOW_TEAM_INTERFACE", "false").strip().lower() == "true"
@@ -43,18 +46,34 @@ class AppState(BaseAppState):
     educator: bool = False
 
     @cached_property
-    def _glue_app(self) -> JupyterApplication:
+    def _glue_app(self) -> "JupyterApplication":
+        from glue_jupyter import JupyterApplication
+
+        from . import apply_glue_settings
+
+        apply_glue_settings()
         return JupyterApplication()
 
     @cached_property
-    def glue_data_collection(self) -> DataCollection:
+    def glue_data_collection(self) -> "DataCollection":
         return self._glue_app.data_collection
 
     @cached_property
-    def glue_session(self) -> Session:
+    def glue_session(self) -> "Session":
         return self._glue_app.session
 
-    def add_or_update_data(self, data: Data):
+    def reset_glue(self):
+        """
+        Remove all of the glue data, and drop the glue application. A new (empty)
+        application is created the next time that one is needed.
+        """
+        data_collection = self.__dict__.get("glue_data_collection", None)
+        if data_collection is not None:
+            data_collection.clear()
+        for name in ("_glue_app", "glue_data_collection", "glue_session"):
+            self.__dict__.pop(name, None)
+
+    def add_or_update_data(self, data: "Data"):
         if data.label in self.glue_data_collection:
             existing = self.glue_data_collection[data.label]
             existing.update_values_from_data(data)
@@ -1,11 +1,35 @@
-from .scaffold_alert import ScaffoldAlert
-from .math_jax_support.math_jax_support import MathJaxSupport
-from .plotly_support.plotly_support import PlotlySupport
-from .viewer_layout import *
-from .debug_control import StateEditor
-from .layer_toggle import LayerToggle
-from .statistics_selector import StatisticsSelector
-from .percentage_selector import PercentageSelector
-from .refresh_button import RefreshButton
-from .info_dialog.info_dialog import InfoDialog
-from .google_analytics_support.google_analytics_support import GoogleAnalyticsSupport
+from importlib import import_module
+
+# The components are only imported when they're first accessed, as some of them
+# import glue or glue_plotly, and the layout (which is imported at start-up)
+# only needs the components that it imports from their own modules
+_COMPONENT_MODULES = {
+    "ScaffoldAlert": ".scaffold_alert",
+    "preload_scaffold_alerts": ".scaffold_alert",
+    "MathJaxSupport": ".math_jax_support.math_jax_support",
+    "PlotlySupport": ".plotly_support.plotly_support",
+    "ToolBar": ".viewer_layout",
+    "ViewerLayout": ".viewer_layout",
+    "StateEditor": ".debug_control",
+    "LayerToggle": ".layer_toggle",
+    "StatisticsSelector": ".statistics_selector",
+    "PercentageSelector": ".percentage_selector",
+    "RefreshButton": ".refresh_button",
+    "InfoDialog": ".info_dialog.info_dialog",
+    "GoogleAnalyticsSupport": ".google_analytics_support.google_analytics_support",
+}
+
+__all__ = list(_COMPONENT_MODULES)
+
+
+def __getattr__(name):
+    module_name = _COMPONENT_MODULES.get(name, None)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
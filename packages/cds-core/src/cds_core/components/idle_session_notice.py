@@ -0,0 +1,23 @@
+import solara
+from solara.alias import rv
+
+from ..sessions import resume_session
+
+
+@solara.component
+def IdleSessionNotice():
+    """
+    Shown in place of the story pages after an idle session's glue application has
+    been torn down. Continuing mounts the pages again, which rebuild from the story state.
+    """
+    with rv.Card(class_="mx-auto my-8", max_width=600, outlined=True):
+        rv.CardTitle(children=["Welcome back!"])
+        rv.CardText(
+            children=[
+                "You've been away for a while, so we've paused your session to free up space "
+                "for other students. Your progress has been saved."
+            ]
+        )
+        with rv.CardActions():
+            rv.Spacer()
+            solara.Button("Continue", color="primary", on_click=resume_session)
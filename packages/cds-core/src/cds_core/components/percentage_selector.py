@@ -1,9 +1,10 @@
-from numpy import argsort, array
+from numpy import zeros
 import solara
 import reacton.ipyvuetify as rv
 
 from glue.core.subset import ElementSubsetState, SubsetState
 
+from ..order_statistics import order_statistics
 from ..utils import percent_around_center_indices
 
 from glue.core import Data, Session
@@ -123,7 +124,7 @@ def PercentageSelector(viewers: List[Viewer],
                 _clear_viewer_label(index)
                 if layers[index] is not None:
                     layers[index].state.color = original_colors[index]
-                state = array([False for _ in range(glue_data[index].size)])
+                state = zeros(glue_data[index].size, dtype=bool)
                 states.append(state)
             _update_subsets(states)
             set_viewer_labels([])
@@ -133,19 +134,19 @@ def PercentageSelector(viewers: List[Viewer],
         labels = []
         for index, (viewer, viewer_bins) in enumerate(zip(viewers, bins)):
             _clear_viewer_label(index)
-            component_id = viewer.state.x_att
-            data = glue_data[index][component_id]
+            stats = order_statistics(glue_data[index], viewer.state.x_att)
+            data = stats.values
             layer = layers[index]
             layer.state.color = deselected_color
             bottom_index, top_index = percent_around_center_indices(data.size, option)
     
-            sorted_indices = argsort(data)
+            sorted_indices = stats.sorted_indices
             true_bottom = data[sorted_indices[bottom_index]]
             true_top = data[sorted_indices[top_index]]
             expected_count = round(option * data.size / 100)
             actual_count = top_index - bottom_index + 1
             if expected_count != actual_count:
-                median = glue_data[index].compute_statistic('median', viewer.state.x_att)
+                median = stats.median
                 if expected_count < actual_count:
                     dist_bottom = abs(median - true_bottom)
                     dist_top = abs(median - true_top)
@@ -180,7 +181,7 @@ def PercentageSelector(viewers: List[Viewer],
             # If in the future we have a situation where we want to do this with more fluid
             # data, we'll need to list to an update message or something to recalculate the
             # indices here
-            indices = [si for i, si in enumerate(sorted_indices) if i >= bottom_index and i <= top_index]
+            indices = sorted_indices[bottom_index:top_index + 1]
             state = ElementSubsetState(indices=indices)
             states.append(state)
             rounded_bottom = _bin_rounded_bound(true_bottom, viewer_bins)
@@ -2,7 +2,73 @@ from ..app_state import Speech
 import solara
 import inspect
 from pathlib import Path
-from typing import Callable, Optional
+from threading import Lock
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# Compiled guideline components, keyed by the path of the Vue file and the
+# names of any extra properties passed in, so that each component class is
+# only built once per process
+_component_cache: Dict[Tuple[Path, Tuple[str, ...]], Callable] = {}
+_component_cache_lock = Lock()
+
+
+def _build_scaffold_alert_component(vue_path: Path, extra_names: Tuple[str, ...]):
+
+    def _ScaffoldAlert(
+        event_back_callback,
+        event_next_callback,
+        can_advance,
+        scroll_on_mount,
+        frObserver,
+        freeResponses,
+        disableNext,
+        frListener,
+        state_view,
+        event_force_transition,
+        speech,
+    ):
+        pass
+
+    signature = inspect.signature(_ScaffoldAlert)
+    parameters = list(signature.parameters.values()) + [
+        inspect.Parameter(
+            name=k,
+            kind=inspect.Parameter.KEYWORD_ONLY,
+        )
+        for k in extra_names
+    ]
+    _ScaffoldAlert.__signature__ = signature.replace(parameters=parameters)
+
+    return solara.component_vue(vue_path)(_ScaffoldAlert)
+
+
+def scaffold_alert_component(vue_path: str | Path, extra_names: Iterable[str] = ()):
+    """
+    Get the (cached) compiled component for the guideline at the given path.
+    `extra_names` are the names of any additional properties that the guideline takes.
+    """
+    key = (Path(vue_path), tuple(sorted(extra_names)))
+    component = _component_cache.get(key)
+    if component is None:
+        with _component_cache_lock:
+            component = _component_cache.get(key)
+            if component is None:
+                component = _build_scaffold_alert_component(*key)
+                _component_cache[key] = component
+    return component
+
+
+def preload_scaffold_alerts(vue_paths: Iterable[str | Path]) -> int:
+    """
+    Compile the guideline components at the given paths ahead of time.
+    Returns the number of components that were loaded.
+    """
+    count = 0
+    for vue_path in vue_paths:
+        scaffold_alert_component(vue_path)
+        count += 1
+    return count
 
 
 def ScaffoldAlert(
@@ -96,32 +162,7 @@ def ScaffoldAlert(
     if not show:
         return
 
-    def _ScaffoldAlert(
-        event_back_callback,
-        event_next_callback,
-        can_advance,
-        scroll_on_mount,
-        frObserver,
-        freeResponses,
-        disableNext,
-        frListener,
-        state_view,
-        event_force_transition,
-        speech,
-    ):
-        pass
-
-    signature = inspect.signature(_ScaffoldAlert)
-    parameters = list(signature.parameters.values()) + [
-        inspect.Parameter(
-            name=k,
-            kind=inspect.Parameter.KEYWORD_ONLY,
-        )
-        for k in kwargs.keys()
-    ]
-    _ScaffoldAlert.__signature__ = signature.replace(parameters=parameters)
-
-    _ScaffoldAlert = solara.component_vue(vue_path)(_ScaffoldAlert)
+    _ScaffoldAlert = scaffold_alert_component(vue_path, kwargs.keys())
 
     speech_dict = speech.model_dump() if speech is not None else None
     return _ScaffoldAlert(
@@ -14,7 +14,8 @@ from plotly.graph_objects import Scatter
 from numbers import Number
 from typing import Callable, Iterable, List, Optional
 
-from ..utils import line_mark, mode, CDS_IMAGE_BASE_URL
+from ..order_statistics import order_statistics
+from ..utils import line_mark, CDS_IMAGE_BASE_URL
 
 image_location=f"{CDS_IMAGE_BASE_URL}"
 
@@ -22,10 +23,11 @@ image_location=f"{CDS_IMAGE_BASE_URL}"
 # Since there can be multiple modes, mode can be a list
 # and so we return a list for every statistic to make things simpler
 def find_statistic(stat: str, viewer: Viewer, data: Data, bins: Iterable[int | float] | None):
+    stats = order_statistics(data, viewer.state.x_att)
     if stat == "mode":
-        return mode(data, viewer.state.x_att, bins=bins, range=[viewer.state.hist_x_min, viewer.state.hist_x_max])
+        return stats.mode(bins=bins, range=[viewer.state.hist_x_min, viewer.state.hist_x_max])
     else:
-        return [data.compute_statistic(stat, viewer.state.x_att)]
+        return [stats.statistic(stat)]
 
 
 # TODO: How can we make this more general to put into the utilities?
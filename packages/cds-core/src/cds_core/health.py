@@ -0,0 +1,148 @@
+"""
+Lightweight liveness and readiness routes for the servers, so that load balancers
+don't have to render a Solara page to check on a worker. The handlers don't create
+kernels, render anything or touch glue; dependency probes are cached, so that
+frequent checks don't turn into a stream of requests to those dependencies.
+"""
+
+import os
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import requests
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from .logger import setup_logger
+from .urls import API_URL
+
+__all__ = ["DependencyProbe", "api_probe", "health_routes"]
+
+logger = setup_logger("HEALTH")
+
+# How long a probe's result is reused before the dependency is checked again
+PROBE_TTL = 30  # seconds
+PROBE_TIMEOUT = 2  # seconds
+
+
+class DependencyProbe:
+    """
+    Checks that a dependency can be reached over HTTP. Results are cached for `ttl`
+    seconds, and only one check is in flight at a time; concurrent callers get the
+    last result rather than waiting on the dependency.
+
+    If the probe isn't `required`, its result is reported but the worker is still
+    considered ready when it fails.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        ttl: float = PROBE_TTL,
+        timeout: float = PROBE_TIMEOUT,
+        required: bool = True,
+    ):
+        self.name = name
+        self.url = url
+        self.headers = headers or {}
+        self.ttl = ttl
+        self.timeout = timeout
+        self.required = required
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = Lock()
+
+    def _probe(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            response = requests.get(self.url, headers=self.headers, timeout=self.timeout)
+            # Any response means that the dependency is up; a 5xx means that it isn't healthy
+            ok = response.status_code < 500
+            error = None if ok else f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            ok = False
+            error = type(e).__name__
+        result = {"ok": ok, "latency_ms": round((time.perf_counter() - start) * 1000)}
+        if error is not None:
+            result["error"] = error
+            logger.warning(f"Probe of {self.name} failed: {error}")
+        return result
+
+    def check(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if self._result is not None and now - self._checked_at < self.ttl:
+            return self._cached(now)
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._cached(now)
+        try:
+            self._result = self._probe()
+            self._checked_at = time.monotonic()
+            return self._cached(self._checked_at)
+        finally:
+            self._lock.release()
+
+    def _cached(self, now: float) -> Dict[str, Any]:
+        return {**self._result, "required": self.required, "age_s": round(now - self._checked_at)}
+
+
+def api_probe(required: bool = False) -> DependencyProbe:
+    """
+    A probe of the CosmicDS API, using the same key as the API clients. By default,
+    it doesn't affect readiness, as an API outage affects every worker alike, and
+    taking them all out of rotation would only make things worse.
+    """
+    return DependencyProbe(
+        "api",
+        API_URL,
+        headers={"Authorization": os.getenv("CDS_API_KEY", "")},
+        required=required,
+    )
+
+
+def _session_count() -> int:
+    # Only reads the kernel registry; this doesn't create or touch any kernels
+    from solara.server import kernel_context
+
+    return len(kernel_context.contexts)
+
+
+def health_routes(
+    probes: Iterable[DependencyProbe] = (),
+    checks: Optional[Dict[str, Callable[[], bool]]] = None,
+) -> list:
+    """
+    Routes for `/healthz`, which only says that the process is serving requests, and
+    `/readyz`, which reports the given `checks` (e.g. whether the worker has warmed up)
+    and `probes`, along with the number of open sessions. The worker is ready (200)
+    when all of the checks and required probes pass, and not ready (503) otherwise.
+    """
+    probes = list(probes)
+    checks = checks or {}
+
+    def healthz(request: Request):
+        return JSONResponse({"status": "ok"})
+
+    # A sync endpoint, so that Starlette runs it (and any probe) in its threadpool
+    def readyz(request: Request):
+        check_results = {name: bool(check()) for name, check in checks.items()}
+        probe_results = {probe.name: probe.check() for probe in probes}
+        ready = all(check_results.values()) and all(
+            result["ok"] for result in probe_results.values() if result["required"]
+        )
+        body = {
+            "status": "ready" if ready else "not ready",
+            "pid": os.getpid(),
+            "checks": check_results,
+            "dependencies": probe_results,
+            "sessions": _session_count(),
+        }
+        return JSONResponse(body, status_code=200 if ready else 503)
+
+    return [
+        Route("/healthz", endpoint=healthz),
+        Route("/readyz", endpoint=readyz),
+    ]
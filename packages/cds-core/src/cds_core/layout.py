@@ -16,14 +16,16 @@ from . import load_custom_vue_components
 from .components.login import Login
 from .components.speech_settings import SpeechSettings
 from .components.tooltip_menu import TooltipMenu
-from .logger import setup_logger
+from .logger import set_log_context, setup_logger
 from .utils import get_session_id
 from .components.breakpoint_watcher.breakpoint_watcher import BreakpointWatcher
 from .components.location_helper.location_helper import LocationHelper
 from .components.theme_toggle import ThemeToggle
 from .components.logout_dialog.logout_dialog import LogoutDialog
+from .components.idle_session_notice import IdleSessionNotice
 from .base_states import BaseStoryState, BaseAppState
 from .remote import BaseAPI
+from .sessions import use_session_tracking
 
 filterwarnings(action="ignore", category=UserWarning)
 
@@ -159,6 +161,16 @@ def BaseLayout(
 
     selected_link = solara.use_reactive(route_index)
 
+    evicted = use_session_tracking(app_state, story_state)
+
+    student_id = app_state.value.student.id
+    stage = route_current.path if route_current.path != "/" else "introduction"
+
+    def _update_log_context():
+        set_log_context(student_id=student_id, stage=stage)
+
+    solara.use_effect(_update_log_context, dependencies=[student_id, stage])
+
     # Set up a watcher for vue break_point events
     break_point = solara.use_reactive("")
     BreakpointWatcher(
@@ -393,9 +405,12 @@ def BaseLayout(
             style_="height: 100%; width: 100%; overflow: auto;",
             fluid=True,
         ):
-            rv.Container(
-                children=children, style_="height: 100%; width: 100%", fluid=False
-            )
+            if evicted:
+                IdleSessionNotice()
+            else:
+                rv.Container(
+                    children=children, style_="height: 100%; width: 100%", fluid=False
+                )
 
     with rv.Footer(
         class_="text-center align-items",
@@ -1,29 +1,230 @@
+"""
+Logging for the CosmicDS packages.
+
+Loggers don't write to the stream themselves. Instead, records go through a queue
+to a listener thread that formats and writes them, so that logging doesn't block
+the thread that's handling a request (or a viewer callback) on I/O.
+
+Levels are configured with environment variables:
+
+* ``CDS_LOG_LEVEL`` sets the default level (DEBUG if it isn't set).
+* ``CDS_LOG_LEVELS`` sets the levels of specific loggers, as a comma-separated list
+  of ``pattern=LEVEL`` entries, e.g. ``API=WARNING,STAGE*=INFO,cds_hubble=INFO``.
+  Patterns are matched (with shell-style wildcards) against the logger name, then
+  against the top-level package of the module that set up the logger.
+
+Messages that are logged repeatedly from the same place are sampled: each call site
+can log ``CDS_LOG_SAMPLE_BURST`` messages below WARNING level per
+``CDS_LOG_SAMPLE_WINDOW`` seconds, after which they're dropped until the window
+ends. The next message that gets through notes how many were dropped. Setting
+``CDS_LOG_SAMPLE_BURST`` to 0 turns sampling off.
+
+Each record also carries the session id, student id and stage of the session that
+logged it (see `set_log_context`). These are added before the record is queued, as
+the session is only known on the thread that logged it.
+"""
+
+import atexit
+import fnmatch
 import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+__all__ = ["CustomFormatter", "setup_logger", "set_log_context"]
+
+LOG_CONTEXT_FIELDS = ("session_id", "student_id", "stage")
 
 
 class CustomFormatter(logging.Formatter):
     # Define the custom format for log messages
-    FORMAT = "[%(asctime)s][%(levelname)8s][%(name)8s][%(filename)s:%(lineno)s]:%(message)s"
+    FORMAT = "[%(asctime)s][%(levelname)8s][%(name)8s][%(filename)s:%(lineno)s][%(session_id)s|%(student_id)s|%(stage)s]:%(message)s"
 
     def __init__(self):
-        super().__init__(self.FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+        super().__init__(
+            self.FORMAT,
+            datefmt="%Y-%m-%d %H:%M:%S",
+            defaults={field: "-" for field in LOG_CONTEXT_FIELDS},
+        )
 
 
-def setup_logger(name, level=logging.DEBUG):
-    # Create a logger
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+def _parse_level(value: str, default: int) -> int:
+    level = logging.getLevelName(value.strip().upper())
+    return level if isinstance(level, int) else default
+
+
+DEFAULT_LEVEL = _parse_level(os.getenv("CDS_LOG_LEVEL", "DEBUG"), logging.DEBUG)
+
+
+def _parse_levels(value: str) -> List[Tuple[str, int]]:
+    levels = []
+    for entry in value.split(","):
+        pattern, _, level = entry.partition("=")
+        if pattern.strip() and level.strip():
+            levels.append((pattern.strip(), _parse_level(level, DEFAULT_LEVEL)))
+    return levels
+
+
+LOGGER_LEVELS = _parse_levels(os.getenv("CDS_LOG_LEVELS", ""))
+
+SAMPLE_BURST = int(os.getenv("CDS_LOG_SAMPLE_BURST", "20"))
+SAMPLE_WINDOW = float(os.getenv("CDS_LOG_SAMPLE_WINDOW", "10"))  # seconds
+
+
+def _configured_level(name: str, package: Optional[str], level: Optional[int]) -> int:
+    # Patterns that match the logger name take precedence over ones that match its
+    # package, and later entries take precedence over earlier ones
+    for target in (name, package):
+        if target is None:
+            continue
+        for pattern, configured in reversed(LOGGER_LEVELS):
+            if fnmatch.fnmatchcase(target, pattern):
+                return configured
+    return DEFAULT_LEVEL if level is None else level
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Limit the number of records below WARNING level that each call site can log per
+    window. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, burst: int = SAMPLE_BURST, window: float = SAMPLE_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        # (window start, records passed, records dropped) for each call site
+        self._sites: Dict[Tuple[str, str, int], List] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0 or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        site = self._sites.get(key, None)
+        if site is None or now - site[0] >= self.window:
+            dropped = 0 if site is None else site[2]
+            self._sites[key] = [now, 1, 0]
+            if dropped:
+                record.msg = f"{record.msg} (and {dropped} similar messages dropped)"
+            return True
+
+        if site[1] < self.burst:
+            site[1] += 1
+            return True
 
-    # Create a console handler
-    ch = logging.StreamHandler()
-    ch.setLevel(level)
+        site[2] += 1
+        return False
 
-    # Set the custom formatter
-    ch.setFormatter(CustomFormatter())
 
-    # Add the handler to the logger
-    if not logger.hasHandlers():
-        logger.addHandler(ch)
+class ContextFilter(logging.Filter):
+    """Add the session id, student id and stage of the current session to records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = _log_context()
+        for field in LOG_CONTEXT_FIELDS:
+            setattr(record, field, fields.get(field, "-"))
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The base class formats the whole record here, on the thread that logged it. Only
+        # the message is merged (as the arguments could change once this returns),
+        # and the rest of the formatting is left to the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_LOG_CONTEXT_KEY = "cds-core-log-context"
+
+
+def _log_context() -> dict:
+    solara_module = sys.modules.get("solara.server.kernel_context", None)
+    if solara_module is None or not solara_module.has_current_context():
+        return {}
+    context = solara_module.get_current_context()
+    fields = context.user_dicts.get(_LOG_CONTEXT_KEY, None)
+    if fields is None:
+        fields = context.user_dicts[_LOG_CONTEXT_KEY] = {"session_id": context.id}
+    return fields
+
+
+def set_log_context(**fields):
+    """
+    Set fields (e.g. `student_id` or `stage`) that are added to the records logged in
+    the current session. Does nothing outside of a solara kernel.
+    """
+    fields_dict = _log_context()
+    fields_dict.update(
+        {key: "-" if value is None else value for key, value in fields.items()}
+    )
+
+
+_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_handler_lock = Lock()
+
+
+def _start_listener():
+    global _listener
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(CustomFormatter())
+    _handler.queue = log_queue
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_listener_in_child():
+    # The listener thread doesn't survive a fork (e.g. of a pre-forking server's
+    # workers), and the queue may have been in use when the parent forked
+    global _handler_lock
+    _handler_lock = Lock()
+    if _handler is not None:
+        _start_listener()
+
+
+def _shared_handler() -> QueueHandler:
+    global _handler
+    with _handler_lock:
+        if _handler is None:
+            _handler = _DeferredQueueHandler(queue.SimpleQueue())
+            _handler.addFilter(SamplingFilter())
+            _handler.addFilter(ContextFilter())
+            _start_listener()
+            atexit.register(_stop_listener)
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
+    return _handler
+
+
+def setup_logger(name, level=None):
+    """
+    Get the logger with the given name, sending its records through the shared queue.
+    Its level is `level` (or ``CDS_LOG_LEVEL`` if that's not given), unless one is set
+    for it in ``CDS_LOG_LEVELS``.
+    """
+    # The package of the module that's setting up the logger, for per-package levels
+    caller = sys._getframe(1).f_globals.get("__name__", "")
+    package = caller.partition(".")[0] or None
+
+    logger = logging.getLogger(name)
+    logger.setLevel(_configured_level(name, package, level))
+
+    handler = _shared_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
 
     logger.propagate = False
     return logger
@@ -0,0 +1,125 @@
+from weakref import WeakKeyDictionary, WeakSet
+
+import numpy as np
+from glue.core import Data, HubListener
+from glue.core.message import NumericalDataChangedMessage
+
+from .utils import mode, percent_around_center_indices
+
+__all__ = ["ComponentStatistics", "order_statistics"]
+
+
+class ComponentStatistics:
+    """
+    Lazily computed order statistics for a single component of a glue `Data` object.
+    Each statistic is computed at most once; use `order_statistics` to get an instance
+    that is shared and invalidated whenever the underlying data changes.
+    """
+
+    def __init__(self, data: Data, component_id):
+        self.data = data
+        self.component_id = component_id
+        self._values = None
+        self._sorted_indices = None
+        self._statistics = {}
+        self._modes = {}
+        self._percent_ranges = {}
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = np.asarray(self.data[self.component_id])
+        return self._values
+
+    @property
+    def size(self):
+        return self.values.size
+
+    @property
+    def sorted_indices(self):
+        if self._sorted_indices is None:
+            self._sorted_indices = np.argsort(self.values, kind="stable")
+        return self._sorted_indices
+
+    def statistic(self, stat: str):
+        """Return the value of a glue statistic (e.g. mean or median) for this component."""
+        if stat == "mode":
+            return self.mode()
+        if stat not in self._statistics:
+            self._statistics[stat] = self.data.compute_statistic(stat, self.component_id)
+        return self._statistics[stat]
+
+    @property
+    def mean(self):
+        return self.statistic("mean")
+
+    @property
+    def median(self):
+        return self.statistic("median")
+
+    def mode(self, bins=None, range=None):
+        key = (
+            None if bins is None else tuple(bins),
+            None if range is None else tuple(range),
+        )
+        if key not in self._modes:
+            self._modes[key] = mode(self.data, self.component_id, bins=bins, range=range)
+        return self._modes[key]
+
+    def percent_range(self, percent):
+        """
+        Return the bottom and top values of the given percent of the data around the center.
+        """
+        if percent not in self._percent_ranges:
+            bottom_index, top_index = percent_around_center_indices(self.size, percent)
+            self._percent_ranges[percent] = (
+                self.value_at(bottom_index),
+                self.value_at(top_index),
+            )
+        return self._percent_ranges[percent]
+
+    def value_at(self, sorted_index):
+        """Return the value at the given position in sorted order."""
+        return self.values[self.sorted_indices[sorted_index]]
+
+
+class _OrderStatisticsCache(HubListener):
+
+    def __init__(self):
+        self._entries = WeakKeyDictionary()
+        self._hubs = WeakSet()
+
+    def get(self, data: Data, component_id) -> ComponentStatistics:
+        # Without a hub we would never hear about changes to the data,
+        # so don't cache anything in that case
+        hub = data.hub
+        if hub is None:
+            return ComponentStatistics(data, component_id)
+
+        if hub not in self._hubs:
+            hub.subscribe(self, NumericalDataChangedMessage, handler=self._on_data_changed)
+            self._hubs.add(hub)
+
+        components = self._entries.setdefault(data, {})
+        stats = components.get(component_id)
+        if stats is None:
+            stats = ComponentStatistics(data, component_id)
+            components[component_id] = stats
+        return stats
+
+    def invalidate(self, data: Data):
+        self._entries.pop(data, None)
+
+    def _on_data_changed(self, message: NumericalDataChangedMessage):
+        self.invalidate(message.data)
+
+
+_cache = _OrderStatisticsCache()
+
+
+def order_statistics(data: Data, component_id) -> ComponentStatistics:
+    """
+    Get the (cached) order statistics for the given component of a glue `Data` object.
+    The cached values are discarded when the data broadcasts a `NumericalDataChangedMessage`.
+    """
+    return _cache.get(data, component_id)
@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .logger import setup_logger
+
+__all__ = ["Prewarmer", "prewarmer", "prewarmed"]
+
+logger = setup_logger("PREWARM")
+
+T = TypeVar("T")
+
+# How long a prewarmed result can wait to be used before it's considered stale
+MAX_AGE = 300  # seconds
+
+# Loads for all sessions share a small pool, so that prewarming can't
+# swamp the worker (or the API) when a whole class moves on at once
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cds-prewarm")
+
+
+class Prewarmer:
+    """
+    Data loads that have been started ahead of time, e.g. for the next stage of a
+    story, so that the results are ready (or on their way) by the time they're needed.
+
+    Loads are identified by a key, and are run in a background thread. They
+    shouldn't touch any session state, as they run outside of the kernel context;
+    instead, the code that needs the data gets the result with `take`, which falls
+    back to loading the data itself if it wasn't prewarmed.
+    """
+
+    def __init__(self, max_age: float = MAX_AGE):
+        self.max_age = max_age
+        self._loads: Dict[Hashable, Tuple[float, Future]] = {}
+        self._lock = Lock()
+
+    def start(self, key: Hashable, load: Callable[[], T]) -> Future:
+        """Start loading the data for `key`, unless that's already underway."""
+        with self._lock:
+            entry = self._loads.get(key, None)
+            if entry is not None and not self._stale(entry):
+                return entry[1]
+            logger.info(f"Prewarming {key}")
+            future = _executor.submit(load)
+            self._loads[key] = (time.monotonic(), future)
+            return future
+
+    def take(self, key: Hashable, load: Callable[[], T]) -> T:
+        """
+        Get the prewarmed data for `key`, waiting for the load to finish if needed.
+        If the data hasn't been prewarmed (or the load failed or is stale), call `load`.
+        Prewarmed data is only handed out once.
+        """
+        with self._lock:
+            entry = self._loads.pop(key, None)
+        if entry is not None and not self._stale(entry):
+            try:
+                return entry[1].result()
+            except Exception:
+                logger.exception(f"Prewarming {key} failed")
+        return load()
+
+    def pending(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._loads
+
+    def clear(self):
+        with self._lock:
+            loads, self._loads = self._loads, {}
+        for _, future in loads.values():
+            future.cancel()
+
+    def _stale(self, entry: Tuple[float, Future]) -> bool:
+        return time.monotonic() - entry[0] > self.max_age
+
+
+_PREWARMER_KEY = "cds-core-prewarmer"
+_default_prewarmer: Optional[Prewarmer] = None
+
+
+def prewarmer() -> Prewarmer:
+    """
+    The prewarmer for the current session. Outside of a solara kernel
+    (e.g. in a notebook) a single prewarmer is shared.
+    """
+    global _default_prewarmer
+    import solara.server.kernel_context
+
+    if not solara.server.kernel_context.has_current_context():
+        if _default_prewarmer is None:
+            _default_prewarmer = Prewarmer()
+        return _default_prewarmer
+
+    context = solara.server.kernel_context.get_current_context()
+    user_dict = context.user_dicts.setdefault(_PREWARMER_KEY, {})
+    instance = user_dict.get("prewarmer", None)
+    if instance is None:
+        instance = user_dict["prewarmer"] = Prewarmer()
+        on_close = getattr(context, "on_close", None)
+        if on_close is not None:
+            on_close(instance.clear)
+    return instance
+
+
+def prewarmed(key: Hashable, load: Callable[[], T]) -> T:
+    """Get the data for `key` from the current session's prewarmer, or load it."""
+    return prewarmer().take(key, load)
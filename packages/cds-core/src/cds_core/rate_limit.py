@@ -0,0 +1,211 @@
+import asyncio
+from functools import update_wrapper
+from typing import Callable, Optional
+
+from .logger import setup_logger
+from .ticker import _current_kernel_context, _running_loop, ticker
+
+__all__ = ["RateLimited", "debounce", "throttle"]
+
+logger = setup_logger("RATE LIMIT")
+
+
+class RateLimited:
+    """
+    A debounced or throttled wrapper around a function, scheduled on an asyncio
+    event loop. Calls never block and no threads or timers are created; all of the
+    timing uses the loop's clock (`loop.time` and `loop.call_at`), so passing a
+    loop with a controllable clock makes the behavior deterministic.
+
+    Parameters
+    ----------
+    function : callable
+        The function to wrap. Its return value is discarded.
+    wait : float
+        The number of seconds to wait after the last call before invoking.
+    leading : bool, optional
+        Whether to invoke on the leading edge of the wait. Defaults to False.
+    trailing : bool, optional
+        Whether to invoke on the trailing edge of the wait. Defaults to True.
+    max_wait : float, optional
+        The maximum number of seconds that an invocation can be delayed by
+        repeated calls. Defaults to None (no maximum).
+    loop : `asyncio.AbstractEventLoop`, optional
+        The loop to schedule on. Defaults to the loop of the process-wide ticker.
+    """
+
+    def __init__(
+        self,
+        function: Callable,
+        wait: float,
+        leading: bool = False,
+        trailing: bool = True,
+        max_wait: Optional[float] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.function = function
+        self.wait = wait
+        self.leading = leading
+        self.trailing = trailing
+        self.max_wait = None if max_wait is None else max(max_wait, wait)
+        self._loop = loop
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._last_call_time: Optional[float] = None
+        self._last_invoke_time = 0.0
+        self._pending = None
+        update_wrapper(self, function)
+
+    def __get__(self, instance, owner):
+        # When used on a method, each instance gets its own wrapper
+        if instance is None:
+            return self
+        name = f"_rate_limited_{id(self)}"
+        bound = instance.__dict__.get(name, None)
+        if bound is None:
+            bound = RateLimited(
+                self.function.__get__(instance, owner),
+                self.wait,
+                leading=self.leading,
+                trailing=self.trailing,
+                max_wait=self.max_wait,
+                loop=self._loop,
+            )
+            instance.__dict__[name] = bound
+        return bound
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop or ticker.loop
+
+    def __call__(self, *args, **kwargs):
+        call = (args, kwargs, _current_kernel_context())
+        loop = self.loop
+        if _running_loop() is loop:
+            self._call(call)
+        else:
+            loop.call_soon_threadsafe(self._call, call)
+
+    def cancel(self):
+        """Drop any pending invocation."""
+        self._loop_call(self._cancel)
+
+    def flush(self):
+        """Invoke any pending call immediately."""
+        self._loop_call(self._flush)
+
+    @property
+    def pending(self) -> bool:
+        return self._handle is not None
+
+    def _loop_call(self, function):
+        loop = self.loop
+        if _running_loop() is loop:
+            function()
+        else:
+            loop.call_soon_threadsafe(function)
+
+    def _call(self, call):
+        now = self.loop.time()
+        invoking = self._should_invoke(now)
+        self._pending = call
+        self._last_call_time = now
+
+        if invoking:
+            if self._handle is None:
+                self._leading_edge(now)
+                return
+            if self.max_wait is not None:
+                # Handle calls that keep coming in without a break
+                self._start_timer(self.wait)
+                self._invoke(now)
+                return
+        if self._handle is None:
+            self._start_timer(self.wait)
+
+    def _should_invoke(self, now: float) -> bool:
+        if self._last_call_time is None:
+            return True
+        since_call = now - self._last_call_time
+        since_invoke = now - self._last_invoke_time
+        return (
+            since_call >= self.wait
+            or since_call < 0
+            or (self.max_wait is not None and since_invoke >= self.max_wait)
+        )
+
+    def _remaining_wait(self, now: float) -> float:
+        remaining = self.wait - (now - self._last_call_time)
+        if self.max_wait is not None:
+            remaining = min(remaining, self.max_wait - (now - self._last_invoke_time))
+        return remaining
+
+    def _start_timer(self, delay: float):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.loop.call_at(self.loop.time() + delay, self._timer_expired)
+
+    def _timer_expired(self):
+        self._handle = None
+        now = self.loop.time()
+        if self._should_invoke(now):
+            self._trailing_edge(now)
+        else:
+            self._start_timer(self._remaining_wait(now))
+
+    def _leading_edge(self, now: float):
+        self._last_invoke_time = now
+        self._start_timer(self.wait)
+        if self.leading:
+            self._invoke(now)
+
+    def _trailing_edge(self, now: float):
+        if self.trailing and self._pending is not None:
+            self._invoke(now)
+        self._pending = None
+
+    def _invoke(self, now: float):
+        args, kwargs, context = self._pending
+        self._pending = None
+        self._last_invoke_time = now
+        try:
+            if context is not None:
+                with context:
+                    self.function(*args, **kwargs)
+            else:
+                self.function(*args, **kwargs)
+        except Exception:
+            logger.exception(f"Error in rate-limited call to {self.function!r}")
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._pending = None
+        self._last_call_time = None
+        self._last_invoke_time = 0.0
+
+    def _flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._trailing_edge(self.loop.time())
+
+
+def debounce(wait, leading=False, trailing=True, max_wait=None, loop=None):
+    """
+    Decorator that will postpone a function's execution until after `wait` seconds have elapsed
+    since the last time it was invoked. See `RateLimited` for the options.
+    """
+
+    def decorator(function):
+        return RateLimited(function, wait, leading=leading, trailing=trailing, max_wait=max_wait, loop=loop)
+
+    return decorator
+
+
+def throttle(wait, leading=True, trailing=True, loop=None):
+    """
+    Decorator that will invoke a function at most once every `wait` seconds.
+    See `RateLimited` for the options.
+    """
+    return debounce(wait, leading=leading, trailing=trailing, max_wait=wait, loop=loop)
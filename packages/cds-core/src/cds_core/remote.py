@@ -11,13 +11,14 @@ from solara_enterprise import auth
 from cds_core.app_state import Student
 from .base_states import BaseAppState, BaseStoryState, BaseStageState
 from .logger import setup_logger
+from .urls import API_URL
 from .utils import CDSJSONEncoder
 
 logger = setup_logger("API")
 
 
 class BaseAPI:
-    API_URL = "https://api.cosmicds.cfa.harvard.edu"
+    API_URL = API_URL
 
     @cached_property
     def request_session(self):
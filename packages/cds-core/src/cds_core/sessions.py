@@ -0,0 +1,242 @@
+import os
+import time
+import weakref
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import solara
+from solara import Reactive
+
+from .base_states import BaseAppState, BaseStoryState
+from .logger import setup_logger
+from .subscriptions import Subscriptions, use_subscriptions
+from .ticker import _current_kernel_context, call_every
+
+__all__ = [
+    "IDLE_TIMEOUT",
+    "SessionRecord",
+    "session_evicted",
+    "track_viewer",
+    "register_memory_source",
+    "use_session_tracking",
+    "resume_session",
+    "session_memory_report",
+    "evict_idle_sessions",
+]
+
+logger = setup_logger("SESSIONS")
+
+# The number of seconds that a session can be inactive before its glue
+# application and viewers are torn down. Zero (the default) disables eviction.
+IDLE_TIMEOUT = float(os.getenv("CDS_IDLE_TIMEOUT_MINUTES", "0")) * 60
+
+CHECK_INTERVAL = 60  # seconds
+
+# Whether the current session's glue application has been torn down.
+# While it is, the layout shows a notice instead of the story pages.
+session_evicted = solara.reactive(False)
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (int, float)):
+        return 8
+    return 0
+
+
+class SessionRecord:
+    """The state that's kept about each session for accounting and eviction."""
+
+    def __init__(self, context, app_state: Reactive[BaseAppState], viewers: weakref.WeakSet):
+        self.context = context
+        self.app_state = app_state
+        self.viewers = viewers
+        self.last_active = time.monotonic()
+        self.evicted = False
+
+    @property
+    def id(self) -> str:
+        return self.context.id
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_active
+
+    @property
+    def closed(self) -> bool:
+        return self.context.closed_event.is_set()
+
+    def touch(self, *args):
+        self.last_active = time.monotonic()
+
+
+MemorySource = Callable[[SessionRecord], int]
+
+
+def _glue_data_bytes(record: SessionRecord) -> int:
+    # Don't create the data collection just to measure it
+    data_collection = record.app_state.value.__dict__.get("glue_data_collection", None)
+    if data_collection is None:
+        return 0
+    total = 0
+    for data in data_collection:
+        for cid in data.components:
+            component = data.get_component(cid)
+            total += sum(_nbytes(value) for value in vars(component).values() if isinstance(value, np.ndarray))
+    return total
+
+
+def _figure_bytes(record: SessionRecord) -> int:
+    total = 0
+    for viewer in list(record.viewers):
+        figure = getattr(viewer, "figure", None)
+        if figure is None:
+            continue
+        for trace in figure.data:
+            total += sum(_nbytes(value) for value in (getattr(trace, "_props", None) or {}).values())
+    return total
+
+
+_memory_sources: Dict[str, MemorySource] = {
+    "glue_data": _glue_data_bytes,
+    "figures": _figure_bytes,
+}
+
+
+def register_memory_source(name: str, source: MemorySource):
+    """
+    Add to the memory accounting. `source` is passed the record of a session,
+    and returns the (approximate) number of bytes that it uses. It's called
+    within the session's kernel context.
+    """
+    _memory_sources[name] = source
+
+
+_sessions: Dict[str, SessionRecord] = {}
+_sessions_lock = Lock()
+_viewers: Dict[str, weakref.WeakSet] = {}
+_checker = None
+
+
+def _forget(context_id: str):
+    with _sessions_lock:
+        _sessions.pop(context_id, None)
+        _viewers.pop(context_id, None)
+
+
+def _register(context, app_state: Reactive[BaseAppState]) -> SessionRecord:
+    global _checker
+    with _sessions_lock:
+        record = _sessions.get(context.id, None)
+        if record is None:
+            viewers = _viewers.setdefault(context.id, weakref.WeakSet())
+            record = _sessions[context.id] = SessionRecord(context, app_state, viewers)
+            on_close = getattr(context, "on_close", None)
+            if on_close is not None:
+                on_close(lambda: _forget(context.id))
+        if IDLE_TIMEOUT > 0 and _checker is None:
+            _checker = call_every(CHECK_INTERVAL, evict_idle_sessions, in_context=False)
+    return record
+
+
+def track_viewer(viewer):
+    """Include a viewer in the current session's accounting, and close it on eviction."""
+    context = _current_kernel_context()
+    if context is None:
+        return
+    with _sessions_lock:
+        _viewers.setdefault(context.id, weakref.WeakSet()).add(viewer)
+
+
+def use_session_tracking(
+    app_state: Reactive[BaseAppState], story_state: Optional[Reactive[BaseStoryState]] = None
+) -> bool:
+    """
+    Register the current session for memory accounting and idle eviction. Changes to
+    the app or story state count as activity. Returns whether the session's glue
+    application has been evicted.
+    """
+    context = _current_kernel_context()
+
+    def _setup(subscriptions: Subscriptions):
+        if context is None:
+            return
+        record = _register(context, app_state)
+        subscriptions.subscribe(app_state, record.touch)
+        if story_state is not None:
+            subscriptions.subscribe(story_state, record.touch)
+
+    use_subscriptions(_setup)
+
+    return session_evicted.value
+
+
+def _evict(record: SessionRecord):
+    logger.info(f"Evicting glue application of session {record.id}, idle for {record.idle_seconds / 60:.0f} minutes")
+    record.evicted = True
+    with record.context:
+        # Unmount the pages first, so that nothing tries to use the glue application
+        session_evicted.set(True)
+        for viewer in list(record.viewers):
+            figure = getattr(viewer, "figure", None)
+            if figure is not None:
+                figure.close()
+        record.viewers.clear()
+        record.app_state.value.reset_glue()
+
+
+def evict_idle_sessions():
+    """Tear down the glue applications of sessions that have been idle for too long."""
+    with _sessions_lock:
+        records = list(_sessions.values())
+    for record in records:
+        if record.closed:
+            _forget(record.id)
+        elif not record.evicted and record.idle_seconds >= IDLE_TIMEOUT:
+            try:
+                _evict(record)
+            except Exception:
+                logger.exception(f"Error evicting session {record.id}")
+
+
+def resume_session():
+    """
+    Bring back the current session after an eviction. The pages are mounted again,
+    and rebuild their glue data and viewers from the story state.
+    """
+    context = _current_kernel_context()
+    record = None if context is None else _sessions.get(context.id, None)
+    if record is not None:
+        record.evicted = False
+        record.touch()
+    session_evicted.set(False)
+
+
+def session_memory_report() -> List[Dict[str, Any]]:
+    """The approximate memory use (in bytes) of each session, by source, for operators."""
+    with _sessions_lock:
+        records = list(_sessions.values())
+    report = []
+    for record in records:
+        entry: Dict[str, Any] = {
+            "session": record.id,
+            "idle_seconds": round(record.idle_seconds),
+            "evicted": record.evicted,
+        }
+        # The report is made outside of any session, so each session's own
+        # state (e.g. its app state) is only seen from within its context
+        with record.context:
+            for name, source in _memory_sources.items():
+                try:
+                    entry[name] = source(record)
+                except Exception:
+                    logger.exception(f"Error measuring {name} for session {record.id}")
+                    entry[name] = None
+        report.append(entry)
+    return report
@@ -0,0 +1,206 @@
+import os
+import weakref
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import solara
+from solara import Reactive
+from solara.toestand import ValueBase
+
+from .logger import setup_logger
+
+__all__ = [
+    "Subscriptions",
+    "use_subscriptions",
+    "use_subscribe",
+    "subscription_counts",
+    "report_subscriptions",
+]
+
+logger = setup_logger("SUBSCRIPTIONS")
+
+debug_subscriptions = os.getenv("CDS_DEBUG_MODE", "false").strip().lower() == "true"
+
+# When counting subscriptions, warn once a reactive has at least this many
+# subscribers, and again every time that the count doubles after that
+GROWTH_WARNING_THRESHOLD = 16
+
+Unsubscribe = Callable[[], None]
+
+
+# Listeners are stored per scope (i.e. per kernel) on the storage of each reactive
+ListenerKey = Tuple[str, int]
+
+
+def _listener_count(storage: ValueBase, scope_id: str) -> int:
+    return len(storage.listeners.get(scope_id, ())) + len(storage.listeners2.get(scope_id, ()))
+
+
+def _storage_name(storage: ValueBase, scope_id: str) -> str:
+    # Don't use the repr of the reactive, as that includes its (possibly large) value
+    key = getattr(storage, "storage_key", None) or hex(id(storage))
+    name = f"<Reactive {key}>"
+    return name if scope_id == "global" else f"[{scope_id}] {name}"
+
+
+class _SubscriptionCounter:
+    """
+    Keeps track of the number of listeners of each reactive, and warns when the
+    number for a reactive keeps growing. This counts the listeners that solara
+    actually holds, so subscriptions that are never removed are caught whether
+    or not they were made through this module. Field subscriptions (e.g. through
+    a `Ref`) are listeners of the root reactive, so they're counted there.
+    """
+
+    def __init__(self):
+        self._storages: Dict[ListenerKey, Tuple[weakref.ref, str]] = {}
+        self._warn_at: Dict[ListenerKey, int] = {}
+        self._lock = Lock()
+
+    def track(self, storage: ValueBase, unsubscribe: Unsubscribe) -> Unsubscribe:
+        scope_id = storage._get_scope_key()
+        key = (scope_id, id(storage))
+        with self._lock:
+            self._storages[key] = (weakref.ref(storage), scope_id)
+        self._check(key)
+
+        def untrack():
+            unsubscribe()
+            self._check(key)
+
+        return untrack
+
+    def _check(self, key: ListenerKey):
+        with self._lock:
+            entry = self._storages.get(key, None)
+            storage = None if entry is None else entry[0]()
+            if storage is None:
+                self._storages.pop(key, None)
+                self._warn_at.pop(key, None)
+                return
+            scope_id = entry[1]
+            count = _listener_count(storage, scope_id)
+            if count == 0:
+                self._storages.pop(key)
+                self._warn_at.pop(key, None)
+                return
+            warn_at = self._warn_at.get(key, GROWTH_WARNING_THRESHOLD)
+            if count < warn_at:
+                return
+            self._warn_at[key] = 2 * warn_at
+        logger.warning(
+            f"{_storage_name(storage, scope_id)} has {count} listeners. Are subscriptions being leaked?"
+        )
+
+    def counts(self) -> Dict[str, int]:
+        counts = {}
+        with self._lock:
+            entries = list(self._storages.values())
+        for ref, scope_id in entries:
+            storage = ref()
+            if storage is not None:
+                count = _listener_count(storage, scope_id)
+                if count > 0:
+                    counts[_storage_name(storage, scope_id)] = count
+        return counts
+
+
+_counter = _SubscriptionCounter()
+
+
+def _install_listener_counting():
+    """
+    Count the listeners of every reactive as they're added and removed. Reactives,
+    fields and refs all subscribe through the `ValueBase` methods of their storage.
+    """
+    if getattr(ValueBase, "_cds_counting_listeners", False):
+        return
+
+    original_subscribe = ValueBase.subscribe
+    original_subscribe_change = ValueBase.subscribe_change
+
+    def subscribe(self, listener, scope=None):
+        return _counter.track(self, original_subscribe(self, listener, scope=scope))
+
+    def subscribe_change(self, listener, scope=None):
+        return _counter.track(self, original_subscribe_change(self, listener, scope=scope))
+
+    ValueBase.subscribe = subscribe
+    ValueBase.subscribe_change = subscribe_change
+    ValueBase._cds_counting_listeners = True
+
+
+if debug_subscriptions:
+    _install_listener_counting()
+
+
+class Subscriptions:
+    """
+    A collection of reactive subscriptions that can all be removed at once.
+    Use `use_subscriptions` to tie the subscriptions to the lifetime of a component.
+    """
+
+    def __init__(self):
+        self._unsubscribers: List[Unsubscribe] = []
+
+    def subscribe(self, reactive: Reactive, listener: Callable[[Any], None]) -> Unsubscribe:
+        return self.add(reactive.subscribe(listener))
+
+    def subscribe_change(self, reactive: Reactive, listener: Callable[[Any, Any], None]) -> Unsubscribe:
+        return self.add(reactive.subscribe_change(listener))
+
+    def add(self, unsubscribe: Unsubscribe) -> Unsubscribe:
+        """Add an existing subscription, given the function that removes it."""
+        self._unsubscribers.append(unsubscribe)
+        return unsubscribe
+
+    def unsubscribe_all(self):
+        unsubscribers, self._unsubscribers = self._unsubscribers, []
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    def __len__(self) -> int:
+        return len(self._unsubscribers)
+
+
+def use_subscriptions(setup: Callable[[Subscriptions], None], dependencies: Optional[list] = None):
+    """
+    Run `setup` as an effect, with a `Subscriptions` instance to subscribe through.
+    Those subscriptions are removed when the component is unmounted, or before the
+    effect runs again when the dependencies change.
+    """
+
+    def effect():
+        subscriptions = Subscriptions()
+        setup(subscriptions)
+        return subscriptions.unsubscribe_all
+
+    solara.use_effect(effect, dependencies=[] if dependencies is None else dependencies)
+
+
+def use_subscribe(reactive: Optional[Reactive], listener: Callable[[Any], None], dependencies: Optional[list] = None):
+    """
+    Subscribe `listener` to `reactive` for the lifetime of the component.
+    Does nothing if `reactive` is None.
+    """
+
+    def setup(subscriptions: Subscriptions):
+        if reactive is not None:
+            subscriptions.subscribe(reactive, listener)
+
+    use_subscriptions(setup, dependencies=[reactive] if dependencies is None else dependencies)
+
+
+def subscription_counts() -> Dict[str, int]:
+    """
+    The number of listeners of each reactive. Listeners are only
+    counted in debug mode (i.e. when CDS_DEBUG_MODE is set).
+    """
+    return _counter.counts()
+
+
+def report_subscriptions():
+    """Log the number of listeners of each reactive."""
+    counts = sorted(subscription_counts().items(), key=lambda item: item[1], reverse=True)
+    for name, count in counts:
+        logger.info(f"{count:5d} {name}")
@@ -0,0 +1,206 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+import os
+import threading
+import weakref
+from typing import Callable, List, Optional, Tuple
+
+from .logger import setup_logger
+
+__all__ = ["Ticker", "PeriodicCallback", "ticker", "call_every"]
+
+logger = setup_logger("TICKER")
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _current_kernel_context():
+    try:
+        import solara.server.kernel_context
+    except ImportError:
+        return None
+
+    if solara.server.kernel_context.has_current_context():
+        return solara.server.kernel_context.get_current_context()
+    return None
+
+
+class PeriodicCallback:
+    """
+    A handle for a callback that has been registered with a `Ticker`.
+
+    If the callback is a bound method, only a weak reference to it is kept, so that
+    a periodic callback doesn't keep its owner alive. The callback is cancelled
+    once its owner has been garbage collected.
+    """
+
+    def __init__(self, interval: float, callback: Callable[[], None], context=None):
+        self.interval = interval
+        if inspect.ismethod(callback):
+            self._callback_ref = weakref.WeakMethod(callback)
+        else:
+            self._callback_ref = lambda: callback
+        self._context = context
+        self.active = True
+
+    def cancel(self):
+        # The ticker drops cancelled callbacks the next time that it reaches them
+        self.active = False
+
+    def _run(self):
+        callback = self._callback_ref()
+        if callback is None:
+            self.active = False
+            return
+
+        try:
+            if self._context is not None:
+                with self._context:
+                    callback()
+            else:
+                callback()
+        except Exception:
+            logger.exception("Error in periodic callback")
+
+
+class Ticker:
+    """
+    A scheduler for periodic callbacks that runs on an asyncio event loop, rather
+    than using a thread (or timer) per callback. All of the callbacks registered
+    with a ticker share a single timer on the loop, which is set for the next
+    callback that is due.
+
+    The loop is the one passed to `attach` (e.g. the server's loop at startup),
+    or the running loop at the time of the first registration. If neither exists,
+    a single background loop is started.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._heap: List[Tuple[float, int, PeriodicCallback]] = []
+        self._counter = itertools.count()
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """
+        Run the callbacks on `loop` (e.g. the server's loop, from its lifespan).
+        Callbacks that were registered before move to it.
+        """
+        with self._loop_lock:
+            previous, self._loop = self._loop, loop
+        if previous is loop:
+            return
+
+        handle, self._handle = self._handle, None
+        if handle is not None and not previous.is_closed():
+            previous.call_soon_threadsafe(handle.cancel)
+        if previous is not None and previous is self._background_loop:
+            previous.call_soon_threadsafe(previous.stop)
+            self._background_loop = None
+        self._call_in_loop(self._schedule)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or self._loop.is_closed():
+            with self._loop_lock:
+                if self._loop is None or self._loop.is_closed():
+                    self._loop = _running_loop() or self._start_background_loop()
+                    if self._heap:
+                        # e.g. callbacks that were registered before a fork
+                        self._loop.call_soon_threadsafe(self._schedule)
+        return self._loop
+
+    def _start_background_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="cds-ticker", daemon=True)
+        thread.start()
+        self._background_loop = loop
+        return loop
+
+    def _reset_after_fork(self):
+        # Neither the parent's loop nor its background thread exist in a forked
+        # child (e.g. a pre-forking server's worker), and the lock may have been
+        # held when the parent forked. Callbacks that were registered in the parent
+        # are kept (the loops' clock is shared with the parent, so their due times
+        # still hold), and are scheduled once the child has a loop.
+        self._loop = None
+        self._background_loop = None
+        self._loop_lock = threading.Lock()
+        self._handle = None
+        self._heap = [item for item in self._heap if item[2].active]
+
+    def call_every(
+        self, interval: float, callback: Callable[[], None], in_context: bool = True
+    ) -> PeriodicCallback:
+        """
+        Call `callback` every `interval` seconds until the returned handle is cancelled.
+        If this is called from within a solara kernel context, the callback runs inside
+        of that context and is cancelled when the kernel closes, unless `in_context`
+        is False (e.g. for process-wide callbacks).
+        """
+        context = _current_kernel_context() if in_context else None
+        entry = PeriodicCallback(interval, callback, context=context)
+        on_close = getattr(context, "on_close", None)
+        if on_close is not None:
+            on_close(entry.cancel)
+        self._call_in_loop(self._add, entry)
+        return entry
+
+    def _call_in_loop(self, function, *args):
+        loop = self.loop
+        if _running_loop() is loop:
+            function(*args)
+        else:
+            loop.call_soon_threadsafe(function, *args)
+
+    def _add(self, entry: PeriodicCallback):
+        heapq.heappush(self._heap, (self.loop.time() + entry.interval, next(self._counter), entry))
+        self._schedule()
+
+    def _schedule(self):
+        while self._heap and not self._heap[0][2].active:
+            heapq.heappop(self._heap)
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._heap:
+            self._handle = self.loop.call_at(self._heap[0][0], self._tick)
+
+    def _tick(self):
+        self._handle = None
+        now = self.loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            due, _, entry = heapq.heappop(self._heap)
+            if not entry.active:
+                continue
+            entry._run()
+            if entry.active:
+                # Keep to the original schedule, but don't try to catch up on missed ticks
+                next_due = due + entry.interval
+                if next_due <= now:
+                    next_due = now + entry.interval
+                heapq.heappush(self._heap, (next_due, next(self._counter), entry))
+        self._schedule()
+
+    def __len__(self) -> int:
+        return sum(1 for _, _, entry in self._heap if entry.active)
+
+
+ticker = Ticker()
+os.register_at_fork(after_in_child=ticker._reset_after_fork)
+
+
+def call_every(
+    interval: float, callback: Callable[[], None], in_context: bool = True
+) -> PeriodicCallback:
+    """Register a periodic callback with the process-wide `ticker`."""
+    return ticker.call_every(interval, callback, in_context=in_context)
@@ -7,12 +7,12 @@ from glue.core.message import (DataCollectionDeleteMessage, DataUpdateMessage,
                                SubsetMessage, SubsetUpdateMessage)
 from glue.core.exceptions import IncompatibleAttribute
 from glue_jupyter.bqplot.common.tools import Tool
+from astropy.modeling.models import Linear1D
 from numpy import isfinite, isnan
-from numpy.linalg import LinAlgError
 from traitlets import Unicode, HasTraits
 
 from ..config import register_tool
-from ..utils import fit_line, line_mark
+from ..utils import fit_slopes, line_mark
 
 
 
@@ -94,11 +94,7 @@ class LineFitTool(Tool, HubListener, HasTraits):
     # Message handlers
 
     def _on_data_collection_deleted(self, msg):
-        remove = [data for data in self.lines.keys() if data == msg.data]
-        lines = [self.lines[x] for x in remove]
-        self.figure.data = [mark for mark in self.figure.data if mark not in lines]
-        for state in remove:
-            self._remove_line(state)
+        self._remove_lines([data for data in self.lines.keys() if data == msg.data])
 
     def _refresh_if_active(self):
         if self.active:
@@ -119,7 +115,7 @@ class LineFitTool(Tool, HubListener, HasTraits):
         state = layer.state
         visible = state.visible
         if visible:
-            self._update_fit_line(state)
+            self._update_fit_lines([state])
         else:
             self._remove_line(state)
 
@@ -133,8 +129,8 @@ class LineFitTool(Tool, HubListener, HasTraits):
         # Update the color
         # If we have other properties to update in the future, we can do so here
         color = self._get_layer_color(layer.state)
-        if mark.color != color:
-            mark.color = color
+        if mark.line.color != color:
+            mark.line.color = color
 
 
     # Properties
@@ -203,88 +199,102 @@ class LineFitTool(Tool, HubListener, HasTraits):
 
     # Methods for fitting lines
 
-    def _fit_line(self, state):
-        data = state.layer
-        mask = isfinite(data[self.viewer.state.x_att]) & isfinite(data[self.viewer.state.y_att])
-        x = data[self.viewer.state.x_att][mask]
-        y = data[self.viewer.state.y_att][mask]
-        return fit_line(x, y)
-
-    def _create_fit_line(self, state):
-
-        # Do the fit
-        fit = self._fit_line(state)
-        if fit is None:
-            return None, None
-    
-        # Create the fit line object
-        # Keep track of this line and its slope
+    def _fit_slopes(self, states):
+        # Fit all of the given layers in a single vectorized pass.
+        # Layers that can't be fit are left out of the result
+        fit_states, xs, ys = [], [], []
+        for state in states:
+            data = state.layer
+            try:
+                x = data[self.viewer.state.x_att]
+                y = data[self.viewer.state.y_att]
+            except IncompatibleAttribute:
+                continue
+            fit_states.append(state)
+            xs.append(x)
+            ys.append(y)
+
+        slopes = fit_slopes(xs, ys)
+        return [(state, slope) for state, slope in zip(fit_states, slopes) if isfinite(slope)]
+
+    def _line_label(self, state, slope):
+        if not self.show_labels:
+            return None
+        return self.label(state, Linear1D(slope=slope, intercept=0))
+
+    def _create_line_mark(self, state, slope):
         # For now, the line spans from 0 to twice the edge of the viewer
-        y = fit(self.x_range)
         start_x, end_x = self.x_range
-        start_y, end_y = y
-        slope = fit.slope.value
-        label = self.label(state, fit) if self.show_labels else None
         color = self._get_layer_color(state)
-        line = line_mark(start_x, start_y, end_x, end_y, color, label)
-        return line, slope
-
-    def _update_fit_line(self, state):
-        data = state.layer
-        if data in self.lines.keys():
-            fit = self._fit_line(state)
-            if fit is None:
-                return
-            mark = self.lines[data]
-            mark.x = self.x_range
-            mark.y = fit(self.x_range)
-            slope = fit.slope.value
-            self.slopes[data] = slope
-            label = self.label(state, fit) if self.show_labels else None
-            is_label = label is not None
-            mark.marker['color'] = self._get_layer_color(state)
-            mark.showlegend = is_label
-            mark.name = label if is_label else ''
-        else:
-            self._fit_to_layer(state)
-
+        label = self._line_label(state, slope)
+        return line_mark(start_x, slope * start_x, end_x, slope * end_x, color, label)
 
-    def _fit_to_layer(self, state, add_marks=True):
-        try:
-            line, slope = self._create_fit_line(state)
-            if line is None:
-                return
-            data = state.layer
-            if add_marks:
-                line = self.figure.add_trace(line).data[-1]
-            self.lines[data] = line
-            self.slopes[data] = slope
-        except (IncompatibleAttribute, LinAlgError, SystemError) as e:
-            pass
-
-        
+    def _update_line_mark(self, mark, state, slope):
+        start_x, end_x = self.x_range
+        label = self._line_label(state, slope)
+        is_label = label is not None
+        mark.update(x=[start_x, end_x],
+                    y=[slope * start_x, slope * end_x],
+                    line_color=self._get_layer_color(state),
+                    showlegend=is_label,
+                    name=label if is_label else '')
+
+    def _update_fit_lines(self, states, remove_stale=False):
+        """
+        Refit the given layers, updating their existing line traces in place
+        and adding traces only for layers that don't have one yet.
+        If `remove_stale` is True, lines for any other layers are removed.
+        """
+        fits = self._fit_slopes(states)
+        fit_data = {state.layer for state, _ in fits}
+        targets = {state.layer for state in states}
+        self._remove_lines([data for data in self.lines.keys()
+                            if (remove_stale or data in targets) and data not in fit_data])
+
+        new_states, new_marks = [], []
+        with self.figure.batch_update():
+            for state, slope in fits:
+                data = state.layer
+                self.slopes[data] = slope
+                mark = self.lines.get(data, None)
+                if mark is None:
+                    new_states.append(state)
+                    new_marks.append(self._create_line_mark(state, slope))
+                else:
+                    self._update_line_mark(mark, state, slope)
+
+        if new_marks:
+            # The traces that get added aren't the same instances as those we pass in,
+            # so grab references to them after they've been added
+            self.figure.add_traces(new_marks)
+            added = self.figure.data[-len(new_marks):]
+            for state, mark in zip(new_states, added):
+                self.lines[state.layer] = mark
 
     def _fit_to_layers(self):
-        self._clear_lines()
-        for state in self.visible_layers:
-            if not any(condition(state) for condition in self._ignore_conditions):
-                self._fit_to_layer(state, add_marks=True)
+        states = [state for state in self.visible_layers
+                  if not any(condition(state) for condition in self._ignore_conditions)]
+        self._update_fit_lines(states, remove_stale=True)
 
     def _update_fit_line_for_data(self, data):
         for state in self.visible_layers:
             if state.layer == data:
-                self._update_fit_line(state)
+                self._update_fit_lines([state])
                 return
 
+    def _remove_lines(self, datas):
+        marks = [self.lines.pop(data) for data in datas if data in self.lines]
+        for data in datas:
+            self.slopes.pop(data, None)
+        if marks:
+            mark_ids = {id(mark) for mark in marks}
+            self.figure.data = [mark for mark in self.figure.data if id(mark) not in mark_ids]
+
     def _remove_line(self, state):
-        data = state.layer
-        line = self.lines.get(data, None)
-        self.lines.pop(data, None)
-        self.slopes.pop(data, None)
-        self.figure.data = [mark for mark in self.figure.data if mark != line]
+        self._remove_lines([state.layer])
 
     def _clear_lines(self):
-        self.figure.data = [mark for mark in self.figure.data if mark not in self.line_marks]
+        self._remove_lines(list(self.lines.keys()))
         self.lines = {}
         self.slopes = {}
 
@@ -0,0 +1,10 @@
+"""
+The URLs of the services that the CosmicDS packages use. This module doesn't import
+anything else, so that the servers (e.g. their health checks) can use it without
+importing glue or Solara.
+"""
+
+__all__ = ["API_URL"]
+
+# The URL for the CosmicDS API
+API_URL = "https://api.cosmicds.cfa.harvard.edu"
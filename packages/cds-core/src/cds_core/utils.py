@@ -1,50 +1,46 @@
-from collections import Counter
 from datetime import datetime
 import json
 from numbers import Number
 import os
 from math import log10
 from types import UnionType
-from glue.core import Component, ComponentID, Data, DataCollection
-from glue.core.roi import CategoricalComponent
-from glue_plotly.viewers import PlotlyBaseView
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
 from requests import adapters
 import random
 from types import NoneType
-from typing import Dict, Type, Union, get_args, get_origin
+from typing import TYPE_CHECKING, Dict, Type, Union, get_args, get_origin
 
-from IPython.display import Javascript, display
-
-from astropy.modeling import models, fitting
-from plotly.graph_objects import Scatter
-
-from glue.core.state_objects import State
 import numpy as np
-from threading import Timer, Event
-from functools import wraps
 from traitlets import Unicode
-from zmq.eventloop.ioloop import IOLoop
 from enum import Enum
 
+from .rate_limit import debounce, throttle
+from .urls import API_URL
+
+# glue, plotly, astropy.modeling and IPython are imported where they're used,
+# as they're slow to import and most of this module doesn't need them
+if TYPE_CHECKING:
+    from glue.core import Component, ComponentID, DataCollection
+    from glue_plotly.viewers import PlotlyBaseView
+
 __all__ = [
     "load_template",
     "update_figure_css",
     "extend_tool",
     "convert_material_color",
     "fit_line",
+    "fit_slopes",
+    "minmax_downsample",
     "line_mark",
     "vertical_line_mark",
     "API_URL",
     "CDSJSONEncoder",
     "RepeatedTimer",
     "debounce",
+    "throttle",
 ]
 
-# The URL for the CosmicDS API
-API_URL = "https://api.cosmicds.cfa.harvard.edu"
-
 CDS_IMAGE_BASE_URL = (
     "https://cosmicds.github.io/cds-website/cosmicds_images/mean_median_mode"
 )
@@ -69,43 +65,49 @@ class CDSJSONEncoder(json.JSONEncoder):
             return float(obj)
         if isinstance(obj, np.ndarray):
             return obj.tolist()
-        if isinstance(obj, State):
-            return obj.as_dict()
         if isinstance(obj, datetime):
             return f"{obj}"
         if isinstance(obj, Enum):
             return obj.value
+
+        from glue.core.state_objects import State
+
+        if isinstance(obj, State):
+            return obj.as_dict()
         return super(CDSJSONEncoder, self).default(obj)
 
 
-# JC: I got this from https://stackoverflow.com/a/13151299
 class RepeatedTimer(object):
+    """
+    Call a function every `interval` seconds. This is a thin wrapper around
+    the process-wide `cds_core.ticker.ticker`, so no threads are created.
+    """
+
     def __init__(self, interval, function, *args, **kwargs):
-        self._timer = None
+        self._handle = None
         self.interval = interval
         self.function = function
         self.args = args
         self.kwargs = kwargs
-        self.is_running = False
         self.start()
 
+    @property
+    def is_running(self):
+        return self._handle is not None and self._handle.active
+
     def _run(self):
-        self.is_running = False
-        loop = IOLoop()
-        loop.make_current()
-        self.start()
         self.function(*self.args, **self.kwargs)
-        loop.close()
 
     def start(self):
+        from .ticker import call_every
+
         if not self.is_running:
-            self._timer = Timer(self.interval, self._run)
-            self._timer.start()
-            self.is_running = True
+            self._handle = call_every(self.interval, self._run)
 
     def stop(self):
-        self._timer.cancel()
-        self.is_running = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
 
 
 def load_template(file_name, path=None, traitlet=False):
@@ -262,12 +264,109 @@ def convert_material_color(color_string):
 
 
 def fit_line(x, y):
+    from astropy.modeling import fitting, models
+
     fit = fitting.LinearLSQFitter()
     line_init = models.Linear1D(intercept=0, fixed={"intercept": True})
     fitted_line = fit(line_init, x, y)
     return fitted_line
 
 
+def fit_slopes(xs, ys):
+    """
+    Compute the least-squares slopes of lines through the origin (as in `fit_line`)
+    for several datasets at once, using the closed-form solution sum(xy) / sum(x^2).
+
+    Parameters
+    ----------
+    xs : sequence of array-like
+        The x values of each dataset.
+    ys : sequence of array-like
+        The y values of each dataset, matching ``xs`` in length.
+
+    Returns
+    -------
+    `numpy.ndarray`
+        The slope for each dataset. Non-finite points are ignored, and datasets
+        without any usable points have a slope of NaN.
+    """
+    count = len(xs)
+    if count == 0:
+        return np.array([])
+
+    sizes = [len(x) for x in xs]
+    x = np.concatenate([np.asarray(x, dtype=float) for x in xs])
+    y = np.concatenate([np.asarray(y, dtype=float) for y in ys])
+    groups = np.repeat(np.arange(count), sizes)
+
+    mask = np.isfinite(x) & np.isfinite(y)
+    x, y, groups = x[mask], y[mask], groups[mask]
+    sxy = np.bincount(groups, weights=x * y, minlength=count)
+    sxx = np.bincount(groups, weights=x * x, minlength=count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(sxx > 0, sxy / sxx, np.nan)
+
+
+def minmax_downsample(x, y, max_points, x_range=None):
+    """
+    Choose the indices of the points of a curve to display, keeping at most about
+    ``max_points`` points across the full curve. The curve is split into buckets
+    of consecutive points and the minimum and maximum of each bucket are kept, so
+    that peaks and troughs are always actual data points.
+
+    If ``x_range`` is given, the points inside of that range are downsampled
+    separately, so that a zoomed-in region is shown at (up to) full resolution
+    while the rest of the curve stays coarse.
+
+    Parameters
+    ----------
+    x : array-like
+        The (sorted) x values of the curve.
+    y : array-like
+        The y values of the curve.
+    max_points : int
+        The approximate maximum number of points to keep in each region.
+    x_range : sequence of two floats, optional
+        The visible x range.
+
+    Returns
+    -------
+    `numpy.ndarray`
+        The sorted indices of the points to keep.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    indices = _minmax_indices(y, max_points)
+    if x_range is not None and len(x_range) == 2:
+        start, end = np.searchsorted(x, sorted(x_range))
+        # Include a point on either side of the range so that the curve
+        # doesn't stop short of the edges of the plot
+        start = max(start - 1, 0)
+        end = min(end + 1, y.size)
+        window = start + _minmax_indices(y[start:end], max_points)
+        outside = indices[(indices < start) | (indices >= end)]
+        indices = np.union1d(outside, window)
+    return indices
+
+
+def _minmax_indices(y, max_points):
+    size = y.size
+    if size <= max_points:
+        return np.arange(size)
+
+    n_buckets = max(max_points // 2, 1)
+    bucket_size = -(-size // n_buckets)
+    buckets = np.pad(y, (0, n_buckets * bucket_size - size), mode="edge")
+    buckets = buckets.reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    indices = np.concatenate((
+        offsets + np.argmin(buckets, axis=1),
+        offsets + np.argmax(buckets, axis=1),
+        [0, size - 1],
+    ))
+    return np.unique(np.minimum(indices, size - 1))
+
+
 def line_mark(start_x, start_y, end_x, end_y, color, label=None):
     """
     Creates a line between the given start and end points using Plotly's graphics objects.
@@ -286,6 +385,8 @@ def line_mark(start_x, start_y, end_x, end_y, color, label=None):
     label : str, optional
         The label for the line. If provided, the line will be added to the legend.
     """
+    from plotly.graph_objects import Scatter
+
     line = Scatter(
         x=[start_x, end_x],
         y=[start_y, end_y],
@@ -321,57 +422,6 @@ def vertical_line_mark(layer, x, color, label=None):
     )
 
 
-def debounce(wait):
-    """
-    Decorator that will postpone a function's execution until after `wait` seconds have elapsed
-    since the last time it was invoked.
-    """
-
-    def decorator(fn):
-        def debounced(*args, **kwargs):
-            def call_it():
-                return fn(*args, **kwargs)
-
-            if hasattr(debounced, "_timer"):
-                debounced._timer.cancel()
-
-            debounced._timer = Timer(wait, call_it)
-            debounced._timer.start()
-
-        return debounced
-
-    return decorator
-
-
-def _debounce(wait):
-    """
-    Decorator that will postpone a function's execution until after `wait` seconds have elapsed
-    since the last time it was invoked, and return the result of the function.
-    """
-
-    def decorator(fn):
-        @wraps(fn)
-        def debounced(*args, **kwargs):
-            def call_it():
-                debounced._result = fn(*args, **kwargs)
-                debounced._called.set()
-
-            if hasattr(debounced, "_timer"):
-                debounced._timer.cancel()
-
-            debounced._timer = Timer(wait, call_it)
-            debounced._timer.start()
-
-            debounced._called = Event()
-            debounced._called.wait()
-
-            return getattr(debounced, "_result", None)
-
-        return debounced
-
-    return decorator
-
-
 def frexp10(x, normed=False):
     """
     Find the mantissa and exponent of a value in base 10.
@@ -421,13 +471,17 @@ def mode(data, component_id, bins=None, range=None):
         indices = np.flatnonzero(hist == np.amax(hist))
         return [0.5 * (bins[idx] + bins[idx + 1]) for idx in indices]
     else:
-        values = data[component_id]
-        counter = Counter(values)
-        max_count = counter.most_common(1)[0][1]
-        return [k for k, v in counter.items() if v == max_count]
+        values = np.asarray(data[component_id])
+        if values.size == 0:
+            return []
+        uniques, counts = np.unique(values, return_counts=True)
+        return uniques[counts == counts.max()].tolist()
 
 
-def component_type_for_field(info: FieldInfo) -> Type[Component]:
+def component_type_for_field(info: FieldInfo) -> Type["Component"]:
+    from glue.core import Component
+    from glue.core.roi import CategoricalComponent
+
     if info.annotation is None:
         return Component  # TODO: What is the right result here?
     numerical = False
@@ -441,6 +495,8 @@ def component_type_for_field(info: FieldInfo) -> Type[Component]:
 
 
 def empty_data_from_model_class(cls: Type[BaseModel], label: str | None = None):
+    from glue.core import Data
+
     data_dict = {}
     for field, info in cls.model_fields.items():
         if info.annotation is None:
@@ -454,7 +510,7 @@ def empty_data_from_model_class(cls: Type[BaseModel], label: str | None = None):
 
 
 def basic_link_exists(
-    data_collection: DataCollection, id1: ComponentID, id2: ComponentID
+    data_collection: "DataCollection", id1: "ComponentID", id2: "ComponentID"
 ) -> bool:
     """NB: This only works for simple identity links."""
     ids = {id1, id2}
@@ -480,6 +536,8 @@ def combine_css(**kwargs):
 
 
 def log_to_console(msg, css="color:white;"):
+    from IPython.display import Javascript, display
+
     display(Javascript(f'console.log("%c{msg}", "{css}");'))
 
 
@@ -547,7 +605,7 @@ class LoggingAdapter(adapters.HTTPAdapter):
         pass
 
 
-def show_legend(viewer: PlotlyBaseView, show: bool = True):
+def show_legend(viewer: "PlotlyBaseView", show: bool = True):
     layout_update: Dict = {"showlegend": show}
     if show:
         layout_update["legend"] = {
@@ -560,7 +618,70 @@ def show_legend(viewer: PlotlyBaseView, show: bool = True):
     return
 
 
-def show_layer_traces_in_legend(viewer: PlotlyBaseView, show: bool = False):
+def show_layer_traces_in_legend(viewer: "PlotlyBaseView", show: bool = False):
     for layer in viewer.layers:
         for trace in layer.traces():
             trace.update(showlegend=show)
+
+
+def _close_widget_tree(widget, closed: set):
+    """
+    Close a widget, and the widgets in its synced traits (e.g. its children and
+    layout). The Vue template and ipyvue's private traits are skipped, as their
+    widgets are shared between instances.
+    """
+    from ipywidgets import Widget
+
+    if id(widget) in closed:
+        return
+    closed.add(id(widget))
+    for name in widget.keys:
+        if name == "template" or name.startswith("_"):
+            continue
+        value = getattr(widget, name, None)
+        if isinstance(value, dict):
+            value = list(value.values())
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        for item in value:
+            if isinstance(item, dict):
+                children = [child for child in item.values() if isinstance(child, Widget)]
+            else:
+                children = [item] if isinstance(item, Widget) else []
+            for child in children:
+                _close_widget_tree(child, closed)
+    widget.close()
+
+
+def release_viewer(viewer: "PlotlyBaseView", layer_states=()):
+    """
+    Release what glue doesn't when a plotly viewer is cleaned up, so that the
+    viewer and its layers can be garbage-collected. Its widgets stay registered
+    with ipywidgets until they're closed, and its viewer and layer states keep
+    each other alive through their callback properties. The layer and
+    viewer options are closed along with the widgets inside of them, while the
+    toolbar and layout are closed with only their own layouts, as they contain
+    widgets that the application shares between viewers (e.g. the subset
+    selection).
+    """
+    closed: set = set()
+    for name in ("figure", "_layout_layer_options", "_layout_viewer_options", "_output_widget"):
+        widget = getattr(viewer, name, None)
+        if widget is not None:
+            _close_widget_tree(widget, closed)
+    for name in ("toolbar", "_layout"):
+        widget = getattr(viewer, name, None)
+        if widget is not None:
+            layout = getattr(widget, "layout", None)
+            if layout is not None:
+                layout.close()
+            widget.close()
+
+    for state in (*layer_states, viewer.state):
+        state.clear_callbacks()
+        # echo keeps the value of each property in a dictionary on the (class-level)
+        # property, weakly keyed by the state. The values of list and dict properties
+        # hold callbacks that refer to the state, and the viewer and layer states refer
+        # to each other, so the states are never collected unless the values are dropped
+        for _, prop in state.iter_callback_properties():
+            prop._values.pop(state, None)
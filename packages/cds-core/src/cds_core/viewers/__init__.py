@@ -5,10 +5,15 @@ from glue_plotly.viewers.scatter import PlotlyScatterView
 
 from numpy import spacing
 
+from .. import apply_glue_settings
+
 from .state import CDSHistogramViewerState, CDSScatterViewerState
 from .viewer import cds_viewer
 
 from .dotplot import PlotlyDotPlotView
+from .lazy_viewers import LazyViewers
+
+apply_glue_settings()
 
 CDSScatterView = cds_viewer(
     PlotlyScatterView,
@@ -0,0 +1,101 @@
+import numpy as np
+from glue.core.exceptions import IncompatibleAttribute
+from glue_plotly.common.common import fixed_color
+from glue_plotly.common.dotplot import dot_size
+from glue_plotly.viewers.histogram.dotplot_layer_artist import PlotlyDotplotLayerArtist
+
+
+__all__ = ["DotplotLayerArtist"]
+
+SIZE_PROPERTIES = {"x_min", "x_max", "y_min", "y_max"}
+
+
+class DotplotLayerArtist(PlotlyDotplotLayerArtist):
+    """
+    A dot plot layer artist that finds its trace through the viewer's trace index,
+    rather than with `select_traces` over the whole figure, and leaves reordering
+    to the viewer, which reassigns the figure data at most once.
+    """
+
+    def _create_dots(self):
+        # The visual attributes that we've sent to the dots trace
+        self._visual_attrs = {}
+        return super()._create_dots()
+
+    def _update_dotplot(self, force=False, **kwargs):
+        # Any change to a layer's state is also reported by the viewer state as a
+        # change to its `layers`, which would make every layer of the viewer look
+        # for changes to its properties. A layer picks up changes to its own state
+        # through its own callback, so there's nothing for it to do here
+        if not force and kwargs.keys() == {"layers"}:
+            return
+        super()._update_dotplot(force=force, **kwargs)
+
+    def _update_data(self):
+        try:
+            dots = self._get_dots()
+            if dots:
+                x, y = self._dot_positions()
+                dots.update(x=x, y=y)
+            else:
+                dots = self._create_dots()
+                self.view.figure.add_traces(dots)
+        except (IncompatibleAttribute, ValueError):
+            pass
+
+    def _dot_positions(self):
+        # The same positions as glue_plotly's `dot_positions`, but as arrays,
+        # which plotly validates and serializes without going through each dot
+        edges, counts = self.state.histogram
+        counts = counts.astype(int)
+        centers = (edges[:-1] + edges[1:]) / 2
+        x = np.repeat(centers, counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        y = np.arange(1, x.size + 1) - starts
+        return x, y
+
+    def _get_dots(self):
+        traces = self.view.traces_with_meta(self._dots_id)
+        if traces:
+            return traces[0]
+        dots = self._create_dots()
+        if not dots:
+            return dots
+        self.view.figure.add_trace(dots)
+        # The trace that's added to the figure is a copy of the one that we pass in
+        return self.view.figure.data[-1]
+
+    def _update_visual_attributes(self, changed, force=False):
+        if not self.enabled:
+            return
+
+        # Only send the attributes that depend on what changed. The dot size depends on
+        # the bins and the axis limits, so it only changes when those do (or when forced)
+        update = {}
+        if force or "color" in changed:
+            update["marker.color"] = fixed_color(self.state)
+        if force or "alpha" in changed:
+            update["marker.opacity"] = self.state.alpha
+            update["unselected.marker.opacity"] = self.state.alpha
+        if force or "visible" in changed:
+            update["visible"] = self.state.visible
+        if force or len(changed & SIZE_PROPERTIES) > 0:
+            update["marker.size"] = dot_size(self.view, self.state)
+
+        # Nor do we resend values that the trace already has, which is often
+        # the case for the size as the other layers rescale the axes
+        update = {key: value for key, value in update.items() if self._visual_attrs.get(key) != value}
+        if not update:
+            return
+
+        with self.view.figure.batch_update():
+            for trace in self.view.traces_with_meta(self._dots_id):
+                trace.update(update)
+        self._visual_attrs.update(update)
+
+    def _update_zorder(self, *args):
+        self.view._update_zorder()
+
+    def remove(self):
+        self.view._remove_traces(self.view.traces_with_meta(self._dots_id))
+        return super().remove()
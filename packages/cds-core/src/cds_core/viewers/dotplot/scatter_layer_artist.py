@@ -1,4 +1,5 @@
 from itertools import chain
+from numpy import full
 from uuid import uuid4
 
 from glue_plotly.common import color_info
@@ -90,24 +91,24 @@ class DotplotScatterLayerArtist(LayerArtist):
         self.state.add_callback("zorder", self._update_zorder)
 
     def remove(self):
-        self.view._remove_traces([self._get_scatter()])
-        self.view._remove_traces(self._get_lines())
-        self.view._remove_traces(self._get_error_bars())
-        self.view._remove_traces(self._get_vectors())
+        ids = (self._scatter_id, self._lines_id, self._error_id, self._vector_id)
+        self.view._remove_traces(list(chain.from_iterable(self._get_traces_with_id(id) for id in ids)))
         return super().remove()
 
     def _get_traces_with_id(self, id):
-        return self.view.figure.select_traces(dict(meta=id))
+        # The viewer keeps an index of traces by ID,
+        # so this doesn't need to search the whole figure
+        return self.view.traces_with_meta(id)
 
     def _get_scatter(self):
         # The scatter trace should always exist
         # so if somehow it doesn't, then create it
-        try:
-            return next(self._get_traces_with_id(self._scatter_id))
-        except StopIteration:
-            scatter = self._create_scatter()
-            self.view.figure.add_trace(scatter)
-            return scatter
+        traces = self._get_traces_with_id(self._scatter_id)
+        if traces:
+            return traces[0]
+        scatter = self._create_scatter()
+        self.view.figure.add_trace(scatter)
+        return self.view.figure.data[-1]
 
     def _get_lines(self):
         return self._get_traces_with_id(self._lines_id)
@@ -133,7 +134,10 @@ class DotplotScatterLayerArtist(LayerArtist):
             self.enable()
 
         scatter = self._get_scatter()
-        scatter.update(x=x, y=[self.state.height for _ in x])
+        with self.view.figure.batch_update():
+            scatter.update(x=x, y=full(x.shape, self.state.height))
+            if not self.show_hover:
+                scatter.update(**self._hover_info())
 
     def _create_scatter(self):
         if isinstance(self.layer, BaseData):
@@ -143,12 +147,25 @@ class DotplotScatterLayerArtist(LayerArtist):
 
         scatter_info = dict(mode=scatter_mode(self.state),
                             name=name,
-                            hoverinfo='all',
                             unselected=dict(marker=dict(opacity=self.state.alpha)),
-                            meta=self._scatter_id)
+                            meta=self._scatter_id,
+                            **self._hover_info())
         scatter = Scatter(**scatter_info)
         return scatter
 
+    @property
+    def show_hover(self):
+        # Hover display is configured per viewer
+        return getattr(self.view, "scatter_hover", True)
+
+    def _hover_info(self):
+        if self.show_hover:
+            return dict(hoverinfo='all')
+        return dict(hoverinfo='skip', hovertemplate=None)
+
+    def _update_hover(self):
+        self._get_scatter().update(**self._hover_info())
+
     def _update_display(self, force=False, **kwargs):
         changed = self.pop_changed_properties()
 
@@ -166,11 +183,7 @@ class DotplotScatterLayerArtist(LayerArtist):
             self._update_visual_attributes(changed, force=force)
 
     def _update_zorder(self, *args):
-        current_traces = self.view.figure.data
-        traces = [self.view.selection_layer]
-        for layer in self.view.layers:
-            traces += list(layer.traces())
-        self.view.figure.data = traces + [t for t in current_traces if t not in traces]
+        self.view._update_zorder()
 
     def _update_visual_attributes(self, changed, force=False):
 
@@ -1,4 +1,4 @@
-from echo.core import add_callback, delay_callback, CallbackProperty
+from echo.core import delay_callback, CallbackProperty
 
 from .. import CDSHistogramViewerState
 
@@ -10,8 +10,11 @@ class DotPlotViewerState(CDSHistogramViewerState):
 
     def __init__(self, **kwargs):
         super(DotPlotViewerState, self).__init__(**kwargs)
-        add_callback(self, 'x_min', self._update_bins)
-        add_callback(self, 'x_max', self._update_bins)
+        self.add_global_callback(self._update_bins_for_limits)
+
+    def _update_bins_for_limits(self, **kwargs):
+        if 'x_min' in kwargs or 'x_max' in kwargs:
+            self._update_bins()
 
     def _update_bins(self, arg=None):
         with delay_callback(self, 'hist_x_min', 'hist_x_max'):
@@ -1,11 +1,13 @@
 from glue.core import Data
 from glue_plotly.viewers.histogram import PlotlyHistogramView
-from glue_plotly.viewers.histogram.dotplot_layer_artist import PlotlyDotplotLayerArtist
 
+from ...utils import release_viewer
 from ...viewers.dotplot.state import DotPlotViewerState
+from ...viewers.dotplot.dotplot_layer_artist import DotplotLayerArtist
 from ...viewers.dotplot.scatter_layer_artist import DotplotScatterLayerArtist
 
 from typing import Literal
+from weakref import WeakSet
 
 __all__ = ["PlotlyDotPlotView"]
 
@@ -15,30 +17,120 @@ class PlotlyDotPlotView(PlotlyHistogramView):
     LABEL = "Dot Plot Viewer"
 
     _state_cls = DotPlotViewerState
-    _data_artist_cls = PlotlyDotplotLayerArtist
-    _subset_artist_cls = PlotlyDotplotLayerArtist
+    _data_artist_cls = DotplotLayerArtist
+    _subset_artist_cls = DotplotLayerArtist
 
-    _scatter_layers = set()
+    # Whether scatter layers show hover information for their points.
+    # Viewers that don't need it can turn it off to avoid the per-point work
+    _scatter_hover = True
+
+    # The traces that `_trace_index` was built from. Plotly gives us a new tuple
+    # each time that we ask for the figure data, so we compare the traces themselves,
+    # and only rebuild the index when traces are added, removed or reordered
+    _indexed_traces = None
+
+    def __init__(self, *args, **kwargs):
+        # The data whose layers (including subsets) are drawn as scatter layers in this viewer.
+        # We hold these weakly so that the viewer doesn't keep data alive after it's gone
+        self._scatter_layers = WeakSet()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def selection_layer(self):
+        return next(iter(self.traces_with_meta(self.selection_layer_id)))
+
+    def _meta_trace_index(self):
+        traces = self.figure.data
+        indexed = self._indexed_traces
+        if indexed is None or len(traces) != len(indexed) or \
+                any(trace is not other for trace, other in zip(traces, indexed)):
+            index = {}
+            for position, trace in enumerate(traces):
+                meta = trace.meta
+                if isinstance(meta, str):
+                    index.setdefault(meta, []).append(position)
+            self._trace_index = index
+            self._indexed_traces = traces
+        return self._trace_index
+
+    def traces_with_meta(self, meta):
+        """
+        Return the traces in the figure whose `meta` entry is the given ID.
+        """
+        positions = self._meta_trace_index().get(meta, [])
+        traces = self._indexed_traces
+        return [traces[position] for position in positions]
+
+    def _remove_traces(self, traces):
+        remove_ids = {id(trace) for trace in traces}
+        current = self.figure.data
+        remaining = [trace for trace in current if id(trace) not in remove_ids]
+        if len(remaining) != len(current):
+            self.figure.data = remaining
+
+    def _order_traces(self, traces):
+        """
+        Move the given traces to the front of the figure, in the given order,
+        keeping the relative order of all other traces. The figure data is only
+        reassigned (once) if the order actually changes.
+        """
+        current = self.figure.data
+        current_ids = {id(trace) for trace in current}
+        front = [trace for trace in traces if id(trace) in current_ids]
+        front_ids = {id(trace) for trace in front}
+        ordered = front + [trace for trace in current if id(trace) not in front_ids]
+        if any(new is not old for new, old in zip(ordered, current)):
+            self.figure.data = ordered
+
+    def _update_zorder(self):
+        traces = [self.selection_layer]
+        for layer in self.layers:
+            traces += list(layer.traces())
+        self._order_traces(traces)
+
+    @property
+    def scatter_hover(self):
+        return self._scatter_hover
+
+    @scatter_hover.setter
+    def scatter_hover(self, show: bool):
+        self._scatter_hover = show
+        with self.figure.batch_update():
+            for layer in self.layers:
+                if isinstance(layer, DotplotScatterLayerArtist):
+                    layer._update_hover()
 
     def add_data(self, data: Data, layer_type: Literal["dotplot"] | Literal["scatter"] = "dotplot"):
          
         if layer_type == "scatter":
-            self._scatter_layers.add(data.uuid)
+            self._scatter_layers.add(data)
 
         return super().add_data(data)
 
+    def remove_data(self, data: Data):
+        self._scatter_layers.discard(data)
+        return super().remove_data(data)
+
+    def cleanup(self):
+        self._scatter_layers.clear()
+        self._indexed_traces = None
+        self._trace_index = {}
+        layer_states = list(self.state.layers)
+        super().cleanup()
+        release_viewer(self, layer_states)
+
     # def add_subset(self, data: Data, layer_type: Literal["dotplot"] | Literal["scatter"] = "dotplot"):
     #     if layer_type == "scatter":
-    #         self._scatter_layers.add(data.uuid)
+    #         self._scatter_layers.add(data)
     #     super().add_subset(data)
 
     def get_data_layer_artist(self, layer=None, layer_state=None):
-        if layer is not None and layer.uuid in self._scatter_layers:
+        if layer is not None and layer in self._scatter_layers:
             return DotplotScatterLayerArtist(self, self.state, layer_state=layer_state, layer=layer)
         return super().get_data_layer_artist(layer, layer_state)
 
     # For now, subsets have the same layer type as their parent
     def get_subset_layer_artist(self, layer=None, layer_state=None):
-        if layer is not None and layer.data.uuid in self._scatter_layers:
+        if layer is not None and layer.data in self._scatter_layers:
             return DotplotScatterLayerArtist(self, self.state, layer_state=layer_state, layer=layer)
         return super().get_subset_layer_artist(layer, layer_state)
@@ -0,0 +1,51 @@
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable
+
+from glue.viewers.common.viewer import Viewer
+
+__all__ = ["LazyViewers"]
+
+
+ViewerFactory = Callable[[], Dict[str, Viewer]]
+
+
+class LazyViewers(Mapping):
+    """
+    A mapping from names to glue viewers where each viewer is only created
+    the first time that it's accessed.
+
+    Factories are registered for one or more names, and return a dictionary
+    of the viewers that they create. This allows viewers that need to be
+    set up together (e.g. viewers whose limits are linked) to share a factory.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, ViewerFactory] = {}
+        self._viewers: Dict[str, Viewer] = {}
+
+    def register(self, names: Iterable[str], factory: ViewerFactory):
+        for name in names:
+            self._factories[name] = factory
+
+    def __getitem__(self, name: str) -> Viewer:
+        if name not in self._viewers:
+            factory = self._factories[name]
+            self._viewers.update(factory())
+        return self._viewers[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._factories
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def is_created(self, name: str) -> bool:
+        return name in self._viewers
+
+    @property
+    def created(self) -> Dict[str, Viewer]:
+        """The viewers that have been created so far."""
+        return dict(self._viewers)
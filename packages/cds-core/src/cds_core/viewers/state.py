@@ -1,6 +1,6 @@
 from math import ceil, floor
 
-from echo import add_callback, callback_property, delay_callback, CallbackProperty
+from echo import callback_property, delay_callback, CallbackProperty
 from glue.core import Subset
 from glue.viewers.histogram.state import HistogramViewerState
 from glue.viewers.scatter.state import ScatterViewerState
@@ -15,6 +15,7 @@ def cds_viewer_state(state_class):
     class CDSViewerState(state_class):
 
         TICK_SPACINGS = [10, 7.5, 5, 4, 3, 2.5, 2, 1]
+        LIMIT_PROPERTIES = ("x_min", "x_max", "y_min", "y_max")
 
         xtick_values = CallbackProperty([])
         ytick_values = CallbackProperty([])
@@ -69,22 +70,33 @@ def cds_viewer_state(state_class):
             super().__init__(*args, **kwargs)
             self._nxticks = 7
             self._nyticks = 7
-            add_callback(self, "x_min", self._update_xmin)
-            add_callback(self, "x_max", self._update_xmax)
-            add_callback(self, "y_min", self._update_ymin)
-            add_callback(self, "y_max", self._update_ymax)
 
-        def _update_xmin(self, value):
-            self.update_xticks(xmin=value)
-
-        def _update_xmax(self, value):
-            self.update_xticks(xmax=value)
-
-        def _update_ymin(self, value):
-            self.update_yticks(ymin=value)
-
-        def _update_ymax(self, value):
-            self.update_yticks(ymax=value)
+        def update_ticks(self, x=True, y=True):
+            """
+            Recompute the tick values for the current limits, as a single change.
+            The viewer calls this from its limits callback, so that the new ticks
+            reach the figure in the same update as the new axis ranges.
+            """
+            with delay_callback(self, "xtick_values", "ytick_values"):
+                if x:
+                    self.update_xticks()
+                if y:
+                    self.update_yticks()
+
+        def update_bounds(self, x_min=None, x_max=None, y_min=None, y_max=None):
+            """
+            Update any of the axis limits as a single change, so that listeners
+            (ticks, bins, the figure layout) are only updated once.
+            """
+            bounds = dict(x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+            with delay_callback(self, *self.LIMIT_PROPERTIES):
+                for name, value in bounds.items():
+                    if value is not None:
+                        setattr(self, name, value)
+
+        def reset_limits(self, *args, **kwargs):
+            with delay_callback(self, *self.LIMIT_PROPERTIES):
+                super().reset_limits(*args, **kwargs)
 
         def update_xticks(self, xmin=None, xmax=None):
             xmin = xmin or self.x_min
@@ -2,10 +2,14 @@ from uuid import uuid4
 
 from echo import add_callback
 from glue.config import viewer_tool
+from glue.utils import avoid_circular
 from glue_plotly.viewers import PlotlyBaseView
 
+from ..sessions import track_viewer
+from ..utils import release_viewer
 from ..widgets.toolbar import Toolbar
 
+from .dotplot import PlotlyDotPlotView
 from .state import cds_viewer_state
 
 
@@ -26,13 +30,28 @@ def cds_viewer(viewer_class, name, viewer_tools=[], label=None, state_cls=None):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.ignore_conditions = []
-            add_callback(self.state, "xtick_values", self._update_xtick_values)
-            add_callback(self.state, "ytick_values", self._update_ytick_values)
+            track_viewer(self)
 
             if issubclass(viewer_class, PlotlyBaseView):
+                # Replace the per-property limit callbacks with a single global one, so
+                # that a change to several limits updates the axis ranges and ticks together
+                for name in ("x_min", "x_max"):
+                    self.state.remove_callback(name, self._update_plotly_x_limits)
+                for name in ("y_min", "y_max"):
+                    self.state.remove_callback(name, self._update_plotly_y_limits)
+                self.state.add_global_callback(self._update_plotly_limits)
+                self.state.update_ticks()
+
                 add_callback(self.state, "subtitle", self._update_plotly_subtitle)
                 self._create_plotly_subtitle(self.state.subtitle)
 
+        def cleanup(self):
+            layer_states = list(self.state.layers)
+            super().cleanup()
+            # Dot plot viewers release themselves
+            if isinstance(self, PlotlyBaseView) and not isinstance(self, PlotlyDotPlotView):
+                release_viewer(self, layer_states)
+
         def _create_plotly_subtitle(self, text=None):
             self.figure.add_annotation(text=text,
                                        xref="paper", yref="paper",
@@ -76,12 +95,36 @@ def cds_viewer(viewer_class, name, viewer_tools=[], label=None, state_cls=None):
         def layer_artist_for_data(self, data):
             return next((a for a in self.layers if a.layer == data), None)
 
+        def _update_plotly_limits(self, **kwargs):
+            update_x = "x_min" in kwargs or "x_max" in kwargs
+            update_y = "y_min" in kwargs or "y_max" in kwargs
+            update_xticks = "xtick_values" in kwargs
+            update_yticks = "ytick_values" in kwargs
+            if not (update_x or update_y or update_xticks or update_yticks):
+                return
+            with self.figure.batch_update():
+                if update_x or update_y:
+                    self._update_plotly_ranges(update_x, update_y)
+                    # Any changes to the tick values come back through this callback,
+                    # while the figure is still batching
+                    self.state.update_ticks(x=update_x, y=update_y)
+                if update_xticks:
+                    self._update_xtick_values(kwargs["xtick_values"])
+                if update_yticks:
+                    self._update_ytick_values(kwargs["ytick_values"])
+
+        @avoid_circular
+        def _update_plotly_ranges(self, update_x, update_y):
+            state = self.state
+            if update_x and state.x_min is not None and state.x_max is not None:
+                self.axis_x["range"] = self._x_axis_range_from_state()
+            if update_y and state.y_min is not None and state.y_max is not None:
+                self.axis_y["range"] = self._y_axis_range_from_state()
+
         def _update_xtick_values(self, values):
-            self.axis_x.tickmode = "array"
-            self.axis_x.tickvals = values
-        
+            self.axis_x.update(tickmode="array", tickvals=values)
+
         def _update_ytick_values(self, values):
-            self.axis_x.tickmode = "array"
-            self.axis_y.tickvals = values
+            self.axis_y.update(tickmode="array", tickvals=values)
 
     return CDSViewer
@@ -1,5 +1,4 @@
 from glue.core import SubsetGroup
-import numpy as np
 from glue.core.message import (
     DataCollectionDeleteMessage,
     DataUpdateMessage,
@@ -7,7 +6,8 @@ from glue.core.message import (
     SubsetUpdateMessage,
 )
 from glue.core import HubListener
-from glue.core.subset import SubsetState
+import numpy as np
+from glue.core.subset import CategorySubsetState, SubsetState
 from ipyvuetify import VuetifyTemplate
 from traitlets import Bool, Dict, List, Unicode, observe
 
@@ -104,6 +104,10 @@ class Table(VuetifyTemplate, HubListener):
 
         self._row_click_callback = None
 
+        # The glue data row for each key, and for each (filtered) table item
+        self._key_rows = {}
+        self._item_rows = []
+
         # Populate the table with the current data in the collection
         self._populate_table()
 
@@ -171,29 +175,50 @@ class Table(VuetifyTemplate, HubListener):
     @subset.setter
     def subset(self, subset):
         self._subset = subset
-        self._subset_label = subset.label
         self._is_subset_group = isinstance(self._subset, SubsetGroup)
-        self.selected = self._selection_from_state(self._subset.subset_state)
+        if subset is not None:
+            self._subset_label = subset.label
+            self.selected = self._selection_from_state(self._subset.subset_state)
+
+    def _rows_for_items(self, items):
+        rows = (self._key_rows.get(item[self.key_component], None) for item in items)
+        return sorted(row for row in rows if row is not None)
 
     def subset_state_from_selected(self, selected):
-        keys = [x[self.key_component] for x in selected]
-        if keys:
-            state = np.bitwise_or.reduce(
-                [self._glue_data.id[self.key_component] == x for x in keys]
-            )
-        else:
-            state = SubsetState()
-        return state
+        # The subset is defined by the keys of the selected rows, rather than their
+        # indices, so that it still holds if the rows are reordered, and applies to
+        # any data that the key component is linked to
+        keys = [item[self.key_component] for item in selected]
+        if not keys:
+            return SubsetState()
+        component = self._glue_data.get_component(self.key_component)
+        if component.categorical:
+            # Categorical subset states are given the codes of the categories
+            keys = np.flatnonzero(np.isin(component.categories, keys))
+        return CategorySubsetState(self._glue_data.id[self.key_component], keys)
 
     def _selection_from_state(self, state):
         mask = state.to_mask(self._glue_data)
-        return [item for index, item in enumerate(self.items) if mask[index]]
+        return [item for item, row in zip(self.items, self._item_rows) if mask[row]]
 
     def _transform(self, component):
         return self._transforms.get(component, _DEFAULT_TRANSFORM)
 
+    def _build_items(self):
+        df = self._glue_data.to_dataframe()[self._glue_components]
+        for component in self._glue_components:
+            transform = self._transforms.get(component, None)
+            if transform is not None:
+                df[component] = df[component].map(transform)
+        records = df.to_dict("records")
+
+        self._key_rows = {
+            record[self.key_component]: row for row, record in enumerate(records)
+        }
+        rows = [row for row, record in enumerate(records) if self.item_filter(record)]
+        return [records[row] for row in rows], rows
+
     def _populate_table(self):
-        df = self._glue_data.to_dataframe()
         self.headers = [
             {"text": name, "value": component}
             for name, component in zip(
@@ -201,16 +226,40 @@ class Table(VuetifyTemplate, HubListener):
             )
         ]
         self.headers[0]["align"] = "start"
-        self.items = [
-            item
-            for _, row in df.iterrows()
-            if self.item_filter(
-                item := {
-                    component: self._transform(component)(row[component])
-                    for component in self._glue_components
-                }
-            )
-        ]
+        self.items, self._item_rows = self._build_items()
+
+    def _update_items(self):
+        """
+        Update the table items after a data change. If the same rows are still
+        present, only the items that changed are sent to the front end.
+        """
+        items, rows = self._build_items()
+        old_items = self.items
+        same_rows = len(items) == len(old_items) and all(
+            old[self.key_component] == new[self.key_component]
+            for old, new in zip(old_items, items)
+        )
+        self._item_rows = rows
+        if not same_rows:
+            self.items = items
+        else:
+            patches = [
+                [index, item]
+                for index, (old, item) in enumerate(zip(old_items, items))
+                if old != item
+            ]
+            if patches:
+                # Modify the list in place so that the full list isn't synced again
+                for index, item in patches:
+                    old_items[index] = item
+                self.send({"method": "patch_items", "args": [patches]})
+
+        # The selection (and so the subset) is derived again from the keys of
+        # the selected items, which may have been changed, moved or removed
+        selected_keys = set(self.selected_keys)
+        selected = [item for item in self.items if item[self.key_component] in selected_keys]
+        if selected != self.selected:
+            self.selected = selected
 
     def _new_subset(self):
         state = self.subset_state_from_selected(self.selected)
@@ -227,7 +276,7 @@ class Table(VuetifyTemplate, HubListener):
         return subset
 
     def _on_data_updated(self, message=None):
-        self._populate_table()
+        self._update_items()
 
     def filter_by(self, item_filter):
         self.item_filter = item_filter or (lambda item: True)
@@ -242,9 +291,12 @@ class Table(VuetifyTemplate, HubListener):
             self.selected = self._selection_from_state(self._subset.subset_state)
 
     def _on_data_deleted(self):
-        self.data_collection.remove_subset_group(self._subset)
+        if self._is_subset_group:
+            self.data_collection.remove_subset_group(self._subset)
         self.subset = None
-        self.items = {}
+        self.items = []
+        self._key_rows = {}
+        self._item_rows = []
 
     def _on_data_collection_delete(self, message=None):
         self._on_data_deleted()
@@ -270,9 +322,7 @@ class Table(VuetifyTemplate, HubListener):
             self.subset = self._new_subset()
 
     def indices_from_items(self, items):
-        state = self.subset_state_from_selected(items)
-        mask = state.to_mask(self.glue_data)
-        return [index for index in range(len(mask)) if mask[index]]
+        return self._rows_for_items(items)
 
     @property
     def indices(self):
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture
+def glue_app():
+    """
+    A glue application. glue's applications have no way to close them, so once
+    the test is done its viewers are cleaned up and its data is removed, so that
+    nothing that the test created stays registered with the hub or widgets.
+    """
+    from glue_jupyter import jglue
+
+    app = jglue()
+    yield app
+    for viewer in app.viewers:
+        viewer.cleanup()
+    for subset_group in list(app.data_collection.subset_groups):
+        app.data_collection.remove_subset_group(subset_group)
+    app.data_collection.clear()
@@ -0,0 +1,151 @@
+"""
+Benchmarks of updating the layers of a dot plot viewer that has many of them
+(e.g. a subset for each student in a class). Both benchmarks take about 1.5s
+on a single core (down from about 4s when every layer looked for changes to its
+properties on each update, and resent each of its visual attributes), of which
+around a third of the style updates is glue_jupyter syncing the viewer state.
+The limit can be adjusted for slower machines with CDS_LAYER_UPDATE_LIMIT (in seconds).
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from cds_core.viewers.dotplot import PlotlyDotPlotView
+from cds_core.viewers.dotplot.dotplot_layer_artist import DotplotLayerArtist
+
+LAYER_UPDATE_LIMIT = float(os.getenv("CDS_LAYER_UPDATE_LIMIT", "2.0"))
+
+N_SUBSETS = 24
+COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
+
+
+@pytest.fixture
+def viewer(glue_app):
+    from glue.core import Data
+
+    app = glue_app
+    rng = np.random.default_rng(42)
+    data = Data(label="measurements", velocity=rng.normal(20000, 5000, 2000))
+    app.data_collection.append(data)
+    viewer = app.new_data_viewer(PlotlyDotPlotView, data=data, show=False)
+    for index in range(N_SUBSETS):
+        app.data_collection.new_subset_group(f"student {index}", data.id["velocity"] > 1000 * index)
+    return viewer
+
+
+@pytest.fixture
+def select_traces_calls(viewer, monkeypatch):
+    calls = []
+    figure_cls = type(viewer.figure)
+    select_traces = figure_cls.select_traces
+
+    def counting_select_traces(self, *args, **kwargs):
+        calls.append(args)
+        return select_traces(self, *args, **kwargs)
+
+    monkeypatch.setattr(figure_cls, "select_traces", counting_select_traces)
+    return calls
+
+
+def test_layer_artists(viewer):
+    assert len(viewer.layers) == N_SUBSETS + 1
+    assert all(isinstance(layer, DotplotLayerArtist) for layer in viewer.layers)
+    # Each layer has a single dots trace, plus the selection layer
+    assert len(viewer.figure.data) == N_SUBSETS + 2
+
+
+def test_style_updates(viewer, select_traces_calls):
+    start = time.perf_counter()
+    for round in range(5):
+        for index, layer in enumerate(viewer.layers):
+            layer.state.color = COLORS[(index + round) % len(COLORS)]
+            layer.state.alpha = 0.5 + 0.1 * (round % 5)
+    elapsed = time.perf_counter() - start
+
+    assert select_traces_calls == []
+    assert elapsed < LAYER_UPDATE_LIMIT, f"Updating the layer styles took {elapsed:.2f}s"
+
+
+def test_data_updates(viewer, select_traces_calls):
+    start = time.perf_counter()
+    for n_bin in range(20, 40, 2):
+        viewer.state.hist_n_bin = n_bin
+    elapsed = time.perf_counter() - start
+
+    assert select_traces_calls == []
+    assert elapsed < LAYER_UPDATE_LIMIT, f"Updating the layer data took {elapsed:.2f}s"
+
+
+def test_layer_change_only_updates_that_layer(viewer, monkeypatch):
+    updated = []
+    pop_changed_properties = DotplotLayerArtist.pop_changed_properties
+
+    def counting_pop_changed_properties(self):
+        updated.append(self)
+        return pop_changed_properties(self)
+
+    monkeypatch.setattr(DotplotLayerArtist, "pop_changed_properties", counting_pop_changed_properties)
+    layer = viewer.layers[3]
+    layer.state.alpha = 0.3
+
+    assert updated == [layer]
+
+
+def test_unchanged_visual_attributes_arent_resent(viewer, monkeypatch):
+    layer = viewer.layers[0]
+    layer.state.alpha = 0.4
+    updates = []
+    dots_cls = type(viewer.traces_with_meta(layer._dots_id)[0])
+    update = dots_cls.update
+
+    def recording_update(self, *args, **kwargs):
+        updates.append(args)
+        return update(self, *args, **kwargs)
+
+    monkeypatch.setattr(dots_cls, "update", recording_update)
+    layer._update_visual_attributes(set(), force=True)
+    layer.state.alpha = 0.6
+
+    assert updates == [({"marker.opacity": 0.6, "unselected.marker.opacity": 0.6},)]
+
+
+def test_zorder_updates_reassign_once(viewer):
+    assignments = []
+    figure_cls = type(viewer.figure)
+    data_property = figure_cls.data
+
+    class CountingData:
+        def __get__(self, figure, owner=None):
+            return data_property.__get__(figure, owner)
+
+        def __set__(self, figure, value):
+            assignments.append(len(value))
+            data_property.__set__(figure, value)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(figure_cls, "data", CountingData())
+        viewer.layers[0].state.zorder = max(layer.zorder for layer in viewer.layers) + 1
+
+    assert len(assignments) <= 1
+    assert viewer.figure.data[0] is viewer.selection_layer
+
+
+def test_removing_layer_removes_dots(viewer):
+    layer = viewer.layers[-1]
+    dots_id = layer._dots_id
+    viewer.remove_subset(layer.layer)
+    assert viewer.traces_with_meta(dots_id) == []
+    assert len(viewer.figure.data) == N_SUBSETS + 1
+
+
+def test_dot_positions_match_glue_plotly(viewer):
+    from glue_plotly.common.dotplot import dot_positions
+
+    for layer in viewer.layers:
+        x, y = layer._dot_positions()
+        expected_x, expected_y = dot_positions(layer.state)
+        assert x.tolist() == expected_x
+        assert y.tolist() == expected_y
@@ -0,0 +1,94 @@
+"""
+Tests that dot plot viewers and their layer artists are freed once a viewer is
+closed, so that layers don't accumulate in a worker as sessions come and go.
+"""
+
+import gc
+import os
+import tracemalloc
+import weakref
+
+import numpy as np
+import pytest
+
+from cds_core.viewers import CDSDotPlotView
+from cds_core.viewers.dotplot import PlotlyDotPlotView
+
+N_VIEWERS = 20
+
+# The number of bytes that opening and closing several viewers can leave allocated,
+# as the registries of widgets and comms keep the size that they grew to. A leaked
+# viewer keeps around 200 KiB. This can be adjusted with CDS_VIEWER_LEAK_LIMIT
+VIEWER_LEAK_LIMIT = int(os.getenv("CDS_VIEWER_LEAK_LIMIT", str(256 * 1024)))
+
+
+@pytest.fixture(autouse=True)
+def weak_orphan_comms(monkeypatch):
+    # Outside of a kernel, solara gives each widget a dummy comm and keeps every
+    # one of them (which keeps their widgets alive) for debugging. In a server
+    # the widgets have real comms, which are dropped when they're closed
+    import solara.comm
+
+    monkeypatch.setattr(solara.comm, "orphan_comm_stacks", weakref.WeakKeyDictionary())
+
+
+@pytest.fixture
+def app(glue_app):
+    from glue.core import Data
+
+    app = glue_app
+    rng = np.random.default_rng(3)
+    app.data_collection.append(Data(label="class", velocity=rng.normal(20000, 5000, 500)))
+    app.data_collection.append(Data(label="student", velocity=rng.normal(20000, 5000, 5)))
+    # glue caches the masks of subset states for good, so the subset is only made once
+    class_data = app.data_collection[0]
+    app.data_collection.new_subset_group("fast", class_data.id["velocity"] > 25000)
+    return app
+
+
+def _open_and_close(app, viewer_cls):
+    """Open a viewer with dot plot and scatter layers, close it, and return weak references to it and its artists."""
+    class_data, student_data = app.data_collection
+    viewer = app.new_data_viewer(viewer_cls, show=False)
+    viewer.add_data(class_data)
+    viewer.add_data(student_data, layer_type="scatter")
+
+    # The data, and the subset of each
+    assert len(viewer.layers) == 4
+    references = [weakref.ref(viewer)] + [weakref.ref(layer) for layer in viewer.layers]
+
+    viewer.cleanup()
+    del viewer
+    gc.collect()
+    return references
+
+
+@pytest.mark.parametrize("viewer_cls", [PlotlyDotPlotView, CDSDotPlotView])
+def test_closed_viewers_are_collected(app, viewer_cls):
+    for _ in range(N_VIEWERS):
+        references = _open_and_close(app, viewer_cls)
+        assert [reference for reference in references if reference() is not None] == []
+
+
+def test_memory_returns_to_baseline(app):
+    # The first viewer fills any caches
+    _open_and_close(app, PlotlyDotPlotView)
+
+    # A registry can also grow (once) while we're measuring, so the viewers are
+    # opened in two rounds. A leak shows up in both of them, but a registry that
+    # grows only shows up in one
+    growth = []
+    tracemalloc.start()
+    try:
+        for _ in range(2):
+            gc.collect()
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(N_VIEWERS // 2):
+                _open_and_close(app, PlotlyDotPlotView)
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            growth.append(current - baseline)
+    finally:
+        tracemalloc.stop()
+
+    assert min(growth) < VIEWER_LEAK_LIMIT, f"{N_VIEWERS // 2} viewers left {min(growth)} bytes allocated"
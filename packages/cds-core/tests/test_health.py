@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+from cds_core import health, urls
+
+
+def test_probe_uses_api_url():
+    probe = health.api_probe()
+    assert probe.url == urls.API_URL
+
+
+def test_health_routes_dont_import_glue():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, cds_core.health; print('glue' in sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,32 @@
+from cds_core.viewers import LazyViewers
+
+
+def test_viewers_are_created_on_access():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return {"first": object(), "second": object()}
+
+    viewers = LazyViewers()
+    viewers.register(("first", "second"), factory)
+
+    assert set(viewers) == {"first", "second"}
+    assert viewers.created == {}
+    assert calls == []
+
+    first = viewers["first"]
+    assert viewers["first"] is first
+    assert not viewers.is_created("third")
+    # Viewers that share a factory are created together
+    assert viewers.is_created("second")
+    viewers["second"]
+    assert calls == [1]
+
+
+def test_membership_does_not_create():
+    viewers = LazyViewers()
+    viewers.register(("layer",), lambda: {"layer": object()})
+    assert "layer" in viewers
+    assert len(viewers) == 1
+    assert viewers.created == {}
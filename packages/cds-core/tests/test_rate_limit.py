@@ -0,0 +1,209 @@
+"""
+Tests of debounce and throttle against a loop with a fake clock, so that the
+timing is exact and nothing waits on a real timer. The call times are all
+exact binary fractions, so that the clock arithmetic has no rounding.
+"""
+
+import heapq
+import itertools
+
+import pytest
+
+from cds_core.rate_limit import RateLimited, debounce, throttle
+
+
+class FakeHandle:
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeLoop:
+    """
+    The parts of an asyncio event loop that `RateLimited` uses, with a clock that
+    only moves when the test advances it.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._scheduled = []
+        self._order = itertools.count()
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback, *args):
+        handle = FakeHandle(when, callback, args)
+        heapq.heappush(self._scheduled, (when, next(self._order), handle))
+        return handle
+
+    def call_soon_threadsafe(self, callback, *args):
+        return self.call_at(self.now, callback, *args)
+
+    def run_until(self, when):
+        """Run the callbacks that are due up to `when`, then move the clock there."""
+        while self._scheduled and self._scheduled[0][0] <= when:
+            due, _, handle = heapq.heappop(self._scheduled)
+            self.now = max(self.now, due)
+            if not handle.cancelled:
+                handle.callback(*handle.args)
+        self.now = max(self.now, when)
+
+    def advance(self, seconds):
+        self.run_until(self.now + seconds)
+
+
+class Recorder:
+    def __init__(self, loop):
+        self.loop = loop
+        self.calls = []
+
+    def __call__(self, value):
+        self.calls.append((self.loop.time(), value))
+
+    @property
+    def values(self):
+        return [value for _, value in self.calls]
+
+    @property
+    def times(self):
+        return [time for time, _ in self.calls]
+
+
+@pytest.fixture
+def loop():
+    return FakeLoop()
+
+
+@pytest.fixture
+def recorder(loop):
+    return Recorder(loop)
+
+
+def _call_at(loop, function, times):
+    """Call `function` with each time in `times` as its argument, at that time."""
+    for when in times:
+        loop.run_until(when)
+        function(when)
+
+
+def test_trailing_debounce(loop, recorder):
+    debounced = debounce(1, loop=loop)(recorder)
+    _call_at(loop, debounced, [0, 0.5, 0.75])
+    loop.advance(5)
+    assert recorder.calls == [(1.75, 0.75)]
+
+
+def test_trailing_debounce_separate_bursts(loop, recorder):
+    debounced = debounce(1, loop=loop)(recorder)
+    _call_at(loop, debounced, [0, 0.5, 3, 3.25])
+    loop.advance(5)
+    assert recorder.calls == [(1.5, 0.5), (4.25, 3.25)]
+
+
+def test_leading_debounce(loop, recorder):
+    debounced = debounce(1, leading=True, trailing=False, loop=loop)(recorder)
+    _call_at(loop, debounced, [0, 0.5, 0.75])
+    loop.advance(1.5)
+    assert recorder.calls == [(0, 0)]
+
+    # Once the calls stop for the wait, the next call is a new leading edge
+    _call_at(loop, debounced, [3, 3.5])
+    loop.advance(5)
+    assert recorder.calls == [(0, 0), (3, 3)]
+
+
+def test_leading_and_trailing_debounce(loop, recorder):
+    debounced = debounce(1, leading=True, trailing=True, loop=loop)(recorder)
+    _call_at(loop, debounced, [0, 0.5])
+    loop.advance(5)
+    assert recorder.calls == [(0, 0), (1.5, 0.5)]
+
+
+def test_single_call_is_invoked_once(loop, recorder):
+    debounced = debounce(1, leading=True, trailing=True, loop=loop)(recorder)
+    _call_at(loop, debounced, [0])
+    loop.advance(5)
+    assert recorder.calls == [(0, 0)]
+
+
+def test_max_wait(loop, recorder):
+    # Calls every 0.5s would put off a plain debounce forever
+    debounced = debounce(1, max_wait=2, loop=loop)(recorder)
+    times = [0.5 * index for index in range(10)]
+    _call_at(loop, debounced, times)
+    loop.advance(5)
+
+    assert recorder.times[0] == 2
+    assert all(later - earlier <= 2 for earlier, later in zip(recorder.times, recorder.times[1:]))
+    # The final call is always delivered, a wait after it
+    assert recorder.calls[-1] == (5.5, 4.5)
+
+
+def test_throttle(loop, recorder):
+    throttled = throttle(1, loop=loop)(recorder)
+    times = [0.25 * index for index in range(9)]
+    _call_at(loop, throttled, times)
+    loop.advance(5)
+
+    assert recorder.calls[0] == (0, 0)
+    assert all(later - earlier >= 1 for earlier, later in zip(recorder.times, recorder.times[1:]))
+    assert recorder.values[-1] == 2
+
+
+def test_throttle_without_trailing(loop, recorder):
+    throttled = throttle(1, trailing=False, loop=loop)(recorder)
+    _call_at(loop, throttled, [0, 0.5, 0.75])
+    loop.advance(5)
+    assert recorder.calls == [(0, 0)]
+
+
+def test_cancel(loop, recorder):
+    debounced = debounce(1, loop=loop)(recorder)
+    _call_at(loop, debounced, [0, 0.5])
+    debounced.cancel()
+    loop.advance(5)
+    assert recorder.calls == []
+    assert not debounced.pending
+
+
+def test_flush(loop, recorder):
+    debounced = debounce(1, loop=loop)(recorder)
+    _call_at(loop, debounced, [0, 0.5])
+    debounced.flush()
+    loop.advance(0)
+    assert recorder.calls == [(0.5, 0.5)]
+    loop.advance(5)
+    assert recorder.calls == [(0.5, 0.5)]
+
+
+def test_errors_are_logged(loop):
+    def fail(value):
+        raise ValueError(value)
+
+    debounced = RateLimited(fail, 1, loop=loop)
+    _call_at(loop, debounced, [0])
+    loop.advance(5)
+    assert not debounced.pending
+
+
+def test_methods_are_rate_limited_per_instance(loop):
+    class Counter:
+        def __init__(self):
+            self.values = []
+
+        @debounce(1, loop=loop)
+        def record(self, value):
+            self.values.append(value)
+
+    first, second = Counter(), Counter()
+    first.record(1)
+    second.record(2)
+    loop.advance(5)
+    assert first.values == [1]
+    assert second.values == [2]
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import solara
+from glue.core import Data, DataCollection
+
+from cds_core import sessions
+
+
+@pytest.fixture
+def kernel_contexts(monkeypatch):
+    from solara.server import kernel, kernel_context
+
+    # Reactive variables only have a value for each kernel context in a solara server
+    monkeypatch.setattr(solara.toestand, "_using_solara_server", lambda: True)
+    contexts = [
+        kernel_context.VirtualKernelContext(id=f"session-{index}", kernel=kernel.Kernel(), session_id=f"session-{index}")
+        for index in range(2)
+    ]
+    yield contexts
+    for context in contexts:
+        sessions._forget(context.id)
+
+
+def test_memory_report_measures_each_sessions_own_data(kernel_contexts):
+    # Like an app state, each session has its own glue data collection
+    app_state = solara.reactive(None)
+    for size, context in zip((1000, 50000), kernel_contexts):
+        with context:
+            data = Data(label="measurements", velocity=np.zeros(size))
+            app_state.set(SimpleNamespace(glue_data_collection=DataCollection([data])))
+            sessions._register(context, app_state)
+
+    report = {entry["session"]: entry for entry in sessions.session_memory_report()}
+
+    assert report["session-0"]["glue_data"] < report["session-1"]["glue_data"]
+    assert report["session-0"]["glue_data"] >= 1000 * 8
+    assert report["session-1"]["glue_data"] >= 50000 * 8
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from cds_core.widgets.table import Table
+
+
+@pytest.fixture
+def data_and_session(glue_app):
+    from glue.core import Data
+
+    app = glue_app
+    data = Data(label="measurements", id=np.arange(5), velocity=np.arange(5) * 1000.0)
+    app.data_collection.append(data)
+    return data, app.session
+
+
+@pytest.fixture
+def table(data_and_session):
+    data, session = data_and_session
+    return Table(session, data, glue_components=["id", "velocity"], key_component="id")
+
+
+def test_changed_rows_are_patched(data_and_session, table):
+    data, _ = data_and_session
+    messages = []
+    item_changes = []
+    table.send = messages.append
+    table.observe(item_changes.append, names="items")
+
+    velocity = data["velocity"].copy()
+    velocity[2] = 12345.0
+    data.update_components({data.id["velocity"]: velocity})
+
+    assert messages == [{"method": "patch_items", "args": [[[2, {"id": 2, "velocity": 12345.0}]]]}]
+    # The synced list isn't reassigned, so it isn't sent again
+    assert item_changes == []
+    assert table.items[2]["velocity"] == 12345.0
+
+
+def test_new_rows_replace_items(data_and_session, table):
+    data, _ = data_and_session
+    messages = []
+    table.send = messages.append
+
+    table.filter_by(lambda item: item["id"] % 2 == 0)
+
+    assert messages == []
+    assert [item["id"] for item in table.items] == [0, 2, 4]
+
+
+def test_selection_follows_keys_when_rows_are_reordered(data_and_session, table):
+    data, _ = data_and_session
+    table.selected = [item for item in table.items if item["id"] in (1, 3)]
+    subset = table.subset.subsets[0]
+    assert subset.to_mask().tolist() == [False, True, False, True, False]
+
+    order = np.array([2, 0, 4, 1, 3])
+    data.update_components({
+        data.id["id"]: data["id"][order],
+        data.id["velocity"]: data["velocity"][order],
+    })
+
+    assert [item["id"] for item in table.items] == [2, 0, 4, 1, 3]
+    assert sorted(table.selected_keys) == [1, 3]
+    assert subset.to_mask().tolist() == [False, False, False, True, True]
+    assert table.indices == [3, 4]
+
+
+def test_selection_applies_to_linked_data(glue_app, data_and_session, table):
+    from glue.core import Data
+    from glue.core.link_helpers import LinkSame
+
+    data, _ = data_and_session
+    other = Data(label="other measurements", id=np.array([3, 1, 1, 7]))
+    glue_app.data_collection.append(other)
+    glue_app.data_collection.add_link(LinkSame(data.id["id"], other.id["id"]))
+
+    table.selected = [item for item in table.items if item["id"] in (1, 3)]
+
+    other_subset = next(subset for subset in table.subset.subsets if subset.data is other)
+    assert other_subset.to_mask().tolist() == [True, True, True, False]
+
+
+def test_deleting_data_clears_table(data_and_session, table):
+    data, session = data_and_session
+    table.selected = [table.items[0]]
+
+    session.data_collection.remove(data)
+
+    assert table.subset is None
+    assert table.items == []
+    assert len(session.data_collection.subset_groups) == 0
@@ -0,0 +1,69 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from cds_core import ticker as ticker_module
+from cds_core.ticker import Ticker
+
+
+def test_attach_moves_callbacks_to_loop():
+    ticker = Ticker()
+    threads = []
+    # Registered before there's a loop (e.g. at import), so this starts a background loop
+    ticker.call_every(0.01, lambda: threads.append(threading.current_thread()), in_context=False)
+    background_loop = ticker.loop
+    time.sleep(0.05)
+    assert threads
+
+    async def main():
+        ticker.attach(asyncio.get_running_loop())
+        threads.clear()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+
+    assert threads
+    assert all(thread is threading.main_thread() for thread in threads)
+    time.sleep(0.05)
+    assert not background_loop.is_running()
+
+
+def test_reset_after_fork():
+    ticker = Ticker()
+    kept = ticker.call_every(60, lambda: None, in_context=False)
+    cancelled = ticker.call_every(60, lambda: None, in_context=False)
+    cancelled.cancel()
+    time.sleep(0.05)
+
+    ticker._reset_after_fork()
+
+    assert ticker._loop is None
+    assert ticker._handle is None
+    assert [entry for _, _, entry in ticker._heap] == [kept]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork")
+def test_forked_child_gets_its_own_loop():
+    ticker_module.ticker.call_every(60, lambda: None, in_context=False)
+    parent_loop = ticker_module.ticker.loop
+    # Let the loop add the callback
+    time.sleep(0.05)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            child_loop = ticker_module.ticker.loop
+            ok = ticker_module.ticker._loop is child_loop and child_loop is not parent_loop
+            os.write(write_fd, b"1" if ok and len(ticker_module.ticker) >= 1 else b"0")
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert result == b"1"
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from cds_core.viewers import CDSScatterView
+
+
+@pytest.fixture
+def viewer(glue_app):
+    from glue.core import Data
+
+    app = glue_app
+    rng = np.random.default_rng(7)
+    data = Data(label="galaxies", x=rng.uniform(0, 500, 100), y=rng.uniform(0, 30000, 100))
+    app.data_collection.append(data)
+    viewer = app.new_data_viewer(CDSScatterView, data=data, show=False)
+    return viewer
+
+
+@pytest.fixture
+def layout_messages(viewer, monkeypatch):
+    """The layout changes that the figure sends to the front end, one entry per message."""
+    messages = []
+    figure_cls = type(viewer.figure)
+
+    def send_relayout_msg(self, layout_data, source_view_id=None):
+        messages.append(dict(layout_data))
+
+    def send_update_msg(self, restyle_data, relayout_data, trace_indexes=None, source_view_id=None):
+        messages.append(dict(relayout_data))
+
+    monkeypatch.setattr(figure_cls, "_send_relayout_msg", send_relayout_msg)
+    monkeypatch.setattr(figure_cls, "_send_update_msg", send_update_msg)
+    return messages
+
+
+def test_update_bounds_is_one_figure_update(viewer, layout_messages):
+    viewer.state.update_bounds(x_min=0, x_max=700, y_min=0, y_max=50000)
+
+    assert len(layout_messages) == 1
+    message = layout_messages[0]
+    assert list(message["xaxis.range"]) == [0, 700]
+    assert list(message["yaxis.range"]) == [0, 50000]
+    assert "xaxis.tickvals" in message
+    assert "yaxis.tickvals" in message
+    assert list(viewer.figure.layout.xaxis.tickvals) == viewer.state.xtick_values
+
+
+def test_single_limit_is_one_figure_update(viewer, layout_messages):
+    viewer.state.x_max = 1000
+
+    assert len(layout_messages) == 1
+    assert list(layout_messages[0]["xaxis.range"]) == [viewer.state.x_min, 1000]
+    assert "xaxis.tickvals" in layout_messages[0]
+    assert not any(key.startswith("yaxis") for key in layout_messages[0])
+
+
+def test_reset_limits_is_one_figure_update(viewer, layout_messages):
+    viewer.state.update_bounds(x_min=-100, x_max=100, y_min=-100, y_max=100)
+    layout_messages.clear()
+
+    viewer.state.reset_limits()
+
+    assert len(layout_messages) == 1
+
+
+def test_figure_range_updates_ticks(viewer):
+    # A change to the range in the front end (e.g. zooming) goes to the state,
+    # and the ticks follow it, without the range being sent back
+    viewer.axis_x.range = (100, 200)
+    assert (viewer.state.x_min, viewer.state.x_max) == (100, 200)
+    assert all(100 <= value <= 200 for value in viewer.figure.layout.xaxis.tickvals)
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import cds_core
+
+
+@pytest.fixture
+def rglob_calls(monkeypatch):
+    calls = []
+    rglob = Path.rglob
+
+    def counting_rglob(self, pattern, *args, **kwargs):
+        calls.append((self, pattern))
+        return rglob(self, pattern, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "rglob", counting_rglob)
+    # Start from a process that hasn't read the components yet
+    monkeypatch.setattr(cds_core, "_custom_vue_components", None)
+    return calls
+
+
+def test_components_are_scanned_once(rglob_calls):
+    components = cds_core.custom_vue_components()
+    assert components
+    assert len(rglob_calls) == 1
+
+    for _ in range(5):
+        assert cds_core.custom_vue_components() == components
+    assert len(rglob_calls) == 1
+
+
+def test_components_are_copies(rglob_calls):
+    components = cds_core.custom_vue_components()
+    components.clear()
+    assert cds_core.custom_vue_components()
+
+
+def test_registering_for_each_session_doesnt_rescan(rglob_calls, monkeypatch):
+    registered = []
+    ipyvue = SimpleNamespace(register_component_from_string=lambda name, value: registered.append(name))
+    monkeypatch.setitem(sys.modules, "ipyvue", ipyvue)
+
+    for _ in range(3):
+        cds_core.load_custom_vue_components()
+
+    assert len(rglob_calls) == 1
+    names = list(cds_core.custom_vue_components())
+    assert registered == names * 3
@@ -1,5 +1,4 @@
-import importlib
-import pkgutil
+from pathlib import Path
 
 from solara.lab import Ref
 from solara.lab import Ref
@@ -13,10 +12,17 @@ logger = setup_logger("CDS-HUBBLE INITIALIZE")
 
 def import_all_stage_modules():
     """Import all stage states to trigger their registration."""
+    # The stages package imports each stage state before its routes
     import cds_hubble.stages
 
-    for _, module_name, _ in pkgutil.iter_modules(cds_hubble.stages.__path__):
-        importlib.import_module(f"cds_hubble.stages.{module_name}.stage_state")
+
+def preload_guidelines():
+    """Compile the guideline components for all stages ahead of time."""
+    from cds_core.components import preload_scaffold_alerts
+
+    stages_root = Path(__file__).parent / "stages"
+    count = preload_scaffold_alerts(sorted(stages_root.glob("*/guidelines/*.vue")))
+    logger.info(f"Preloaded {count} guideline components")
 
 
 import_all_stage_modules()
@@ -1,24 +1,41 @@
-from .data_table.data_table import DataTable
-from .spectrum_viewer.spectrum_viewer import SpectrumViewer
-from .spectrum_slideshow.spectrum_slideshow import SpectrumSlideshow
-from .doppler_slideshow.doppler_slideshow import DopplerSlideshow
-from .stage_2_slideshow.stage_2_slideshow import Stage2Slideshow, STAGE_2_SLIDESHOW_LENGTH
-from .reflect_velocity_slideshow.reflect_velocity_slideshow import (
-    ReflectVelocitySlideshow,
-)
-from .angsize_dosdonts_slideshow.angsize_dosdonts_slideshow import (
-    AngsizeDosDontsSlideshow,
-)
-from .hubble_exp_universe_slideshow.hubble_exp_universe_slideshow import (
-    HubbleExpUniverseSlideshow,
-)
-from .dotplot_viewer.dotplot_viewer import DotplotViewer
-from .uncertainty_slideshow.uncertainty_slideshow import UncertaintySlideshow
-from .dotplot_viewer.dotplot_viewer import DotplotViewer
-from .selection_tool import SelectionTool
-from .dotplot_tutorial_slideshow import DotplotTutorialSlideshow
-from .id_slider import IdSlider
-from .line_draw_viewer import LineDrawViewer
-from .plotly_layer_toggle import PlotlyLayerToggle
-from .intro_slideshow_vue.intro_slideshow import IntroSlideshowVue, INTRO_SLIDESHOW_LENGTH
-from .stage_4_waiting_screen import Stage4WaitingScreen
+from importlib import import_module
+
+# The components are only imported when they're first accessed, as some of them
+# are slow to import (e.g. because of glue, plotly or WWT), and importing one
+# component (or one of the constants below) shouldn't mean importing them all
+_COMPONENT_MODULES = {
+    "DataTable": ".data_table.data_table",
+    "SpectrumViewer": ".spectrum_viewer.spectrum_viewer",
+    "SpectrumSlideshow": ".spectrum_slideshow.spectrum_slideshow",
+    "DopplerSlideshow": ".doppler_slideshow.doppler_slideshow",
+    "Stage2Slideshow": ".stage_2_slideshow.stage_2_slideshow",
+    "STAGE_2_SLIDESHOW_LENGTH": ".stage_2_slideshow.stage_2_slideshow",
+    "ReflectVelocitySlideshow": ".reflect_velocity_slideshow.reflect_velocity_slideshow",
+    "AngsizeDosDontsSlideshow": ".angsize_dosdonts_slideshow.angsize_dosdonts_slideshow",
+    "HubbleExpUniverseSlideshow": ".hubble_exp_universe_slideshow.hubble_exp_universe_slideshow",
+    "DotplotViewer": ".dotplot_viewer.dotplot_viewer",
+    "UncertaintySlideshow": ".uncertainty_slideshow.uncertainty_slideshow",
+    "SelectionTool": ".selection_tool",
+    "DotplotTutorialSlideshow": ".dotplot_tutorial_slideshow",
+    "IdSlider": ".id_slider",
+    "LineDrawViewer": ".line_draw_viewer",
+    "PlotlyLayerToggle": ".plotly_layer_toggle",
+    "IntroSlideshowVue": ".intro_slideshow_vue.intro_slideshow",
+    "INTRO_SLIDESHOW_LENGTH": ".intro_slideshow_vue.intro_slideshow",
+    "Stage4WaitingScreen": ".stage_4_waiting_screen",
+}
+
+__all__ = list(_COMPONENT_MODULES)
+
+
+def __getattr__(name):
+    module_name = _COMPONENT_MODULES.get(name, None)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,4 @@
 from random import randint
-from cds_core.viewers.dotplot.viewer import DotplotScatterLayerArtist
 
 import solara
 from glue.core import Data, Subset
@@ -24,6 +23,7 @@ import numpy as np
 
 
 from cds_core.logger import setup_logger
+from cds_core.subscriptions import Subscriptions
 
 logger = setup_logger("DOTPLOT")
 
@@ -76,9 +76,6 @@ def set_viewer_x_range(viewer: HubbleDotPlotViewer, x_min: float, x_max: float):
             setattr(viewer.state, name, value)
 
 
-_original_update_data = DotplotScatterLayerArtist._update_data
-
-
 @solara.component
 def DotplotViewer(
     gjapp: JupyterApplication,
@@ -194,6 +191,7 @@ def DotplotViewer(
             dotplot_view: HubbleDotPlotViewer = gjapp.new_data_viewer(
                 HubbleDotPlotView, show=False
             )  # type: ignore
+            dotplot_view.scatter_hover = False
 
             _add_data(dotplot_view, viewer_data)
             if isinstance(viewer_data, tuple):
@@ -220,18 +218,6 @@ def DotplotViewer(
                 for trace in layer.traces():
                     trace.update(hoverinfo="skip", hovertemplate=None)
 
-            # this doesn't even get run;
-            def no_hover_update(self: DotplotScatterLayerArtist):
-                logger.info(f"{title}: no_hover_update")
-                hide_ignored_layers()
-                with dotplot_view.figure.batch_update():
-                    _original_update_data(self)
-                    for trace in self.traces():
-                        trace.update(hoverinfo="skip", hovertemplate=None)
-                    self._update_zorder()
-
-            DotplotScatterLayerArtist._update_data = no_hover_update
-
             def get_layer(layer_name):
                 layer_artist = dotplot_view.layer_artist_for_data(layer_name)  # type: ignore
                 if layer_artist is None:
@@ -423,13 +409,15 @@ def DotplotViewer(
 
             zoom_tool.on_zoom = on_zoom
 
-            reset_bounds.subscribe(lambda x: tool.activate())
+            subscriptions = Subscriptions()
+
+            subscriptions.subscribe(reset_bounds, lambda x: tool.activate())
 
             if line_marker_at.value is not None:
                 _update_lines(value=line_marker_at.value)
 
-            line_marker_at.subscribe(lambda new_val: _update_lines(value=new_val))
-            vertical_line_visible.subscribe(lambda new_val: _update_lines())
+            subscriptions.subscribe(line_marker_at, lambda new_val: _update_lines(value=new_val))
+            subscriptions.subscribe(vertical_line_visible, lambda new_val: _update_lines())
 
             def reset_hist_n_bin(xmin=None, xmax=None):
                 set_viewer_x_range(dotplot_view, xmin, xmax)
@@ -443,7 +431,7 @@ def DotplotViewer(
                 reset_hist_n_bin(new_val[0], new_val[1])
                 reset_selection()
 
-            x_bounds.subscribe(update_x_bounds)
+            subscriptions.subscribe(x_bounds, update_x_bounds)
 
             home_tool = dotplot_view.toolbar.tools["plotly:home"]
             home_tool.activate()
@@ -451,9 +439,11 @@ def DotplotViewer(
             reset_selection()
 
             hide_ignored_layers()
-            hide_layers.subscribe(hide_ignored_layers)
+            subscriptions.subscribe(hide_layers, hide_ignored_layers)
 
             def cleanup():
+                subscriptions.unsubscribe_all()
+
                 for cnt in (title_widget, toolbar_widget, viewer_widget):
                     cnt.children = ()
 
@@ -461,6 +451,8 @@ def DotplotViewer(
                     # wgt.layout.close()
                     wgt.close()
 
+                dotplot_view.cleanup()
+
             return cleanup
 
         solara.use_effect(_add_viewer, dependencies=[])
@@ -3,14 +3,15 @@ from typing import Callable, Optional
 import astropy.units as u
 import solara
 from astropy.coordinates import SkyCoord
-from astropy.table import Table
 from reacton import ipyvuetify as rv
 from solara import Reactive
 
+from ...helpers.galaxy_catalog import add_galaxy_layer, galaxy_catalog
 from ...remote import LOCAL_API
 from ...story_state import StoryState
 from ...utils import GALAXY_FOV
 from ...widgets.hubble_wwt import HubbleWWTWidget
+from ...widgets.wwt_host import WWTView, wwt_host
 
 SDSS = "SDSS9 color"
 DSS = "Digitized Sky Survey (Color)"
@@ -34,7 +35,6 @@ def SelectionTool(
 ):
     show_wwt = solara.use_reactive(False)
     selected = solara.use_reactive(candidate_galaxy)
-    current_layer = solara.use_reactive(None)
     reset_view = solara.use_reactive(False)
     refresh_images = solara.use_reactive(False)
     motions_left, set_motions_left = solara.use_state(2)
@@ -148,10 +148,18 @@ def SelectionTool(
 
     def _add_widget():
         """
-        Add the WWT widget to the container.
+        Borrow the session's WWT widget and add it to the container.
         """
-        wwt_widget = HubbleWWTWidget(use_remote=True)
-        wwt_widget.observe(lambda change: show_wwt.set(change["new"]), "_wwt_ready")
+        if show_galaxies:
+            view = WWTView(START_COORDINATES, 60 * u.deg)
+        else:
+            view = WWTView(INIT_COORDINATE, 1 * u.deg)
+        wwt_widget, release = wwt_host().borrow(
+            on_ready=lambda: show_wwt.set(True),
+            view=view,
+            foreground=SDSS,
+            background=SDSS,
+        )
 
         wwt_widget_container = solara.get_widget(wwt_container)
         wwt_widget_container.children = (wwt_widget,)
@@ -160,11 +168,12 @@ def SelectionTool(
             wwt_widget._on_background_change({"new": wwt_widget.background})
             wwt_widget._on_foreground_change({"new": wwt_widget.foreground})
 
-        background_counter.subscribe(_on_bg_counter)
+        unsubscribe = background_counter.subscribe(_on_bg_counter)
 
         def cleanup():
+            unsubscribe()
             wwt_widget_container.children = ()
-            wwt_widget.close()
+            release()
 
         return cleanup
 
@@ -181,10 +190,6 @@ def SelectionTool(
 
         wwt_widget = solara.get_widget(wwt_container).children[0]
 
-        # Update the displayed foreground and background
-        wwt_widget.foreground = SDSS
-        wwt_widget.background = SDSS
-
         # Center the field on the location of the table data
         if not show_galaxies:
             _go_to_location(
@@ -223,19 +228,13 @@ def SelectionTool(
         """
         Show or hide the galaxies on the WWT widget.
         """
-        wwt_widget = solara.get_widget(wwt_container).children[0]
+        def _add_galaxy_layer(wwt_widget):
+            catalog = galaxy_catalog(LOCAL_API.get_galaxies(local_state))
 
-        if current_layer.value is None:
-            table = Table(
-                {
-                    k: [x.dict()[k] for x in LOCAL_API.get_galaxies(local_state)]
-                    for k in ["id", "ra", "decl"]
-                }
-            )
-
-            layer = wwt_widget.layers.add_table_layer(
+            return add_galaxy_layer(
+                wwt_widget,
+                catalog,
                 frame="Sky",
-                table=table,
                 lon_att="ra",
                 lat_att="decl",
                 marker_type="gaussian",
@@ -244,9 +243,11 @@ def SelectionTool(
                 marker_scale="screen",
             )
 
-            current_layer.set(layer)
+        wwt_widget = solara.get_widget(wwt_container).children[0]
 
-        current_layer.value.opacity = int(show_galaxies)
+        # The layer is kept by the host, so it's only created once per view of the widget
+        layer = wwt_host().table_layer("galaxies", _add_galaxy_layer)
+        layer.opacity = int(show_galaxies)
 
         if show_galaxies:
             _go_to_location(
@@ -7,6 +7,56 @@ TODO: This needs to be removed. We only keep this here because plotly keeps
 import solara
 from typing import Callable, Any
 
+from ...utils import dict_diff
+
+
+# Trace properties that are managed by plotly itself, and that we never patch
+_UNPATCHED_TRACE_PROPERTIES = ("type", "uid")
+
+
+def _patch_layout(fig_widget, layout):
+    # Only send the layout properties that actually changed. Properties that
+    # are no longer present are reset so that e.g. the axis range goes back to
+    # being automatic.
+    old = fig_widget.layout.to_plotly_json()
+    new = layout.to_plotly_json()
+    for change, path, value in dict_diff(old, new):
+        if change == "removed":
+            fig_widget.layout[path] = None
+        elif change == "added":
+            fig_widget.layout[path] = value
+        else:
+            fig_widget.layout[path] = value[1]
+
+
+def _same_trace_types(fig_widget, traces):
+    return len(fig_widget.data) == len(traces) and all(
+        old.type == new.type for old, new in zip(fig_widget.data, traces)
+    )
+
+
+def _replace_traces(fig_widget, traces):
+    length = len(fig_widget.data)
+    fig_widget.add_traces(traces)
+    data = list(fig_widget.data)
+    fig_widget.data = data[length:]
+
+
+def _patch_traces(fig_widget, traces):
+    for old, new in zip(fig_widget.data, traces):
+        new_props = {
+            key: value
+            for key, value in new.to_plotly_json().items()
+            if key not in _UNPATCHED_TRACE_PROPERTIES
+        }
+        removed = {
+            key: None
+            for key in old.to_plotly_json()
+            if key not in new_props and key not in _UNPATCHED_TRACE_PROPERTIES
+        }
+        # Plotly only sends the properties whose values differ from the current ones
+        old.update(removed | new_props)
+
 
 @solara.component
 def FigurePlotly(
@@ -45,14 +95,17 @@ def FigurePlotly(
 
     def update_data():
         fig_widget: FigureWidget = solara.get_widget(fig_element)
-        fig_widget.layout = fig.layout
-
         fig_widget._config = fig._config | (config or {})
 
-        length = len(fig_widget.data)
-        fig_widget.add_traces(fig.data)
-        data = list(fig_widget.data)
-        fig_widget.data = data[length:]
+        # The widget persists between renders, so rather than replacing the
+        # whole figure we patch the widget with whatever changed.
+        # Traces are only replaced if the set of traces is different.
+        if not _same_trace_types(fig_widget, fig.data):
+            _replace_traces(fig_widget, fig.data)
+
+        with fig_widget.batch_update():
+            _patch_layout(fig_widget, fig.layout)
+            _patch_traces(fig_widget, fig.data)
 
     solara.use_effect(update_data, dependencies or fig)
     return fig_element
@@ -10,6 +10,8 @@ from ...story_state import GalaxyData
 from pandas import DataFrame
 from ...components.spectrum_viewer.plotly_figure import FigurePlotly
 from cds_core.logger import setup_logger
+from cds_core.subscriptions import use_subscribe
+from cds_core.utils import minmax_downsample
 from ...helpers.viewer_marker_colors import (
     GENERIC_COLOR,
     H_ALPHA_COLOR,
@@ -25,6 +27,11 @@ from glue_plotly.common import DEFAULT_FONT
 
 logger = setup_logger("SPECTRUM")
 
+# The approximate number of spectrum points to send to the browser for the
+# visible region. The plot is only a few hundred pixels wide, so this is
+# about two points per pixel.
+SPECTRUM_MAX_POINTS = 800
+
 
 @solara.component
 def SpectrumViewer(
@@ -54,8 +61,7 @@ def SpectrumViewer(
     x_bounds = solara.use_reactive([])
     y_bounds = solara.use_reactive([])
     # spectrum_bounds = solara.use_reactive(spectrum_bounds or [], on_change=lambda x: x_bounds.set(x))
-    if spectrum_bounds is not None:
-        spectrum_bounds.subscribe(x_bounds.set)
+    use_subscribe(spectrum_bounds, x_bounds.set)
 
     use_dark_effective = solara.use_trait_observe(solara.lab.theme, "dark_effective")
 
@@ -243,11 +249,19 @@ def SpectrumViewer(
             logger.info("galaxy_data is None")
             return
 
+        # Only send a coarse version of the spectrum outside of the visible range
+        wave = spec_data_task.value["wave"].to_numpy()
+        flux = spec_data_task.value["flux"].to_numpy()
+        indices = minmax_downsample(
+            wave, flux, SPECTRUM_MAX_POINTS, x_range=x_bounds.value or None
+        )
+        wave, flux = wave[indices], flux[indices]
+
         fig = go.Figure()
         fig.add_trace(
             go.Scatter(
-                x=spec_data_task.value["wave"],
-                y=spec_data_task.value["flux"],
+                x=wave,
+                y=flux,
                 line=dict(
                     color=spectrum_color,
                     width=2,
@@ -1,9 +1,11 @@
-from ipywwt import WWTWidget
 import reacton.ipyvuetify as rv
 import solara
 from typing import Callable
 
 from ...components.counter import Counter
+from ...widgets.wwt_host import wwt_host
+
+DSS = "Digitized Sky Survey (Color)"
 
 
 @solara.component
@@ -53,15 +55,19 @@ def Stage4WaitingScreen(
                                   disabled=not can_advance)
         
     def _add_widget():
-        wwt_widget = WWTWidget(use_remote=True)
-        wwt_widget.observe(lambda change: show_wwt.set(change["new"]), "_wwt_ready")
+        # Show the same sky as the exploration tool in the introduction
+        wwt_widget, release = wwt_host().borrow(
+            on_ready=lambda: show_wwt.set(True),
+            foreground=DSS,
+            background=DSS,
+        )
 
         wwt_widget_container = solara.get_widget(wwt_container)
         wwt_widget_container.children = (wwt_widget,)
 
         def cleanup():
             wwt_widget_container.children = ()
-            wwt_widget.close()
+            release()
 
         return cleanup
 
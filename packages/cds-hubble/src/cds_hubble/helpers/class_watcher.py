@@ -0,0 +1,137 @@
+import asyncio
+import itertools
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+
+from cds_core.logger import setup_logger
+from cds_core.ticker import _current_kernel_context, _running_loop, ticker
+
+from ..remote import LOCAL_API
+
+__all__ = [
+    "CHECK_INTERVAL",
+    "STUDENTS_READY_THRESHOLD",
+    "ClassCompletionWatcher",
+    "class_completion_watcher",
+]
+
+logger = setup_logger("CLASS WATCHER")
+
+CHECK_INTERVAL = 10  # seconds
+
+# The number of students who need to have completed their measurements
+# before the students in the stage 4 waiting room can move on
+STUDENTS_READY_THRESHOLD = 12
+
+Listener = Callable[[int], None]
+Unsubscribe = Callable[[], None]
+
+
+class ClassCompletionWatcher:
+    """
+    Keeps track of the number of students in a class who have completed their
+    measurements. There is one watcher per class in each worker, which checks
+    the count while at least one session is subscribed, and passes it on to
+    every subscribed session.
+
+    Checks run on the ticker's event loop, with the API request itself made in
+    the loop's default executor, so that the loop is never blocked by a check.
+    Listeners are called from within the kernel context that they subscribed in.
+    """
+
+    def __init__(self, story_id: str, class_id: int, student_id: int, interval: float = CHECK_INTERVAL):
+        self.story_id = story_id
+        self.class_id = class_id
+        self.student_id = student_id
+        self.interval = interval
+        self.count: Optional[int] = None
+        self._listeners: Dict[int, Tuple[Listener, object]] = {}
+        self._listeners_lock = Lock()
+        self._ids = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, listener: Listener) -> Unsubscribe:
+        """
+        Call `listener` with the count whenever it's checked, starting with the most
+        recent count (if there is one). Returns a function that unsubscribes.
+        """
+        listener_id = next(self._ids)
+        with self._listeners_lock:
+            self._listeners[listener_id] = (listener, _current_kernel_context())
+
+        if self.count is not None:
+            listener(self.count)
+
+        loop = ticker.loop
+        if _running_loop() is loop:
+            self._start()
+        else:
+            loop.call_soon_threadsafe(self._start)
+
+        def unsubscribe():
+            with self._listeners_lock:
+                self._listeners.pop(listener_id, None)
+
+        return unsubscribe
+
+    @property
+    def watching(self) -> bool:
+        return self._task is not None
+
+    def _start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            # Stop once the last session has unsubscribed. There's no await between
+            # this check and clearing the task, so `_start` can't miss the exit.
+            while self._listeners:
+                try:
+                    count = await loop.run_in_executor(None, self._check)
+                except Exception:
+                    logger.exception(f"Unable to check completed students for class {self.class_id}")
+                else:
+                    self._publish(count)
+                await asyncio.sleep(self.interval)
+        finally:
+            self._task = None
+
+    def _check(self) -> int:
+        logger.info(f"Checking how many students in class {self.class_id} have completed measurements")
+        count = LOCAL_API.students_completed_measurements_count(self.story_id, self.student_id, self.class_id)
+        logger.info(f"Count: {count}")
+        return count
+
+    def _publish(self, count: int):
+        self.count = count
+        with self._listeners_lock:
+            listeners = list(self._listeners.values())
+        for listener, context in listeners:
+            try:
+                if context is not None:
+                    with context:
+                        listener(count)
+                else:
+                    listener(count)
+            except Exception:
+                logger.exception("Error in class completion listener")
+
+
+_watchers: Dict[Tuple[str, int], ClassCompletionWatcher] = {}
+_watchers_lock = Lock()
+
+
+def class_completion_watcher(story_id: str, class_id: int, student_id: int) -> ClassCompletionWatcher:
+    """
+    The watcher for the given class. The student ID is only used to make the
+    API requests when the watcher is first created, as the count is the same
+    for every student in the class.
+    """
+    key = (story_id, class_id)
+    with _watchers_lock:
+        watcher = _watchers.get(key, None)
+        if watcher is None:
+            watcher = _watchers[key] = ClassCompletionWatcher(story_id, class_id, student_id)
+    return watcher
@@ -0,0 +1,70 @@
+from hashlib import sha1
+from threading import Lock
+from typing import Dict, List, NamedTuple
+
+from astropy.table import Table
+
+from ..story_state import GalaxyData
+
+__all__ = [
+    "GALAXY_LAYER_COLUMNS",
+    "GalaxyCatalog",
+    "add_galaxy_layer",
+    "catalog_version",
+    "galaxy_catalog",
+]
+
+# The galaxy properties that are included in the WWT table layer. These are
+# what the WWT selection callback receives as the `layerData` of a source.
+GALAXY_LAYER_COLUMNS = ("id", "ra", "decl")
+
+
+class GalaxyCatalog(NamedTuple):
+    version: str
+    # The table is shared by every session, and shouldn't be modified
+    table: Table
+
+
+_catalogs: Dict[str, GalaxyCatalog] = {}
+_catalogs_lock = Lock()
+
+
+def catalog_version(galaxies: List[GalaxyData]) -> str:
+    """A hash identifying the layer contents for a list of galaxies."""
+    digest = sha1()
+    for galaxy in galaxies:
+        digest.update(repr(tuple(getattr(galaxy, k) for k in GALAXY_LAYER_COLUMNS)).encode())
+    return digest.hexdigest()
+
+
+def _build_catalog(version: str, galaxies: List[GalaxyData]) -> GalaxyCatalog:
+    table = Table(
+        {k: [getattr(galaxy, k) for galaxy in galaxies] for k in GALAXY_LAYER_COLUMNS},
+        meta={"version": version},
+    )
+    return GalaxyCatalog(version, table)
+
+
+def galaxy_catalog(galaxies: List[GalaxyData]) -> GalaxyCatalog:
+    """
+    Get the galaxy catalog for a list of galaxies. The catalog is the same for
+    every student, so its table is only built once per catalog version and is
+    shared by all sessions. An empty list (e.g. from a failed request) isn't
+    cached, so that the next session tries again.
+    """
+    version = catalog_version(galaxies)
+    if not galaxies:
+        return _build_catalog(version, galaxies)
+
+    catalog = _catalogs.get(version, None)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(version, None)
+            if catalog is None:
+                catalog = _catalogs[version] = _build_catalog(version, galaxies)
+    return catalog
+
+
+def add_galaxy_layer(wwt_widget, catalog: GalaxyCatalog, **kwargs):
+    """Add a table layer for the catalog to a WWT widget."""
+    return wwt_widget.layers.add_table_layer(table=catalog.table, **kwargs)
@@ -1,7 +1,6 @@
 import time
 
 import solara
-from deepdiff import DeepDiff
 from solara import Reactive
 from solara.lab import Ref
 from solara_enterprise import auth
@@ -9,6 +8,7 @@ from solara_enterprise import auth
 from cds_core.app_state import AppState
 from cds_core.layout import BaseLayout, BaseSetup
 from cds_core.logger import setup_logger
+from .prewarm import use_prewarm_next_stage
 from .remote import LOCAL_API
 from .story_state import StoryState
 from .utils import push_to_route, extract_changed_subtree
@@ -146,6 +146,8 @@ def Layout(
 
     solara.use_effect(_store_user_location, dependencies=[route_current])
 
+    use_prewarm_next_stage(app_state, story_state, route_index)
+
     # TODO: This is a temporary fix to restore the user's location after loading
     #  their state from the database. For some reason, the router resets several
     #  times during this page's rendering, so we just time it out for now.
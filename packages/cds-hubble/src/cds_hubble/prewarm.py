@@ -0,0 +1,87 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import solara
+from solara import Reactive
+
+from cds_core.app_state import AppState
+from cds_core.prewarm import prewarmer
+from .remote import LOCAL_API
+from .story_state import StoryState
+
+__all__ = ["STAGE_ORDER", "STAGE_DATA_DEPENDENCIES", "use_prewarm_next_stage"]
+
+# The stages in story order, which matches the order of the routes
+STAGE_ORDER = [
+    "introduction",
+    "spectra_&_velocity",
+    "distance_introduction",
+    "distance_measurements",
+    "explore_data",
+    "class_results_and_uncertainty",
+    "professional_data",
+]
+
+Request = Tuple[tuple, Callable]
+RequestFactory = Callable[[Reactive[AppState], Reactive[StoryState]], Optional[Request]]
+
+
+def _has_class(app_state: Reactive[AppState]) -> bool:
+    class_info = app_state.value.classroom.class_info
+    return class_info is not None and "id" in class_info
+
+
+def _class_measurements(app_state, story_state) -> Optional[Request]:
+    if not _has_class(app_state):
+        return None
+    return LOCAL_API.class_measurements_request(app_state, story_state)
+
+
+def _all_data(app_state, story_state) -> Optional[Request]:
+    return LOCAL_API.all_data_request(app_state, story_state)
+
+
+DATA_REQUESTS: Dict[str, RequestFactory] = {
+    "class_measurements": _class_measurements,
+    "all_data": _all_data,
+}
+
+# The data that each stage loads from the API when it's mounted
+STAGE_DATA_DEPENDENCIES: Dict[str, List[str]] = {
+    "explore_data": ["class_measurements"],
+    "class_results_and_uncertainty": ["class_measurements", "all_data"],
+}
+
+
+def _at_last_marker(stage_state) -> bool:
+    # The last marker of each stage is a placeholder, so
+    # the last real step is the one before it
+    marker = stage_state.current_step
+    return marker.value >= len(type(marker)) - 1
+
+
+def use_prewarm_next_stage(
+    app_state: Reactive[AppState],
+    story_state: Reactive[StoryState],
+    stage_index: Optional[int],
+):
+    """
+    Once the student reaches the last marker of the current stage, start loading the
+    data that the next stage depends on in the background. The next stage picks up
+    the results through the API, when it loads that data as it's mounted.
+    """
+    next_stage = None
+    if stage_index is not None and stage_index + 1 < len(STAGE_ORDER):
+        stage_state = story_state.value.stage_states.get(STAGE_ORDER[stage_index], None)
+        if stage_state is not None and _at_last_marker(stage_state):
+            next_stage = STAGE_ORDER[stage_index + 1]
+
+    def _prewarm():
+        if next_stage is None:
+            return
+
+        for name in STAGE_DATA_DEPENDENCIES.get(next_stage, []):
+            request = DATA_REQUESTS[name](app_state, story_state)
+            if request is not None:
+                prewarmer().start(*request)
+
+    solara.use_effect(_prewarm, dependencies=[next_stage])
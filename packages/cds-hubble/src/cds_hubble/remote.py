@@ -1,17 +1,17 @@
 import json
 from contextlib import closing
 from csv import DictReader
-from functools import cache
+from functools import cache, partial
 from io import BytesIO
 from pathlib import Path
-from typing import List
+from typing import Callable, List
 
-from astropy.io import fits
 from solara import Reactive
 from solara.toestand import Ref
 
 from cds_core.base_states import BaseStageState, BaseStoryState
 from cds_core.logger import setup_logger
+from cds_core.prewarm import prewarmed
 from cds_core.remote import BaseAPI
 from cds_core.app_state import AppState
 from cds_core.utils import CDSJSONEncoder
@@ -21,11 +21,19 @@ from .story_state import GalaxyData, SpectrumData, StoryState
 logger = setup_logger("CDS-HUBBLE API")
 
 from typing import Any
-from pandas import read_csv
 
 DEBOUNCE_TIMEOUT = 1
 
 
+@cache
+def example_seed_records() -> tuple[dict[str, Any], ...]:
+    """The example seed measurements, which are only read from disk once per process."""
+    from pandas import read_csv
+
+    path = (Path(__file__).parent / "data" / "ExampleGalaxyDataFromStudents.csv").as_posix()
+    return tuple(read_csv(path).to_dict(orient="records"))
+
+
 class LocalAPI(BaseAPI):
     def get_app_story_states(
         self, global_state: Reactive[AppState], local_state: Reactive[StoryState]
@@ -55,6 +63,8 @@ class LocalAPI(BaseAPI):
         )
         response = self.request_session.get(url)
 
+        from astropy.io import fits
+
         with closing(BytesIO(response.content)) as f:
             f.name = gal_data.name
 
@@ -331,26 +341,51 @@ class LocalAPI(BaseAPI):
 
         return galaxy_data
 
-    def get_class_measurements(
+    def class_measurements_request(
         self,
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
+    ) -> tuple[tuple, Callable[[], list[StudentMeasurement]]]:
+        """
+        The key and load function for the class measurements. The load function
+        doesn't use the states, so it can be run ahead of time (see `cds_core.prewarm`).
+        """
+        args = (
+            local_state.value.story_id,
+            global_state.value.student.id,
+            global_state.value.classroom.class_info["id"],
+        )
+        return ("class_measurements", *args), partial(self.fetch_class_measurements, *args)
+
+    def fetch_class_measurements(
+        self, story_id: str, student_id: int, class_id: int
     ) -> list[StudentMeasurement]:
         url = (
-            f"{self.API_URL}/{local_state.value.story_id}/class-measurements/"
-            f"{global_state.value.student.id}/{global_state.value.classroom.class_info['id']}"
+            f"{self.API_URL}/{story_id}/class-measurements/"
+            f"{student_id}/{class_id}"
             f"?complete_only=true"
         )
         r = self.request_session.get(url)
         measurement_json = r.json()
 
-        measurements = Ref(local_state.fields.class_measurements)
         parsed_measurements = []
 
         for measurement in measurement_json["measurements"]:
             measurement = StudentMeasurement(**measurement)
             parsed_measurements.append(measurement)
 
+        return parsed_measurements
+
+    def get_class_measurements(
+        self,
+        global_state: Reactive[AppState],
+        local_state: Reactive[StoryState],
+    ) -> list[StudentMeasurement]:
+        parsed_measurements = prewarmed(
+            *self.class_measurements_request(global_state, local_state)
+        )
+
+        measurements = Ref(local_state.fields.class_measurements)
         measurements.set(parsed_measurements)
 
         logger.info("Loaded class measurements from database.")
@@ -368,26 +403,50 @@ class LocalAPI(BaseAPI):
         ):
             logger.warning("No class id found in classroom info.")
             return 0
+        return self.students_completed_measurements_count(
+            local_state.value.story_id,
+            global_state.value.student.id,
+            global_state.value.classroom.class_info["id"],
+        )
+
+    def students_completed_measurements_count(
+        self, story_id: str, student_id: int, class_id: int
+    ) -> int:
+        # This takes plain values, rather than the states, so that it can be
+        # called from outside of a kernel context (e.g. in a worker thread)
         url = (
-            f"{self.API_URL}/{local_state.value.story_id}/class-measurements/students-completed/"
-            f"{global_state.value.student.id}/{global_state.value.classroom.class_info['id']}"
+            f"{self.API_URL}/{story_id}/class-measurements/students-completed/"
+            f"{student_id}/{class_id}"
         )
         r = self.request_session.get(url)
         # TODO: Handle non-200 status codes
         return r.json()["students_completed_measurements"]
 
-    def get_all_data(
+    def all_data_request(
         self,
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
+    ) -> tuple[
+        tuple,
+        Callable[[], tuple[list[StudentMeasurement], list[StudentSummary], list[ClassSummary]]],
+    ]:
+        """
+        The key and load function for all of the data. The load function
+        doesn't use the states, so it can be run ahead of time (see `cds_core.prewarm`).
+        """
+        class_info = global_state.value.classroom.class_info
+        args = (local_state.value.story_id, None if class_info is None else class_info["id"])
+        return ("all_data", *args), partial(self.fetch_all_data, *args)
+
+    def fetch_all_data(
+        self, story_id: str, class_id: int | None
     ) -> tuple[list[StudentMeasurement], list[StudentSummary], list[ClassSummary]]:
-        url = f"{self.API_URL}/{local_state.value.story_id}/all-data?minimal=True"
-        if global_state.value.classroom.class_info is not None:
-            url += f"&class_id={global_state.value.classroom.class_info['id']}"
+        url = f"{self.API_URL}/{story_id}/all-data?minimal=True"
+        if class_id is not None:
+            url += f"&class_id={class_id}"
         r = self.request_session.get(url)
         res_json = r.json()
 
-        measurements = Ref(local_state.fields.all_measurements)
         parsed_measurements = []
         for measurement in res_json["measurements"]:
             if measurement["class_id"] is None:
@@ -395,22 +454,34 @@ class LocalAPI(BaseAPI):
             measurement = StudentMeasurement(**measurement)
             parsed_measurements.append(measurement)
 
-        measurements.set(parsed_measurements)
-
-        student_summaries = Ref(local_state.fields.student_summaries)
         parsed_student_summaries = []
         for summary in res_json["studentData"]:
             summary = StudentSummary(**summary)
             parsed_student_summaries.append(summary)
 
-        student_summaries.set(parsed_student_summaries)
-
-        class_summaries = Ref(local_state.fields.class_summaries)
         parsed_class_summaries = []
         for summary in res_json["classData"]:
             summary = ClassSummary(**summary)
             parsed_class_summaries.append(summary)
 
+        return parsed_measurements, parsed_student_summaries, parsed_class_summaries
+
+    def get_all_data(
+        self,
+        global_state: Reactive[AppState],
+        local_state: Reactive[StoryState],
+    ) -> tuple[list[StudentMeasurement], list[StudentSummary], list[ClassSummary]]:
+        parsed_measurements, parsed_student_summaries, parsed_class_summaries = prewarmed(
+            *self.all_data_request(global_state, local_state)
+        )
+
+        measurements = Ref(local_state.fields.all_measurements)
+        measurements.set(parsed_measurements)
+
+        student_summaries = Ref(local_state.fields.student_summaries)
+        student_summaries.set(parsed_student_summaries)
+
+        class_summaries = Ref(local_state.fields.class_summaries)
         class_summaries.set(parsed_class_summaries)
 
         logger.info("Loaded all measurements and summary data from database.")
@@ -482,12 +553,9 @@ class LocalAPI(BaseAPI):
         # url = f"{self.API_URL}/{local_state.value.story_id}/sample-measurements"
         # r = self.request_session.get(url)
         # res_json = r.json()
-        path = (
-            Path(__file__).parent / "data" / "ExampleGalaxyDataFromStudents.csv"
-        ).as_posix()
         # with open(path, 'r') as f:
         #     res_json = json.load(f)
-        res_json = read_csv(path).to_dict(orient="records")
+        res_json = example_seed_records()
 
         random_subset = range(len(res_json))
         measurements = []
@@ -501,7 +569,8 @@ class LocalAPI(BaseAPI):
         _class_id_filter = lambda x: res_json[x]["class_id"] not in classes_to_ignore
         filtered = filter(_class_id_filter, filtered)
         for i in filtered:
-            measurements.append(res_json[i])
+            # The records are shared, so hand out copies
+            measurements.append(dict(res_json[i]))
 
         return measurements
 
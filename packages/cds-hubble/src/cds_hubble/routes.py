@@ -1,3 +1,5 @@
+from importlib import import_module
+
 import solara
 from solara.lab import Ref
 from cds_core.logger import setup_logger
@@ -5,16 +7,24 @@ from cds_core.logger import setup_logger
 import solara
 from solara.lab import Ref
 
-from .stages.p00_introduction import Page as IntroductionPage
-from .stages.p01_spectra_and_velocity import Page as SpectraAndVelocityPage
-from .stages.p02_distance_introduction import Page as DistanceIntroductionPage
-from .stages.p03_distance_measurements import Page as DistanceMeasurementsPage
-from .stages.p04_explore_data import Page as ExploreDataPage
-from .stages.p05_class_results import Page as ClassResultsPage
-from .stages.p06_prodata import Page as ProDataPage
 from .layout import Layout
 from .state import APP_STATE, LOCAL_STATE
 
+
+def _stage_page(stage: str):
+    """
+    A component for the page of the given stage. The stage's page module (and
+    everything that it imports) is only imported when the page is first shown.
+    """
+
+    @solara.component
+    def StagePage():
+        Page = import_module(f".stages.{stage}.page", __package__).Page
+        return Page(app_state=APP_STATE)
+
+    return StagePage
+
+
 MetaLayout = solara.component(
     lambda *args, **kwargs: Layout(
         *args, **kwargs, story_state=LOCAL_STATE, app_state=APP_STATE
@@ -24,48 +34,38 @@ MetaLayout = solara.component(
 routes = [
     solara.Route(
         path="/",
-        component=solara.component(
-            lambda: IntroductionPage(**{"app_state": APP_STATE})
-        ),
+        component=_stage_page("p00_introduction"),
         label="Introduction",
         layout=MetaLayout,
     ),
     solara.Route(
         path="spectra-and-velocity",
-        component=solara.component(
-            lambda: SpectraAndVelocityPage(**{"app_state": APP_STATE})
-        ),
+        component=_stage_page("p01_spectra_and_velocity"),
         label="Spectra and Velocity",
     ),
     solara.Route(
         path="distance-introduction",
-        component=solara.component(
-            lambda: DistanceIntroductionPage(**{"app_state": APP_STATE})
-        ),
+        component=_stage_page("p02_distance_introduction"),
         label="Distance Introduction",
     ),
     solara.Route(
         path="distance-measurements",
-        component=solara.component(
-            lambda: DistanceMeasurementsPage(**{"app_state": APP_STATE})
-        ),
+        component=_stage_page("p03_distance_measurements"),
         label="Distance Measurements",
     ),
     solara.Route(
         path="explore-data",
-        component=solara.component(lambda: ExploreDataPage(**{"app_state": APP_STATE})),
+        component=_stage_page("p04_explore_data"),
         label="Explore Data",
     ),
     solara.Route(
         path="class-results",
-        component=solara.component(
-            lambda: ClassResultsPage(**{"app_state": APP_STATE})
-        ),
+        component=_stage_page("p05_class_results"),
         label="Class Results",
     ),
     solara.Route(
         path="prodata",
-        component=solara.component(lambda: ProDataPage(**{"app_state": APP_STATE})),
+        component=_stage_page("p06_prodata"),
         label="Professional Data",
     ),
 ]
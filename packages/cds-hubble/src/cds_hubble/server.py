@@ -1,3 +1,8 @@
+import asyncio
+import hmac
+import os
+from contextlib import asynccontextmanager
+
 from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -6,14 +11,51 @@ from solara.server import settings
 
 import solara.server.starlette
 
+from cds_core.health import api_probe, health_routes
+from cds_core.sessions import session_memory_report
+from cds_core.ticker import ticker
+from cds_hubble.warmup import warmed_up, warmup
+from cds_hubble.wwt_proxy import proxy_mount_path, wwt_proxy_enabled, wwt_proxy_routes
+
 
 def root(request: Request):
     return JSONResponse({"Error Message": "Go back whence ye came."})
 
 
+OPERATOR_TOKEN = os.getenv("CDS_OPERATOR_TOKEN", "")
+
+
+def sessions(request: Request):
+    """The memory use of the sessions in this worker process, for operators."""
+    authorization = request.headers.get("authorization", "")
+    if not hmac.compare_digest(authorization, f"Bearer {OPERATOR_TOKEN}"):
+        return JSONResponse({"Error Message": "Unauthorized"}, status_code=401)
+    return JSONResponse({"pid": os.getpid(), "sessions": session_memory_report()})
+
+
 routes = [
+    *health_routes(probes=[api_probe()], checks={"warmup": warmed_up}),
     Route("/", endpoint=root),
     Mount("/hubbles-law/", routes=solara.server.starlette.routes),
 ]
 
-app = Starlette(routes=routes, middleware=solara.server.starlette.middleware)
+if wwt_proxy_enabled():
+    # This needs to come before the Solara routes, which it may be mounted under
+    routes.insert(1, Mount(proxy_mount_path(), routes=wwt_proxy_routes()))
+
+if OPERATOR_TOKEN:
+    routes.insert(1, Route("/sessions", endpoint=sessions))
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    # Periodic callbacks run on this worker's loop, rather than on a thread of their own
+    ticker.attach(asyncio.get_running_loop())
+    # This does nothing if the parent process has already warmed up
+    warmup()
+    yield
+
+
+app = Starlette(
+    routes=routes, middleware=solara.server.starlette.middleware, lifespan=lifespan
+)
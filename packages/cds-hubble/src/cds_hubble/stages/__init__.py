@@ -1 +1,9 @@
+import importlib
+import pkgutil
+
+# The stage states register themselves when they're imported, and they have to
+# be registered before the app state (created when the routes are imported) is
+for _, _module_name, _ in pkgutil.iter_modules(__path__):
+    importlib.import_module(f".{_module_name}.stage_state", __name__)
+
 from ..routes import routes
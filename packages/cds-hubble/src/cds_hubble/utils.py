@@ -1,15 +1,12 @@
 from collections import defaultdict
 from astropy import units as u
-from astropy.modeling import models, fitting
-from numpy import argsort, array, pi
+from numpy import array, pi
 
-from cds_core.utils import component_type_for_field, mode, percent_around_center_indices
+from cds_core.utils import component_type_for_field
 from pydantic import BaseModel
 
-from glue.core import Data
-from glue_jupyter.app import JupyterApplication
 from numbers import Number
-from typing import List, Set, Tuple, TypeVar, Optional, cast, Any
+from typing import TYPE_CHECKING, List, Set, Tuple, TypeVar, Optional, cast, Any
 from collections.abc import Callable
 import solara
 from solara.routing import Router
@@ -17,19 +14,15 @@ from solara.toestand import Reactive
 from solara.server import settings
 
 from .story_state import StudentMeasurement
-from glue.core import Data
 from numpy import asarray
 
-from deepdiff import DeepDiff
-from deepdiff.helper import NotPresent
+# glue is slow to import, so it's only imported by the functions that use it
+if TYPE_CHECKING:
+    from glue.core import Data
+    from glue_jupyter.app import JupyterApplication
 
 from pathlib import Path
 
-try:
-    from astropy.cosmology import Planck18 as planck
-except ImportError:
-    from astropy.cosmology import Planck15 as planck
-
 __all__ = [
     "HUBBLE_ROUTE_PATH",
     "MILKY_WAY_SIZE_MPC",
@@ -97,6 +90,12 @@ def age_in_gyr(H0):
     age: numpy.float64
         The age of the universe, in Gyr
     """
+    # astropy.cosmology imports astropy.modeling, so it's only imported here
+    try:
+        from astropy.cosmology import Planck18 as planck
+    except ImportError:
+        from astropy.cosmology import Planck15 as planck
+
     age = planck.clone(H0=H0).age(0)
     unit = age.unit
     return age.value * unit.to(u.Gyr)
@@ -110,6 +109,8 @@ def age_in_gyr_simple(H0):
 
 
 def fit_line(x, y):
+    from astropy.modeling import fitting, models
+
     try:
         fit = fitting.LinearLSQFitter()
         line_init = models.Linear1D(intercept=0, fixed={"intercept": True})
@@ -148,20 +149,18 @@ def distance_from_angular_size(theta):
 
 
 def data_summary_for_component(data, component_id):
+    from cds_core.order_statistics import order_statistics
+
+    stats = order_statistics(data, component_id)
     summary = {
-        "mean": data.compute_statistic("mean", component_id),
-        "median": data.compute_statistic("median", component_id),
-        "mode": mode(data, component_id),
+        "mean": stats.mean,
+        "median": stats.median,
+        "mode": stats.mode(),
     }
-    values = data[component_id]
     percents = [50, 68, 95]
-    sorted_indices = argsort(values)
 
     for percent in percents:
-        bottom_index, top_index = percent_around_center_indices(data.size, percent)
-        bottom = values[sorted_indices[bottom_index]]
-        top = values[sorted_indices[top_index]]
-        summary[f"{percent}%"] = (bottom, top)
+        summary[f"{percent}%"] = stats.percent_range(percent)
 
     return summary
 
@@ -169,6 +168,8 @@ def data_summary_for_component(data, component_id):
 def measurement_list_to_glue_data(
     measurements: list[StudentMeasurement] | list[dict], label=""
 ):
+    from glue.core import Data
+
     x = []
     for measurement in measurements:
         if isinstance(measurement, StudentMeasurement):
@@ -183,7 +184,9 @@ M = TypeVar("M", bound=BaseModel)
 
 def models_to_glue_data(
     items: List[M], label: str | None = None, ignore_components: list[str] | None = None
-) -> Data:
+) -> "Data":
+    from glue.core import Data
+
     data_dict = {}
     if items:
         t = type(items[0])
@@ -209,11 +212,13 @@ def create_single_summary(
 
 
 def make_summary_data(
-    measurement_data: Data,
+    measurement_data: "Data",
     input_id_field: str = "id",
     output_id_field: str | None = None,
     label: str | None = None,
-) -> Data:
+) -> "Data":
+    from glue.core import Data
+
     dists = defaultdict(list)
     vels = defaultdict(list)
     d = measurement_data["est_dist_value"]
@@ -294,6 +299,10 @@ def sync_reactives(
 
     prevent_sync_value [None]: Optional, Any.
         The value that will prevent sync if `prevent_sync` is True.
+
+    Returns a function that removes the sync. When syncing inside of a component,
+    this should be called when the component is unmounted (e.g. by adding it to
+    a `cds_core.subscriptions.Subscriptions`).
     """
     _equalish = lambda x, y: (x == y) or (x is y)  # np.nan requires 'is' -_-
 
@@ -315,11 +324,17 @@ def sync_reactives(
         if after_a_synced:
             after_a_synced(a)
 
-    a.subscribe(on_a_changed)
-    b.subscribe(on_b_changed)
+    unsubscribe_a = a.subscribe(on_a_changed)
+    unsubscribe_b = b.subscribe(on_b_changed)
+
+    def unsync():
+        unsubscribe_a()
+        unsubscribe_b()
+
+    return unsync
 
 
-def _add_or_update_data(gjapp: JupyterApplication, data: Data):
+def _add_or_update_data(gjapp: "JupyterApplication", data: "Data"):
     if data.label in gjapp.data_collection:
         existing = gjapp.data_collection[data.label]
         existing.update_values_from_data(data)
@@ -333,6 +348,8 @@ from cds_core.utils import basic_link_exists
 
 
 def _add_link(gjapp, from_dc_name, from_att, to_dc_name, to_att):
+    from glue.core import Data
+
     if isinstance(from_dc_name, Data):
         from_dc = from_dc_name
     else:
@@ -387,6 +404,9 @@ def dict_diff(d1, d2, path=""):
 
 
 def apply_changes(result, changes):
+    # deepdiff imports pandas, so it's only imported by the functions that use it
+    from deepdiff.helper import NotPresent
+
     for change in changes:
         path = change.path(output_format="list")
         value = change.t2
@@ -402,6 +422,8 @@ def apply_changes(result, changes):
 
 
 def extract_changed_subtree(old_dict, new_dict):
+    from deepdiff import DeepDiff
+
     diff = DeepDiff(old_dict, new_dict, view="tree")
     result = {}
 
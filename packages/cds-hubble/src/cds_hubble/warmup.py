@@ -0,0 +1,69 @@
+"""
+Warm up a server process before it handles any requests.
+
+With a pre-forking server (see docker/cds-hubble/gunicorn.conf.py), this runs
+once in the parent process, so that the workers share the imported modules,
+compiled components and reference data copy-on-write, rather than each worker
+loading them on its first request. Otherwise, it runs in each worker at startup.
+"""
+
+import gc
+import importlib
+import pkgutil
+import time
+from threading import Lock
+
+from cds_core.logger import setup_logger
+
+__all__ = ["warmup", "warmed_up"]
+
+logger = setup_logger("WARMUP")
+
+_warmed_up = False
+_warmup_lock = Lock()
+
+
+def _import_stage_pages():
+    import cds_hubble.stages
+
+    for _, module_name, _ in pkgutil.iter_modules(cds_hubble.stages.__path__):
+        importlib.import_module(f"cds_hubble.stages.{module_name}.page")
+
+
+def _load_reference_data():
+    from cds_hubble.remote import example_seed_records
+
+    example_seed_records()
+
+
+def warmup(freeze: bool = False):
+    """
+    Import the stage pages, compile the guideline components and load the reference
+    data. Once this has succeeded in a process, calling it again does nothing.
+
+    If `freeze` is True, the objects that exist afterwards are moved into the
+    garbage collector's permanent generation, so that collections in forked
+    workers don't touch (and so copy) the pages that they're on.
+    """
+    global _warmed_up
+    with _warmup_lock:
+        if _warmed_up:
+            return
+
+        from cds_hubble import preload_guidelines
+
+        start = time.perf_counter()
+        _import_stage_pages()
+        preload_guidelines()
+        _load_reference_data()
+        _warmed_up = True
+        logger.info(f"Warmed up in {time.perf_counter() - start:.2f}s")
+
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+
+def warmed_up() -> bool:
+    """Whether this process (or the parent that it was forked from) has finished warming up."""
+    return _warmed_up
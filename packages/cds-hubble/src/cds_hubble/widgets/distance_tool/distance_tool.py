@@ -3,7 +3,8 @@ from datetime import datetime
 import astropy.units as u
 import ipyvue as v
 from astropy.coordinates import Angle, SkyCoord
-from cds_core.utils import RepeatedTimer, load_template
+from cds_core.ticker import call_every
+from cds_core.utils import load_template
 from ipywidgets import DOMWidget, widget_serialization
 from traitlets import Instance, Bool, Float, Int, Unicode, observe, Dict
 
@@ -74,14 +75,15 @@ class DistanceTool(v.VueTemplate):
         self.widget._set_message_type_callback('wwt_view_state',
                                                self._update_wwt_state)
         self.last_update = datetime.now()
-        self._rt = RepeatedTimer(self.UPDATE_TIME, self._update_wwt_state)
-        self._rt.start()
+        self._rt = call_every(self.UPDATE_TIME, self._update_wwt_state)
         self.set_background()
         self.update_text()
 
-    def __del__(self):
-        self._rt.stop()
-        super().__del__()
+    def close(self):
+        rt = getattr(self, "_rt", None)
+        if rt is not None:
+            rt.cancel()
+        super().close()
 
     def set_background(self):
         if self.widget.background != self.background:
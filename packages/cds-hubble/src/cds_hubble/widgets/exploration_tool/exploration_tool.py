@@ -3,7 +3,8 @@ from datetime import datetime
 import astropy.units as u
 import ipyvue as v
 from astropy.coordinates import Angle
-from cds_core.utils import RepeatedTimer, load_template
+from cds_core.ticker import call_every
+from cds_core.utils import load_template
 from ipywidgets import DOMWidget, widget_serialization
 from ipywwt import WWTWidget
 from traitlets import Bool, Instance, Int
@@ -52,7 +53,15 @@ class ExplorationTool(v.VueTemplate):
             "wwt_view_state", self._handle_view_message
         )
         self.last_update = datetime.now()
-        self._rt = RepeatedTimer(self.UPDATE_TIME, self._update_if_needed)
+        self._rt = call_every(self.UPDATE_TIME, self._update_if_needed)
+
+    def close(self):
+        rt = getattr(self, "_rt", None)
+        if rt is not None:
+            rt.cancel()
+        if self.widget is not None:
+            self.widget.close()
+        super().close()
 
     def _update_if_needed(self):
         delta = datetime.now() - self.last_update
@@ -76,7 +85,7 @@ class ExplorationTool(v.VueTemplate):
         if self.pan_count >= self.PANS_NEEDED or self.zoom_count >= self.ZOOMS_NEEDED:
             self.exploration_complete = True
             self.widget._set_message_type_callback("wwt_view_state", None)
-            self._rt.stop()
+            self._rt.cancel()
 
     def _handle_view_message(self, wwt, _updated):
         fov = Angle(wwt.get_fov())
@@ -2,6 +2,8 @@ from traitlets import Unicode
 
 from ipywwt import WWTWidget
 
+from ..wwt_proxy import SURVEYS_URL, proxied_surveys_url, wwt_proxy_enabled
+
 
 class HubbleWWTWidget(WWTWidget):
 
@@ -15,7 +17,7 @@ class HubbleWWTWidget(WWTWidget):
         help="The layer to show in the foreground (`str`)",
     ).tag(wwt=None, wwt_reset=True)
 
-    SURVEYS_URL = "https://gist.githubusercontent.com/Carifio24/447d69e14a3196665fa3cb59f93ec0ee/raw/040cb93508c47284b44435c413e3fc92dc601f2d/surveys_minimal.wtml"
+    SURVEYS_URL = proxied_surveys_url() if wwt_proxy_enabled() else SURVEYS_URL
 
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,169 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+
+from .hubble_wwt import HubbleWWTWidget
+
+__all__ = ["DEFAULT_VIEW", "WWTView", "WWTWidgetHost", "wwt_host"]
+
+
+Release = Callable[[], None]
+LayerFactory = Callable[[HubbleWWTWidget], Any]
+
+
+class WWTView(NamedTuple):
+    coordinates: SkyCoord
+    fov: u.Quantity
+
+
+# The view of a newly created widget
+DEFAULT_VIEW = WWTView(SkyCoord(0 * u.deg, 0 * u.deg, frame="icrs"), 60 * u.deg)
+
+
+def _ignore_selection(wwt, updated):
+    pass
+
+
+class WWTWidgetHost:
+    """
+    Holds the single `HubbleWWTWidget` for a session. Components borrow the widget
+    while they're mounted, and return it when they're unmounted, so that the WWT
+    engine (and its initialization and imagery loading) is only set up once per
+    session, rather than once for each component that shows the sky.
+
+    Only one component can hold the widget at a time. When the widget is returned,
+    or borrowed by another component, the layers of the previous borrower are
+    hidden, its selection callback is removed and the camera goes back to the
+    default view.
+
+    Each borrower shows the widget in its own container, so the browser renders a
+    new view of it, with its own WWT engine. The widget is only treated as ready
+    once that view reports that it is, and the layers are created again in it.
+    """
+
+    def __init__(self):
+        self._widget: Optional[HubbleWWTWidget] = None
+        self._loan = 0
+        self._ready_callbacks: List[Callable[[], None]] = []
+        self._layers: Dict[str, Any] = {}
+
+    @property
+    def widget(self) -> HubbleWWTWidget:
+        if self._widget is None:
+            self._widget = HubbleWWTWidget(use_remote=True)
+            self._widget.observe(self._on_ready, "_wwt_ready")
+        return self._widget
+
+    @property
+    def ready(self) -> bool:
+        return self._widget is not None and bool(self._widget._wwt_ready)
+
+    def _on_ready(self, change):
+        if not change["new"]:
+            return
+        callbacks, self._ready_callbacks = self._ready_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _when_ready(self, callback: Callable[[], None]):
+        if self.ready:
+            callback()
+        else:
+            self._ready_callbacks.append(callback)
+
+    def borrow(
+        self,
+        on_ready: Optional[Callable[[], None]] = None,
+        view: Optional[WWTView] = None,
+        **traits,
+    ) -> Tuple[HubbleWWTWidget, Release]:
+        """
+        Borrow the widget. Any given traits (e.g. `foreground` and `background`)
+        are set once the widget is ready, and the camera is moved (instantly) to
+        `view`, or to the default view if that's not given. Then `on_ready` is called.
+
+        Returns the widget, along with a function that returns it to the host.
+        """
+        widget = self.widget
+        if self._loan:
+            self._new_view()
+            self._reset()
+        self._loan += 1
+        loan = self._loan
+
+        def setup():
+            for name, value in traits.items():
+                setattr(widget, name, value)
+            self._go_to(view or DEFAULT_VIEW)
+            if on_ready is not None:
+                on_ready()
+
+        self._when_ready(setup)
+
+        def release():
+            # Do nothing if the widget has been borrowed by someone else since
+            if self._loan == loan:
+                self._reset()
+
+        return widget, release
+
+    def table_layer(self, name: str, factory: LayerFactory):
+        """
+        Get the layer with the given name, creating it with `factory` the first time
+        for the current view of the widget. The layer is shown by setting its opacity,
+        and hidden when the widget is returned.
+        """
+        layer = self._layers.get(name, None)
+        if layer is None:
+            layer = factory(self.widget)
+            self._layers[name] = layer
+        return layer
+
+    def _go_to(self, view: WWTView):
+        self._widget.center_on_coordinates(view.coordinates, fov=view.fov, instant=True)
+
+    def _new_view(self):
+        # The previous view's engine, and the layers in it, went with its container.
+        # Anything sent before the new view is ready would be lost, so wait for it to
+        # report that it's ready (which it only does if the trait changes).
+        for layer in self._layers.values():
+            layer.remove()
+        self._layers.clear()
+        self._widget._wwt_ready = False
+
+    def _reset(self):
+        self._ready_callbacks.clear()
+        if self._widget is None:
+            return
+        self._widget.set_selection_change_callback(_ignore_selection)
+        for layer in self._layers.values():
+            layer.opacity = 0
+        if self.ready:
+            self._go_to(DEFAULT_VIEW)
+
+
+_HOST_KEY = "cds-hubble-wwt-host"
+_default_host: Optional[WWTWidgetHost] = None
+
+
+def wwt_host() -> WWTWidgetHost:
+    """
+    The WWT widget host for the current session. Outside of a solara kernel
+    (e.g. in a notebook) a single host is shared.
+    """
+    global _default_host
+    import solara.server.kernel_context
+
+    if not solara.server.kernel_context.has_current_context():
+        if _default_host is None:
+            _default_host = WWTWidgetHost()
+        return _default_host
+
+    # Per-session state lives on the kernel context, and its widgets
+    # are closed along with the rest of the kernel's widgets
+    user_dict = solara.server.kernel_context.get_current_context().user_dicts.setdefault(_HOST_KEY, {})
+    host = user_dict.get("host", None)
+    if host is None:
+        host = user_dict["host"] = WWTWidgetHost()
+    return host
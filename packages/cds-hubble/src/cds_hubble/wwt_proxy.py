@@ -0,0 +1,290 @@
+"""
+An optional caching proxy for the WWT survey metadata and imagery tiles.
+
+When enabled (by setting CDS_WWT_PROXY_URL to the public URL that the proxy is
+mounted at), `HubbleWWTWidget` loads its surveys through the proxy. The proxy
+can't be mounted at the root of the server, so if the URL has no path, the
+proxy is mounted at /wwt. The survey
+WTML that the proxy serves has its tile URLs rewritten to point back at the
+proxy, so that each tile is only fetched from the upstream servers once per
+server, rather than once per student.
+
+Both the WTML and the tiles are cached on disk, in CDS_WWT_CACHE_DIR. If the
+upstream surveys file can't be fetched and hasn't been cached yet, a copy saved
+with `bundle_surveys` is used instead, if there is one. Otherwise, clients are
+redirected to the upstream surveys file, and load the tiles directly.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import RedirectResponse, Response
+from starlette.routing import Route
+
+from cds_core.logger import setup_logger
+
+__all__ = [
+    "SURVEYS_URL",
+    "BUNDLED_SURVEYS_PATH",
+    "WWTCache",
+    "wwt_proxy_enabled",
+    "proxied_surveys_url",
+    "proxy_mount_path",
+    "wwt_proxy_routes",
+    "bundle_surveys",
+]
+
+logger = setup_logger("WWT PROXY")
+
+SURVEYS_URL = "https://gist.githubusercontent.com/Carifio24/447d69e14a3196665fa3cb59f93ec0ee/raw/040cb93508c47284b44435c413e3fc92dc601f2d/surveys_minimal.wtml"
+
+BUNDLED_SURVEYS_PATH = Path(__file__).parent / "data" / "surveys_minimal.wtml"
+
+# Where the proxy is mounted if CDS_WWT_PROXY_URL doesn't give a path
+DEFAULT_MOUNT_PATH = "/wwt"
+
+
+def _proxy_url(url: str) -> str:
+    url = url.strip().rstrip("/")
+    # The app's own routes are at the root of the server, so the proxy can't be
+    if url and not urlsplit(url).path:
+        url += DEFAULT_MOUNT_PATH
+    return url
+
+
+PROXY_URL = _proxy_url(os.getenv("CDS_WWT_PROXY_URL", ""))
+CACHE_DIR = Path(os.getenv("CDS_WWT_CACHE_DIR", Path(tempfile.gettempdir()) / "cds-wwt-cache"))
+
+REQUEST_TIMEOUT = 10
+
+# Survey URL attributes and elements that the WWT client fetches imagery from
+_URL_ATTRIBUTE = re.compile(r'\b(Url|ThumbnailUrl)="(https?)://([^/"]+)/([^"]*)"')
+_URL_ELEMENT = re.compile(r"<(ThumbnailUrl)>\s*(https?)://([^/<\s]+)/([^<\s]*)\s*</ThumbnailUrl>")
+_TEMPLATE_FIELD = re.compile(r"\{[^}]*\}")
+
+Fetch = Callable[[str], Tuple[bytes, str]]
+
+
+def _fetch(url: str) -> Tuple[bytes, str]:
+    response = requests.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.content, response.headers.get("content-type", "application/octet-stream")
+
+
+def _host_pattern(host: str) -> re.Pattern:
+    # Tile hosts can be templates, e.g. r{S:0}.ortho.tiles.virtualearth.net. The
+    # template fields can only stand for (parts of) host name labels, so that a
+    # host like "r@169.254.169.254:80#.ortho.tiles.virtualearth.net" doesn't match
+    parts = _TEMPLATE_FIELD.split(host)
+    return re.compile("[A-Za-z0-9-]*".join(re.escape(part) for part in parts), re.IGNORECASE)
+
+
+class WWTCache:
+    """
+    A disk cache of the surveys file and of the tiles of the surveys listed in it.
+
+    Only tiles from the hosts that appear in the surveys file can be fetched, so
+    that the proxy can't be used to fetch arbitrary URLs.
+
+    Parameters
+    ----------
+    cache_dir : `~pathlib.Path`
+        The directory to cache responses in.
+    proxy_url : str
+        The public URL that the proxy routes are mounted at. Tile URLs in the
+        surveys file are rewritten relative to this.
+    surveys_url : str, optional
+        The upstream surveys file.
+    fallback_path : `~pathlib.Path`, optional
+        A surveys file to use when the upstream file is unavailable.
+    fetch : callable, optional
+        The function used to make upstream requests. It is passed a URL and returns
+        the response content and content type, raising an exception on failure.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        proxy_url: str,
+        surveys_url: str = SURVEYS_URL,
+        fallback_path: Optional[Path] = BUNDLED_SURVEYS_PATH,
+        fetch: Fetch = _fetch,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.proxy_url = proxy_url.rstrip("/")
+        self.surveys_url = surveys_url
+        self.fallback_path = fallback_path
+        self._fetch = fetch
+        self._hosts: List[re.Pattern] = []
+        self._surveys: Optional[bytes] = None
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        directory = self.cache_dir / key[:2]
+        return directory / key, directory / f"{key}.type"
+
+    def _read(self, url: str) -> Optional[Tuple[bytes, str]]:
+        path, type_path = self._paths(url)
+        try:
+            return path.read_bytes(), type_path.read_text()
+        except OSError:
+            return None
+
+    def _write(self, url: str, content: bytes, content_type: str):
+        path, type_path = self._paths(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename it, so that concurrent
+        # readers (including other workers) never see a partial file
+        for target, data in ((type_path, content_type.encode("utf-8")), (path, content)):
+            fd, temp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp, target)
+
+    def get(self, url: str) -> Tuple[bytes, str]:
+        """Get the content and content type of `url`, fetching and caching it if needed."""
+        cached = self._read(url)
+        if cached is not None:
+            return cached
+        content, content_type = self._fetch(url)
+        self._write(url, content, content_type)
+        return content, content_type
+
+    def _load_surveys(self) -> bytes:
+        try:
+            # Prefer a fresh copy of the surveys file, but fall back to the cache
+            content, content_type = self._fetch(self.surveys_url)
+            self._write(self.surveys_url, content, content_type)
+            return content
+        except Exception as e:
+            logger.warning(f"Unable to fetch {self.surveys_url}: {e}")
+        cached = self._read(self.surveys_url)
+        if cached is not None:
+            return cached[0]
+        if self.fallback_path is not None and self.fallback_path.is_file():
+            return self.fallback_path.read_bytes()
+        raise FileNotFoundError(f"No copy of {self.surveys_url} is available")
+
+    def _proxied(self, scheme: str, host: str, path: str) -> str:
+        return f"{self.proxy_url}/tiles/{scheme}/{host}/{path}"
+
+    def _rewrite_attribute(self, match: re.Match) -> str:
+        attribute, scheme, host, path = match.groups()
+        return f'{attribute}="{self._proxied(scheme, host, path)}"'
+
+    def _rewrite_element(self, match: re.Match) -> str:
+        element, scheme, host, path = match.groups()
+        return f"<{element}>{self._proxied(scheme, host, path)}</{element}>"
+
+    def surveys(self) -> bytes:
+        """The surveys file, with its imagery URLs pointed at the proxy."""
+        if self._surveys is None:
+            text = self._load_surveys().decode("utf-8")
+            hosts = {m.group(3) for pattern in (_URL_ATTRIBUTE, _URL_ELEMENT) for m in pattern.finditer(text)}
+            self._hosts = [_host_pattern(host) for host in hosts]
+            text = _URL_ATTRIBUTE.sub(self._rewrite_attribute, text)
+            self._surveys = _URL_ELEMENT.sub(self._rewrite_element, text).encode("utf-8")
+        return self._surveys
+
+    def allows(self, host: str) -> bool:
+        self.surveys()
+        return any(pattern.fullmatch(host) for pattern in self._hosts)
+
+    def tile(self, scheme: str, host: str, path: str, query: str = "") -> Tuple[bytes, str]:
+        if scheme not in ("http", "https") or not self.allows(host):
+            raise PermissionError(f"{scheme}://{host} is not a survey host")
+        url = f"{scheme}://{host}/{path}"
+        if query:
+            url = f"{url}?{query}"
+
+        # Check the host that the URL will actually be fetched from, too
+        parts = urlsplit(url)
+        try:
+            port = parts.port
+        except ValueError:
+            port = -1
+        if (
+            parts.scheme != scheme
+            or parts.username is not None
+            or parts.password is not None
+            or port is not None
+            or parts.hostname is None
+            or not self.allows(parts.hostname)
+        ):
+            raise PermissionError(f"{url} is not a survey tile URL")
+        return self.get(url)
+
+
+# The WWT client is served from another origin, so it needs CORS headers
+_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Cache-Control": "public, max-age=86400",
+}
+
+
+def wwt_proxy_enabled() -> bool:
+    return bool(PROXY_URL)
+
+
+def proxied_surveys_url() -> str:
+    return f"{PROXY_URL}/surveys.wtml"
+
+
+def proxy_mount_path() -> str:
+    """The path that the proxy routes are mounted at on this server."""
+    return urlsplit(PROXY_URL).path
+
+
+def wwt_proxy_routes(cache: Optional[WWTCache] = None) -> List[Route]:
+    """
+    The Starlette routes for the proxy, to be mounted at CDS_WWT_PROXY_URL.
+    The default cache uses the environment configuration.
+    """
+    if cache is None:
+        cache = WWTCache(CACHE_DIR, PROXY_URL)
+
+    async def surveys(request: Request):
+        try:
+            content = await run_in_threadpool(cache.surveys)
+        except FileNotFoundError as e:
+            # The tiles in the upstream file aren't proxied, but that's better than no surveys
+            logger.warning(f"{e}; redirecting to the upstream surveys file")
+            return RedirectResponse(cache.surveys_url, status_code=307, headers=_HEADERS)
+        return Response(content, media_type="text/xml", headers=_HEADERS)
+
+    async def tile(request: Request):
+        params = request.path_params
+        try:
+            content, content_type = await run_in_threadpool(
+                cache.tile, params["scheme"], params["host"], params["path"], request.url.query
+            )
+        except PermissionError as e:
+            return Response(str(e), status_code=403)
+        except Exception as e:
+            logger.warning(f"Unable to fetch tile {request.url.path}: {e}")
+            return Response(status_code=502)
+        return Response(content, media_type=content_type, headers=_HEADERS)
+
+    return [
+        Route("/surveys.wtml", endpoint=surveys),
+        Route("/tiles/{scheme}/{host}/{path:path}", endpoint=tile),
+    ]
+
+
+def bundle_surveys(path: Path = BUNDLED_SURVEYS_PATH, surveys_url: str = SURVEYS_URL):
+    """Save the upstream surveys file as the bundled fallback copy."""
+    content, _ = _fetch(surveys_url)
+    path.write_bytes(content)
+
+
+if __name__ == "__main__":
+    bundle_surveys()
+    print(f"Saved {SURVEYS_URL} to {BUNDLED_SURVEYS_PATH}")
@@ -0,0 +1,139 @@
+"""
+Benchmarks of the time to first paint of the class results stage, where the
+viewers are created when the marker that first shows them is reached. The stage
+page is rendered with a class's worth of measurements, which are made from the
+dummy student data rather than loaded from the API. The limit can be adjusted
+for slower machines with CDS_FIRST_PAINT_LIMIT (in seconds).
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+import solara
+
+import cds_hubble.stages  # noqa: F401 (registers the stage states)
+from cds_core.app_state import AppState
+from cds_core.viewers import LazyViewers
+from cds_hubble.remote import LOCAL_API, LocalAPI
+from cds_hubble.stages.p05_class_results.page import Page
+from cds_hubble.story_state import ClassSummary, StudentSummary
+
+FIRST_PAINT_LIMIT = float(os.getenv("CDS_FIRST_PAINT_LIMIT", "2.0"))
+
+# The viewers that the first marker of the stage shows
+FIRST_PAINT_VIEWERS = {"layer"}
+ALL_VIEWERS = {"layer", "student_slider", "class_slider", "student_hist", "all_student_hist", "class_hist"}
+
+STUDENT_ID = 0
+CLASS_ID = 1
+N_STUDENTS = 25
+N_CLASSES = 10
+
+
+def _measurements(student_ids, rng):
+    measurements = []
+    for student_id in student_ids:
+        for measurement in LocalAPI.get_dummy_data():
+            measurements.append(measurement.model_copy(update=dict(
+                student_id=student_id,
+                class_id=CLASS_ID,
+                est_dist_value=measurement.est_dist_value * rng.uniform(0.8, 1.2),
+                velocity_value=measurement.velocity_value * rng.uniform(0.9, 1.1),
+            )))
+    return measurements
+
+
+@pytest.fixture
+def class_api(monkeypatch):
+    """The API requests of the stage, answered with data for a class of students."""
+    rng = np.random.default_rng(5)
+    class_measurements = _measurements(range(1, N_STUDENTS + 1), rng)
+    all_measurements = _measurements(range(1, 4 * N_STUDENTS + 1), rng)
+    student_summaries = [
+        StudentSummary(student_id=student_id, hubble_fit_value=rng.normal(70, 5), age_value=rng.normal(13, 2))
+        for student_id in range(1, N_STUDENTS + 1)
+    ]
+    class_summaries = [
+        ClassSummary(class_id=class_id, hubble_fit_value=rng.normal(70, 3), age_value=rng.normal(13, 1))
+        for class_id in range(CLASS_ID + 1, CLASS_ID + N_CLASSES + 1)
+    ]
+
+    monkeypatch.setattr(LOCAL_API, "update_class_size", lambda state: None)
+    monkeypatch.setattr(LOCAL_API, "fetch_class_measurements", lambda *args: list(class_measurements))
+    monkeypatch.setattr(
+        LOCAL_API,
+        "fetch_all_data",
+        lambda *args: (list(all_measurements), list(student_summaries), list(class_summaries)),
+    )
+
+
+@pytest.fixture
+def page_viewers(monkeypatch):
+    """The lazy viewers that each rendering of the stage page sets up."""
+    viewers = []
+    init = LazyViewers.__init__
+
+    def recording_init(self):
+        init(self)
+        viewers.append(self)
+
+    monkeypatch.setattr(LazyViewers, "__init__", recording_init)
+    return viewers
+
+
+def _create_viewers_eagerly(monkeypatch):
+    """Create each viewer as soon as it's registered, as the stage used to."""
+    register = LazyViewers.register
+
+    def eager_register(self, names, factory):
+        register(self, names, factory)
+        self[next(iter(names))]
+
+    monkeypatch.setattr(LazyViewers, "register", eager_register)
+
+
+def _time_to_paint():
+    app_state = solara.reactive(AppState(update_db=False))
+    app_state.value.student.id = STUDENT_ID
+    app_state.value.classroom.class_info = {"id": CLASS_ID}
+    app_state.value.story_state.measurements = _measurements([STUDENT_ID], np.random.default_rng(7))
+
+    start = time.perf_counter()
+    _, rc = solara.render(
+        solara.RoutingProvider(children=[Page(app_state)], routes=[solara.Route("/")], pathname="/"),
+        handle_error=False,
+    )
+    elapsed = time.perf_counter() - start
+
+    rc.close()
+    app_state.value.reset_glue()
+    return elapsed
+
+
+@pytest.fixture
+def warm_up(class_api):
+    # The first rendering pays for imports and caches
+    _time_to_paint()
+
+
+def test_first_paint_only_creates_its_viewers(warm_up, page_viewers):
+    _time_to_paint()
+    assert set(page_viewers[-1].created) == FIRST_PAINT_VIEWERS
+    assert set(page_viewers[-1]) == ALL_VIEWERS
+
+
+def test_time_to_first_paint(warm_up):
+    lazy = min(_time_to_paint() for _ in range(3))
+    assert lazy < FIRST_PAINT_LIMIT, f"The first paint took {lazy:.2f}s"
+
+
+def test_first_paint_is_faster_than_creating_every_viewer(warm_up, page_viewers, monkeypatch):
+    lazy = min(_time_to_paint() for _ in range(3))
+    with monkeypatch.context() as patch:
+        _create_viewers_eagerly(patch)
+        eager = min(_time_to_paint() for _ in range(3))
+    assert set(page_viewers[-1].created) == ALL_VIEWERS
+
+    assert lazy < eager / 2, f"The first paint took {lazy:.2f}s, and creating every viewer took {eager:.2f}s"
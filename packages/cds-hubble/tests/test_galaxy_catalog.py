@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from cds_hubble.helpers import galaxy_catalog as catalog_module
+from cds_hubble.helpers.galaxy_catalog import add_galaxy_layer, galaxy_catalog
+from cds_hubble.story_state import GalaxyData
+
+
+def _galaxies(count=50):
+    return [
+        GalaxyData(id=index, name=f"galaxy_{index}.fits", ra=150 + index / 10, decl=10 + index / 20,
+                   z=0.01 * index, type="Sp", element="H-α")
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_catalogs(monkeypatch):
+    monkeypatch.setattr(catalog_module, "_catalogs", {})
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build_catalog = catalog_module._build_catalog
+
+    def counting_build_catalog(version, galaxies):
+        calls.append(version)
+        return build_catalog(version, galaxies)
+
+    monkeypatch.setattr(catalog_module, "_build_catalog", counting_build_catalog)
+    return calls
+
+
+def test_catalog_is_built_once_per_version(builds):
+    catalogs = [galaxy_catalog(_galaxies()) for _ in range(5)]
+
+    assert len(builds) == 1
+    assert all(catalog is catalogs[0] for catalog in catalogs)
+    assert catalogs[0].table.colnames == ["id", "ra", "decl"]
+    assert len(catalogs[0].table) == 50
+
+
+def test_changed_galaxies_are_a_new_version(builds):
+    first = galaxy_catalog(_galaxies())
+    galaxies = _galaxies()
+    galaxies[3] = galaxies[3].model_copy(update={"ra": 0.0})
+    second = galaxy_catalog(galaxies)
+
+    assert first.version != second.version
+    assert len(builds) == 2
+    assert second.table["ra"][3] == 0.0
+    # Properties that aren't in the layer don't change the version
+    galaxies = _galaxies()
+    galaxies[3] = galaxies[3].model_copy(update={"z": 1.0})
+    assert galaxy_catalog(galaxies) is first
+
+
+def test_empty_catalog_isnt_cached(builds):
+    empty = galaxy_catalog([])
+    assert len(empty.table) == 0
+    assert catalog_module._catalogs == {}
+
+    galaxy_catalog([])
+    assert len(builds) == 2
+
+
+def test_layer_uses_shared_table():
+    added = []
+
+    def add_table_layer(table, **kwargs):
+        added.append((table, kwargs))
+        return SimpleNamespace(table=table, **kwargs)
+
+    catalog = galaxy_catalog(_galaxies())
+    widgets = [SimpleNamespace(layers=SimpleNamespace(add_table_layer=add_table_layer)) for _ in range(3)]
+    layers = [add_galaxy_layer(widget, galaxy_catalog(_galaxies()), lon_att="ra", lat_att="decl")
+              for widget in widgets]
+
+    assert len(added) == 3
+    assert all(table is catalog.table for table, _ in added)
+    assert all(kwargs == {"lon_att": "ra", "lat_att": "decl"} for _, kwargs in added)
+    assert all(layer.table is catalog.table for layer in layers)
@@ -0,0 +1,61 @@
+"""
+Benchmarks of the time that it takes to import the package (e.g. when a worker
+starts), using the interpreter's ``-X importtime`` report. Solara is imported
+first, as every worker imports it whatever the package does, so that only the
+time that the package adds is measured. The limit can be adjusted for slower
+machines with CDS_IMPORT_TIME_LIMIT (in seconds).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_LIMIT = float(os.getenv("CDS_IMPORT_TIME_LIMIT", "1.5"))
+
+# The framework modules that are imported before the package is
+FRAMEWORK_MODULES = ["solara", "solara.server.starlette"]
+
+# Modules that are slow to import, and are only needed once a session uses them
+DEFERRED_MODULES = ["glue", "glue_jupyter", "glue_plotly", "ipywwt", "astropy.modeling"]
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_import_time(module: str) -> float:
+    """
+    The cumulative time, in seconds, that it took to import `module` in a new
+    interpreter that had already imported the framework.
+    """
+    result = _run(f"import {', '.join(FRAMEWORK_MODULES)}; import {module}", "-X", "importtime")
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    raise AssertionError(f"{module} doesn't appear in the import time report")
+
+
+@pytest.mark.parametrize("module", ["cds_hubble", "cds_hubble.server"])
+def test_import_time(module):
+    # Take the best of a few runs, to reduce the noise from the machine
+    elapsed = min(_cumulative_import_time(module) for _ in range(3))
+    assert elapsed < IMPORT_TIME_LIMIT, f"Importing {module} took {elapsed:.2f}s"
+
+
+def test_heavy_modules_are_deferred():
+    result = _run(
+        "import sys, cds_hubble, cds_hubble.server; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,40 @@
+import ipywidgets
+import solara
+
+import cds_hubble.stages  # noqa: F401 (registers the stage states)
+from cds_core.app_state import AppState
+from cds_hubble.stages.p00_introduction import page as page_module
+
+
+class FakeExplorationTool(ipywidgets.HTML):
+    """Records whether it's closed, in place of an exploration tool and its WWT widget."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.closed = False
+        self.instances.append(self)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def test_exploration_tools_are_closed_with_page(monkeypatch):
+    monkeypatch.setattr(FakeExplorationTool, "instances", [])
+    monkeypatch.setattr(page_module, "ExplorationTool", FakeExplorationTool)
+    app_state = solara.reactive(AppState(update_db=False))
+    # The page is rendered inside the route's component (see cds_hubble.routes)
+    Page = solara.component(page_module.Page)
+
+    _, rc = solara.render(
+        solara.RoutingProvider(children=[Page(app_state)], routes=[solara.Route("/")], pathname="/"),
+        handle_error=False,
+    )
+    tools = FakeExplorationTool.instances
+    assert len(tools) == 3
+    assert not any(tool.closed for tool in tools)
+
+    rc.close()
+    assert all(tool.closed for tool in tools)
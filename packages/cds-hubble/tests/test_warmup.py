@@ -0,0 +1,36 @@
+import pytest
+
+from cds_hubble import warmup as warmup_module
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(warmup_module, "_warmed_up", False)
+    monkeypatch.setattr(warmup_module, "_import_stage_pages", lambda: calls.append("pages"))
+    monkeypatch.setattr("cds_hubble.preload_guidelines", lambda: calls.append("guidelines"))
+    monkeypatch.setattr(warmup_module, "_load_reference_data", lambda: calls.append("data"))
+    return calls
+
+
+def test_warmup_runs_once(steps):
+    warmup_module.warmup()
+    warmup_module.warmup()
+
+    assert steps == ["pages", "guidelines", "data"]
+    assert warmup_module.warmed_up()
+
+
+def test_failed_warmup_is_retried(steps, monkeypatch):
+    def fail():
+        raise ConnectionError("The API is unavailable")
+
+    monkeypatch.setattr(warmup_module, "_load_reference_data", fail)
+    with pytest.raises(ConnectionError):
+        warmup_module.warmup()
+    assert not warmup_module.warmed_up()
+
+    monkeypatch.setattr(warmup_module, "_load_reference_data", lambda: steps.append("data"))
+    warmup_module.warmup()
+    assert steps == ["pages", "guidelines", "pages", "guidelines", "data"]
+    assert warmup_module.warmed_up()
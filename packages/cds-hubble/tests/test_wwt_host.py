@@ -0,0 +1,145 @@
+import astropy.units as u
+import pytest
+from astropy.coordinates import SkyCoord
+
+from cds_hubble.widgets import wwt_host as wwt_host_module
+from cds_hubble.widgets.wwt_host import DEFAULT_VIEW, WWTView, WWTWidgetHost
+
+
+class FakeWidget:
+    """Records what the host does to the widget, in place of a WWT widget."""
+
+    def __init__(self, **kwargs):
+        self._wwt_ready = False
+        self._observers = []
+        self.views = []
+        self.selection_callback = None
+        self.foreground = None
+
+    def observe(self, handler, name):
+        self._observers.append(handler)
+
+    def become_ready(self):
+        self._wwt_ready = True
+        for handler in self._observers:
+            handler({"name": "_wwt_ready", "new": True})
+
+    def center_on_coordinates(self, coordinates, fov, instant=None):
+        self.views.append((coordinates, fov, instant))
+
+    def set_selection_change_callback(self, callback):
+        self.selection_callback = callback
+
+
+class FakeLayer:
+    opacity = 1
+    removed = False
+
+    def remove(self):
+        self.removed = True
+
+
+@pytest.fixture
+def widgets():
+    return []
+
+
+@pytest.fixture
+def host(monkeypatch, widgets):
+    def create_widget(**kwargs):
+        widget = FakeWidget(**kwargs)
+        widgets.append(widget)
+        return widget
+
+    monkeypatch.setattr(wwt_host_module, "HubbleWWTWidget", create_widget)
+    return WWTWidgetHost()
+
+
+def _is_view(recorded, view):
+    coordinates, fov, instant = recorded
+    return coordinates.separation(view.coordinates) < 1 * u.arcsec and fov == view.fov and instant
+
+
+def test_borrowed_widget_goes_to_view_when_ready(host):
+    view = WWTView(SkyCoord(180 * u.deg, 25 * u.deg, frame="icrs"), 60 * u.deg)
+    ready = []
+    widget, _ = host.borrow(on_ready=lambda: ready.append(True), view=view, foreground="SDSS9 color")
+    assert widget.views == []
+    assert ready == []
+
+    widget.become_ready()
+    assert len(widget.views) == 1
+    assert _is_view(widget.views[0], view)
+    assert widget.foreground == "SDSS9 color"
+    assert ready == [True]
+
+
+def test_borrow_without_view_resets_camera(host):
+    widget, release = host.borrow(view=WWTView(SkyCoord(10 * u.deg, 10 * u.deg), 1 * u.deg))
+    widget.become_ready()
+    release()
+
+    other, _ = host.borrow()
+    assert other is widget
+    widget.become_ready()
+    assert _is_view(widget.views[-1], DEFAULT_VIEW)
+
+
+def test_release_resets_camera_and_layers(host):
+    widget, release = host.borrow()
+    widget.become_ready()
+    layer = host.table_layer("galaxies", lambda _widget: FakeLayer())
+    widget.views.clear()
+
+    release()
+    assert layer.opacity == 0
+    assert len(widget.views) == 1
+    assert _is_view(widget.views[0], DEFAULT_VIEW)
+
+
+def test_stale_release_does_nothing(host):
+    widget, first_release = host.borrow()
+    widget.become_ready()
+    host.borrow(view=WWTView(SkyCoord(10 * u.deg, 10 * u.deg), 1 * u.deg))
+    widget.views.clear()
+
+    first_release()
+    assert widget.views == []
+
+
+def test_second_borrow_waits_for_its_view(host, widgets):
+    factories = []
+
+    def create_layer(widget):
+        factories.append(widget)
+        return FakeLayer()
+
+    widget, release = host.borrow(foreground="SDSS9 color")
+    widget.become_ready()
+    first_layer = host.table_layer("galaxies", create_layer)
+    release()
+    widget.views.clear()
+
+    # The next borrower's page renders a new view of the same widget
+    ready = []
+    view = WWTView(SkyCoord(180 * u.deg, 25 * u.deg, frame="icrs"), 60 * u.deg)
+    other, _ = host.borrow(on_ready=lambda: ready.append(True), view=view, foreground="DSS")
+    assert other is widget
+    assert len(widgets) == 1
+    assert not host.ready
+    assert first_layer.removed
+    assert widget.views == []
+    assert widget.foreground == "SDSS9 color"
+    assert ready == []
+
+    widget.become_ready()
+    assert len(widget.views) == 1
+    assert _is_view(widget.views[0], view)
+    assert widget.foreground == "DSS"
+    assert ready == [True]
+
+    # The layer is created again in the new view, and only once
+    layer = host.table_layer("galaxies", create_layer)
+    assert host.table_layer("galaxies", create_layer) is layer
+    assert layer is not first_layer
+    assert factories == [widget, widget]
@@ -0,0 +1,174 @@
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from cds_hubble.wwt_proxy import BUNDLED_SURVEYS_PATH, WWTCache, _proxy_url, wwt_proxy_routes
+
+TILES_DIR = Path(__file__).parent / "data" / "wwt_tiles"
+
+SURVEYS_URL = "https://surveys.example.org/surveys.wtml"
+PROXY_URL = "https://cds.example.org/wwt"
+
+# The hosts in the fixture surveys file, and where their tiles are
+FIXTURE_HOSTS = {
+    "surveys.example.org": TILES_DIR,
+    "tiles.example.org": TILES_DIR,
+    "r0.tiles.example.net": TILES_DIR,
+    "r1.tiles.example.net": TILES_DIR,
+}
+
+
+class FixtureFetch:
+    """Serve the fixture tile set in place of the upstream servers, counting requests."""
+
+    def __init__(self, online=True):
+        self.online = online
+        self.urls = []
+
+    def __call__(self, url):
+        self.urls.append(url)
+        if not self.online:
+            raise ConnectionError(f"Offline: {url}")
+        parts = urlsplit(url)
+        root = FIXTURE_HOSTS.get(parts.hostname, None)
+        if root is None:
+            raise AssertionError(f"Fetched a URL that isn't in the fixture: {url}")
+        path = root / parts.path.lstrip("/")
+        content_type = "text/xml" if path.suffix == ".wtml" else "image/png"
+        return path.read_bytes(), content_type
+
+
+@pytest.fixture
+def fetch():
+    return FixtureFetch()
+
+
+@pytest.fixture
+def cache(tmp_path, fetch):
+    return WWTCache(tmp_path, PROXY_URL, surveys_url=SURVEYS_URL, fallback_path=None, fetch=fetch)
+
+
+def test_surveys_point_at_proxy(cache):
+    surveys = cache.surveys().decode("utf-8")
+    assert 'Url="https://cds.example.org/wwt/tiles/https/tiles.example.org/dss/{1}/{3}/{3}_{2}.png"' in surveys
+    assert "<ThumbnailUrl>https://cds.example.org/wwt/tiles/https/tiles.example.org/dss/thumbnail.jpg</ThumbnailUrl>" in surveys
+    assert 'Url="https://cds.example.org/wwt/tiles/https/r{S:0}.tiles.example.net/hips/{1}/{2}.png"' in surveys
+    assert "https://tiles.example.org" not in surveys.replace(PROXY_URL, "")
+
+
+def test_tiles_are_fetched_once(cache, fetch):
+    for _ in range(3):
+        content, content_type = cache.tile("https", "tiles.example.org", "dss/0/0/0_0.png")
+        assert content == (TILES_DIR / "dss" / "0" / "0" / "0_0.png").read_bytes()
+        assert content_type == "image/png"
+    assert fetch.urls.count("https://tiles.example.org/dss/0/0/0_0.png") == 1
+
+
+def test_templated_host(cache):
+    content, _ = cache.tile("https", "r1.tiles.example.net", "hips/0_0.png")
+    assert content == (TILES_DIR / "hips" / "0_0.png").read_bytes()
+
+
+def test_cache_is_shared_between_instances(tmp_path, cache, fetch):
+    cache.tile("https", "tiles.example.org", "dss/0/0/0_0.png")
+
+    offline = FixtureFetch(online=False)
+    other = WWTCache(tmp_path, PROXY_URL, surveys_url=SURVEYS_URL, fallback_path=None, fetch=offline)
+    content, _ = other.tile("https", "tiles.example.org", "dss/0/0/0_0.png")
+    assert content == (TILES_DIR / "dss" / "0" / "0" / "0_0.png").read_bytes()
+    assert offline.urls == [SURVEYS_URL]
+
+
+@pytest.mark.parametrize(
+    "host",
+    [
+        "evil.example.com",
+        "r@169.254.169.254:80#.tiles.example.net",
+        "r169.254.169.254:80#.tiles.example.net",
+        "r0.tiles.example.net:8080",
+        "user@tiles.example.org",
+        "r0.tiles.example.net.evil.com",
+        "r/..tiles.example.net",
+    ],
+)
+def test_other_hosts_are_rejected(cache, fetch, host):
+    with pytest.raises(PermissionError):
+        cache.tile("https", host, "dss/0/0/0_0.png")
+    assert fetch.urls == [SURVEYS_URL]
+
+
+def test_other_schemes_are_rejected(cache):
+    with pytest.raises(PermissionError):
+        cache.tile("file", "tiles.example.org", "etc/passwd")
+
+
+def test_fallback_file(tmp_path):
+    cache = WWTCache(
+        tmp_path,
+        PROXY_URL,
+        surveys_url=SURVEYS_URL,
+        fallback_path=TILES_DIR / "surveys.wtml",
+        fetch=FixtureFetch(online=False),
+    )
+    assert b"/wwt/tiles/https/tiles.example.org/" in cache.surveys()
+
+
+def test_no_surveys_redirects_upstream(tmp_path):
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+    from starlette.testclient import TestClient
+
+    cache = WWTCache(tmp_path, PROXY_URL, surveys_url=SURVEYS_URL, fallback_path=None, fetch=FixtureFetch(online=False))
+    app = Starlette(routes=[Mount("/wwt", routes=wwt_proxy_routes(cache))])
+    client = TestClient(app)
+
+    response = client.get("/wwt/surveys.wtml", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"] == SURVEYS_URL
+
+
+def test_routes(cache):
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+    from starlette.testclient import TestClient
+
+    app = Starlette(routes=[Mount("/wwt", routes=wwt_proxy_routes(cache))])
+    client = TestClient(app)
+
+    response = client.get("/wwt/surveys.wtml")
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+
+    response = client.get("/wwt/tiles/https/tiles.example.org/dss/0/0/0_0.png")
+    assert response.status_code == 200
+    assert response.content == (TILES_DIR / "dss" / "0" / "0" / "0_0.png").read_bytes()
+
+    response = client.get("/wwt/tiles/https/evil.example.com/dss/0/0/0_0.png")
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("", ""),
+        ("https://cds.example.org", "https://cds.example.org/wwt"),
+        ("https://cds.example.org/", "https://cds.example.org/wwt"),
+        (" https://cds.example.org/proxy/wwt/ ", "https://cds.example.org/proxy/wwt"),
+    ],
+)
+def test_proxy_isnt_mounted_at_root(url, expected):
+    assert _proxy_url(url) == expected
+
+
+def test_bundled_surveys(tmp_path):
+    cache = WWTCache(
+        tmp_path, PROXY_URL, surveys_url=SURVEYS_URL, fetch=FixtureFetch(online=False)
+    )
+    surveys = cache.surveys().decode("utf-8")
+
+    for name in ("Black Sky Background", "Digitized Sky Survey (Color)", "SDSS9 color"):
+        assert f'Name="{name}"' in surveys
+    assert cache.fallback_path == BUNDLED_SURVEYS_PATH
+    assert cache.allows("cdn.worldwidetelescope.org")
+    assert cache.allows("alasky.cds.unistra.fr")
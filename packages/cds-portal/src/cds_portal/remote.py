@@ -9,13 +9,14 @@ from functools import cached_property
 from .state import GlobalState
 from solara import Reactive
 from solara.lab import Ref
+from cds_core.urls import API_URL
 from .logger import setup_logger
 
 logger = setup_logger("API")
 
 
 class BaseAPI:
-    API_URL = "https://api.cosmicds.cfa.harvard.edu"
+    API_URL = API_URL
     # API_URL = "http://localhost:8081"
 
     @cached_property
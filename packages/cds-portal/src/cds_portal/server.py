@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -6,8 +9,23 @@ from solara.server import settings
 
 import solara.server.starlette
 
+from cds_core.health import api_probe, health_routes
+from cds_core.ticker import ticker
+
 routes = [
+    # These need to come before the Solara routes, which are mounted at the root
+    *health_routes(probes=[api_probe()]),
     Mount("/", routes=solara.server.starlette.routes),
 ]
 
-app = Starlette(routes=routes, middleware=solara.server.starlette.middleware)
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    # Periodic callbacks run on this worker's loop, rather than on a thread of their own
+    ticker.attach(asyncio.get_running_loop())
+    yield
+
+
+app = Starlette(
+    routes=routes, middleware=solara.server.starlette.middleware, lifespan=lifespan
+)